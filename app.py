@@ -1,5 +1,4 @@
 from llm_util import model_name
-from google import genai
 import streamlit as st
 
 st.set_page_config(layout="wide")
@@ -104,7 +104,7 @@ class BamlAsyncClient:
         self,
         context: str,target_lang: str,source_text: str,source_lang: str,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.Analysis:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
 
       __tb__ = options.get("tb", None)
@@ -125,13 +125,13 @@ class BamlAsyncClient:
         __cr__,
         collectors,
       )
-      return cast(str, raw.cast_to(types, types, partial_types, False))
+      return cast(types.Analysis, raw.cast_to(types, types, partial_types, False))
     
     async def GetBackTranslation(
         self,
-        context: str,source_lang: str,clarified_translation: str,
+        context: str,source_lang: str,clarified_translation: List[str],
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.BackTranslation:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
 
       __tb__ = options.get("tb", None)
@@ -152,13 +152,13 @@ class BamlAsyncClient:
         __cr__,
         collectors,
       )
-      return cast(str, raw.cast_to(types, types, partial_types, False))
+      return cast(types.BackTranslation, raw.cast_to(types, types, partial_types, False))
     
     async def GetClarity(
         self,
-        context: str,prompt: str,analysis: str,target_lang: str,literal_translation: str,
+        context: str,prompt: str,analysis: types.Analysis,target_lang: str,literal_translation: types.LiteralTranslation,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.ClearTranslation:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
 
       __tb__ = options.get("tb", None)
@@ -179,13 +179,13 @@ class BamlAsyncClient:
         __cr__,
         collectors,
       )
-      return cast(str, raw.cast_to(types, types, partial_types, False))
+      return cast(types.ClearTranslation, raw.cast_to(types, types, partial_types, False))
     
     async def GetFinalTranslation(
         self,
-        context: str,target_lang: str,source_text: str,analysis: str,clarified_translation: str,final_review: str,item_type: str,
+        context: str,target_lang: str,source_text: str,analysis: types.Analysis,clarified_translation: types.ClearTranslation,final_review: types.Review,item_type: str,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.FinalTranslation:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
 
       __tb__ = options.get("tb", None)
@@ -206,13 +206,13 @@ class BamlAsyncClient:
         __cr__,
         collectors,
       )
-      return cast(str, raw.cast_to(types, types, partial_types, False))
+      return cast(types.FinalTranslation, raw.cast_to(types, types, partial_types, False))
     
     async def GetLiteralTranslate(
         self,
         context: str,prompt: str,source_lang: str,target_lang: str,is_song: bool,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.LiteralTranslation:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
 
       __tb__ = options.get("tb", None)
@@ -233,13 +233,40 @@ class BamlAsyncClient:
         __cr__,
         collectors,
       )
-      return cast(str, raw.cast_to(types, types, partial_types, False))
+      return cast(types.LiteralTranslation, raw.cast_to(types, types, partial_types, False))
+    
+    async def GetPolishedTranslation(
+        self,
+        context: str,target_lang: str,clarified_translation: types.ClearTranslation,
+        baml_options: BamlCallOptions = {},
+    ) -> types.FinalTranslation:
+      options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
+
+      __tb__ = options.get("tb", None)
+      if __tb__ is not None:
+        tb = __tb__._tb # type: ignore (we know how to use this private attribute)
+      else:
+        tb = None
+      __cr__ = options.get("client_registry", None)
+      collector = options.get("collector", None)
+      collectors = collector if isinstance(collector, list) else [collector] if collector is not None else []
+      raw = await self.__runtime.call_function(
+        "GetPolishedTranslation",
+        {
+          "context": context,"target_lang": target_lang,"clarified_translation": clarified_translation,
+        },
+        self.__ctx_manager.get(),
+        tb,
+        __cr__,
+        collectors,
+      )
+      return cast(types.FinalTranslation, raw.cast_to(types, types, partial_types, False))
     
     async def GetReview(
         self,
-        context: str,target_lang: str,source_text: str,clarified_translation: str,backtranslation: str,syllabification: Union[str, Optional[None]],
+        context: str,target_lang: str,source_text: str,clarified_translation: List[str],backtranslation: types.BackTranslation,syllabification: Union[str, Optional[None]],
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.Review:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
 
       __tb__ = options.get("tb", None)
@@ -260,7 +287,7 @@ class BamlAsyncClient:
         __cr__,
         collectors,
       )
-      return cast(str, raw.cast_to(types, types, partial_types, False))
+      return cast(types.Review, raw.cast_to(types, types, partial_types, False))
     
 
 
@@ -278,7 +305,7 @@ class BamlStreamClient:
         self,
         context: str,target_lang: str,source_text: str,source_lang: str,
         baml_options: BamlCallOptions = {},
-    ) -> baml_py.BamlStream[Optional[str], str]:
+    ) -> baml_py.BamlStream[partial_types.Analysis, types.Analysis]:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -303,18 +330,18 @@ class BamlStreamClient:
         collectors,
       )
 
-      return baml_py.BamlStream[Optional[str], str](
+      return baml_py.BamlStream[partial_types.Analysis, types.Analysis](
         raw,
-        lambda x: cast(Optional[str], x.cast_to(types, types, partial_types, True)),
-        lambda x: cast(str, x.cast_to(types, types, partial_types, False)),
+        lambda x: cast(partial_types.Analysis, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.Analysis, x.cast_to(types, types, partial_types, False)),
         self.__ctx_manager.get(),
       )
     
     def GetBackTranslation(
         self,
-        context: str,source_lang: str,clarified_translation: str,
+        context: str,source_lang: str,clarified_translation: List[str],
         baml_options: BamlCallOptions = {},
-    ) -> baml_py.BamlStream[Optional[str], str]:
+    ) -> baml_py.BamlStream[partial_types.BackTranslation, types.BackTranslation]:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -338,18 +365,18 @@ class BamlStreamClient:
         collectors,
       )
 
-      return baml_py.BamlStream[Optional[str], str](
+      return baml_py.BamlStream[partial_types.BackTranslation, types.BackTranslation](
         raw,
-        lambda x: cast(Optional[str], x.cast_to(types, types, partial_types, True)),
-        lambda x: cast(str, x.cast_to(types, types, partial_types, False)),
+        lambda x: cast(partial_types.BackTranslation, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.BackTranslation, x.cast_to(types, types, partial_types, False)),
         self.__ctx_manager.get(),
       )
     
     def GetClarity(
         self,
-        context: str,prompt: str,analysis: str,target_lang: str,literal_translation: str,
+        context: str,prompt: str,analysis: types.Analysis,target_lang: str,literal_translation: types.LiteralTranslation,
         baml_options: BamlCallOptions = {},
-    ) -> baml_py.BamlStream[Optional[str], str]:
+    ) -> baml_py.BamlStream[partial_types.ClearTranslation, types.ClearTranslation]:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -375,18 +402,18 @@ class BamlStreamClient:
         collectors,
       )
 
-      return baml_py.BamlStream[Optional[str], str](
+      return baml_py.BamlStream[partial_types.ClearTranslation, types.ClearTranslation](
         raw,
-        lambda x: cast(Optional[str], x.cast_to(types, types, partial_types, True)),
-        lambda x: cast(str, x.cast_to(types, types, partial_types, False)),
+        lambda x: cast(partial_types.ClearTranslation, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.ClearTranslation, x.cast_to(types, types, partial_types, False)),
         self.__ctx_manager.get(),
       )
     
     def GetFinalTranslation(
         self,
-        context: str,target_lang: str,source_text: str,analysis: str,clarified_translation: str,final_review: str,item_type: str,
+        context: str,target_lang: str,source_text: str,analysis: types.Analysis,clarified_translation: types.ClearTranslation,final_review: types.Review,item_type: str,
         baml_options: BamlCallOptions = {},
-    ) -> baml_py.BamlStream[Optional[str], str]:
+    ) -> baml_py.BamlStream[partial_types.FinalTranslation, types.FinalTranslation]:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -414,10 +441,10 @@ class BamlStreamClient:
         collectors,
       )
 
-      return baml_py.BamlStream[Optional[str], str](
+      return baml_py.BamlStream[partial_types.FinalTranslation, types.FinalTranslation](
         raw,
-        lambda x: cast(Optional[str], x.cast_to(types, types, partial_types, True)),
-        lambda x: cast(str, x.cast_to(types, types, partial_types, False)),
+        lambda x: cast(partial_types.FinalTranslation, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.FinalTranslation, x.cast_to(types, types, partial_types, False)),
         self.__ctx_manager.get(),
       )
     
@@ -425,7 +452,7 @@ class BamlStreamClient:
         self,
         context: str,prompt: str,source_lang: str,target_lang: str,is_song: bool,
         baml_options: BamlCallOptions = {},
-    ) -> baml_py.BamlStream[Optional[str], str]:
+    ) -> baml_py.BamlStream[partial_types.LiteralTranslation, types.LiteralTranslation]:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -451,18 +478,53 @@ class BamlStreamClient:
         collectors,
       )
 
-      return baml_py.BamlStream[Optional[str], str](
+      return baml_py.BamlStream[partial_types.LiteralTranslation, types.LiteralTranslation](
+        raw,
+        lambda x: cast(partial_types.LiteralTranslation, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.LiteralTranslation, x.cast_to(types, types, partial_types, False)),
+        self.__ctx_manager.get(),
+      )
+    
+    def GetPolishedTranslation(
+        self,
+        context: str,target_lang: str,clarified_translation: types.ClearTranslation,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.BamlStream[partial_types.FinalTranslation, types.FinalTranslation]:
+      options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
+      __tb__ = options.get("tb", None)
+      if __tb__ is not None:
+        tb = __tb__._tb # type: ignore (we know how to use this private attribute)
+      else:
+        tb = None
+      __cr__ = options.get("client_registry", None)
+      collector = options.get("collector", None)
+      collectors = collector if isinstance(collector, list) else [collector] if collector is not None else []
+      raw = self.__runtime.stream_function(
+        "GetPolishedTranslation",
+        {
+          "context": context,
+          "target_lang": target_lang,
+          "clarified_translation": clarified_translation,
+        },
+        None,
+        self.__ctx_manager.get(),
+        tb,
+        __cr__,
+        collectors,
+      )
+
+      return baml_py.BamlStream[partial_types.FinalTranslation, types.FinalTranslation](
         raw,
-        lambda x: cast(Optional[str], x.cast_to(types, types, partial_types, True)),
-        lambda x: cast(str, x.cast_to(types, types, partial_types, False)),
+        lambda x: cast(partial_types.FinalTranslation, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.FinalTranslation, x.cast_to(types, types, partial_types, False)),
         self.__ctx_manager.get(),
       )
     
     def GetReview(
         self,
-        context: str,target_lang: str,source_text: str,clarified_translation: str,backtranslation: str,syllabification: Union[str, Optional[None]],
+        context: str,target_lang: str,source_text: str,clarified_translation: List[str],backtranslation: types.BackTranslation,syllabification: Union[str, Optional[None]],
         baml_options: BamlCallOptions = {},
-    ) -> baml_py.BamlStream[Optional[str], str]:
+    ) -> baml_py.BamlStream[partial_types.Review, types.Review]:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -489,10 +551,10 @@ class BamlStreamClient:
         collectors,
       )
 
-      return baml_py.BamlStream[Optional[str], str](
+      return baml_py.BamlStream[partial_types.Review, types.Review](
         raw,
-        lambda x: cast(Optional[str], x.cast_to(types, types, partial_types, True)),
-        lambda x: cast(str, x.cast_to(types, types, partial_types, False)),
+        lambda x: cast(partial_types.Review, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.Review, x.cast_to(types, types, partial_types, False)),
         self.__ctx_manager.get(),
       )
     
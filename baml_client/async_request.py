@@ -65,7 +65,7 @@ class AsyncHttpRequest:
     
     async def GetBackTranslation(
         self,
-        context: str,source_lang: str,clarified_translation: str,
+        context: str,source_lang: str,clarified_translation: List[str],
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -90,7 +90,7 @@ class AsyncHttpRequest:
     
     async def GetClarity(
         self,
-        context: str,prompt: str,analysis: str,target_lang: str,literal_translation: str,
+        context: str,prompt: str,analysis: types.Analysis,target_lang: str,literal_translation: types.LiteralTranslation,
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -117,7 +117,7 @@ class AsyncHttpRequest:
     
     async def GetFinalTranslation(
         self,
-        context: str,target_lang: str,source_text: str,analysis: str,clarified_translation: str,final_review: str,item_type: str,
+        context: str,target_lang: str,source_text: str,analysis: types.Analysis,clarified_translation: types.ClearTranslation,final_review: types.Review,item_type: str,
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -171,9 +171,34 @@ class AsyncHttpRequest:
         False,
       )
     
+    async def GetPolishedTranslation(
+        self,
+        context: str,target_lang: str,clarified_translation: types.ClearTranslation,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.HTTPRequest:
+      __tb__ = baml_options.get("tb", None)
+      if __tb__ is not None:
+        tb = __tb__._tb # type: ignore (we know how to use this private attribute)
+      else:
+        tb = None
+      __cr__ = baml_options.get("client_registry", None)
+
+      return await self.__runtime.build_request(
+        "GetPolishedTranslation",
+        {
+          "context": context,
+          "target_lang": target_lang,
+          "clarified_translation": clarified_translation,
+        },
+        self.__ctx_manager.get(),
+        tb,
+        __cr__,
+        False,
+      )
+    
     async def GetReview(
         self,
-        context: str,target_lang: str,source_text: str,clarified_translation: str,backtranslation: str,syllabification: Union[str, Optional[None]],
+        context: str,target_lang: str,source_text: str,clarified_translation: List[str],backtranslation: types.BackTranslation,syllabification: Union[str, Optional[None]],
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -238,7 +263,7 @@ class AsyncHttpStreamRequest:
     
     async def GetBackTranslation(
         self,
-        context: str,source_lang: str,clarified_translation: str,
+        context: str,source_lang: str,clarified_translation: List[str],
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -263,7 +288,7 @@ class AsyncHttpStreamRequest:
     
     async def GetClarity(
         self,
-        context: str,prompt: str,analysis: str,target_lang: str,literal_translation: str,
+        context: str,prompt: str,analysis: types.Analysis,target_lang: str,literal_translation: types.LiteralTranslation,
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -290,7 +315,7 @@ class AsyncHttpStreamRequest:
     
     async def GetFinalTranslation(
         self,
-        context: str,target_lang: str,source_text: str,analysis: str,clarified_translation: str,final_review: str,item_type: str,
+        context: str,target_lang: str,source_text: str,analysis: types.Analysis,clarified_translation: types.ClearTranslation,final_review: types.Review,item_type: str,
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -344,9 +369,34 @@ class AsyncHttpStreamRequest:
         True,
       )
     
+    async def GetPolishedTranslation(
+        self,
+        context: str,target_lang: str,clarified_translation: types.ClearTranslation,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.HTTPRequest:
+      __tb__ = baml_options.get("tb", None)
+      if __tb__ is not None:
+        tb = __tb__._tb # type: ignore (we know how to use this private attribute)
+      else:
+        tb = None
+      __cr__ = baml_options.get("client_registry", None)
+
+      return await self.__runtime.build_request(
+        "GetPolishedTranslation",
+        {
+          "context": context,
+          "target_lang": target_lang,
+          "clarified_translation": clarified_translation,
+        },
+        self.__ctx_manager.get(),
+        tb,
+        __cr__,
+        True,
+      )
+    
     async def GetReview(
         self,
-        context: str,target_lang: str,source_text: str,clarified_translation: str,backtranslation: str,syllabification: Union[str, Optional[None]],
+        context: str,target_lang: str,source_text: str,clarified_translation: List[str],backtranslation: types.BackTranslation,syllabification: Union[str, Optional[None]],
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -16,9 +16,9 @@
 
 file_map = {
     
-    "clients.baml": "// Learn more about clients at https://docs.boundaryml.com/docs/snippets/clients/overview\r\n\r\nclient<llm> GPT4oMini {\r\n  provider openai\r\n  retry_policy Exponential\r\n  options {\r\n    model \"gpt-4o-mini\"\r\n    api_key env.OPENAI_API_KEY\r\n  }\r\n}\r\n\r\nclient<llm> Gemini {\r\n  provider google-ai\r\n  retry_policy Exponential\r\n  options {\r\n    model \"gemini-2.0-flash\"\r\n    api_key env.GEMINI_API_KEY\r\n    generationConfig {\r\n      temperature 0.7\r\n      max_output_tokens 5000\r\n    }\r\n  }\r\n}\r\n\r\nclient<llm> Sonnet {\r\n  provider anthropic\r\n  options {\r\n    model \"claude-3-7-sonnet-latest\"\r\n    api_key env.ANTHROPIC_API_KEY\r\n  }\r\n}\r\n\r\n\r\nclient<llm> Haiku {\r\n  provider anthropic\r\n  retry_policy Constant\r\n  options {\r\n    model \"claude-3-haiku-20240307\"\r\n    api_key env.ANTHROPIC_API_KEY\r\n  }\r\n}\r\n\r\n// https://docs.boundaryml.com/docs/snippets/clients/round-robin\r\nclient<llm> CustomFast {\r\n  provider round-robin\r\n  options {\r\n    // This will alternate between the two clients\r\n    strategy [GPT4oMini, Haiku]\r\n  }\r\n}\r\n\r\n// https://docs.boundaryml.com/docs/snippets/clients/fallback\r\nclient<llm> OpenaiFallback {\r\n  provider fallback\r\n  options {\r\n    // This will try the clients in order until one succeeds\r\n    strategy [GPT4oMini, GPT4oMini]\r\n  }\r\n}\r\n\r\n// https://docs.boundaryml.com/docs/snippets/clients/retry\r\nretry_policy Constant {\r\n  max_retries 3\r\n  // Strategy is optional\r\n  strategy {\r\n    type constant_delay\r\n    delay_ms 200\r\n  }\r\n}\r\n\r\nretry_policy Exponential {\r\n  max_retries 2\r\n  // Strategy is optional\r\n  strategy {\r\n    type exponential_backoff\r\n    delay_ms 300\r\n    multiplier 1.5\r\n    max_delay_ms 10000\r\n  }\r\n}",
+    "clients.baml": "// Learn more about clients at https://docs.boundaryml.com/docs/snippets/clients/overview\n\nclient<llm> GPT4oMini {\n  provider openai\n  retry_policy Exponential\n  options {\n    model \"gpt-4o-mini\"\n    api_key env.OPENAI_API_KEY\n  }\n}\n\nclient<llm> Gemini {\n  provider google-ai\n  retry_policy Exponential\n  options {\n    model \"gemini-2.0-flash\"\n    api_key env.GEMINI_API_KEY\n    generationConfig {\n      temperature 0.7\n      max_output_tokens 5000\n    }\n  }\n}\n\nclient<llm> Sonnet {\n  provider anthropic\n  options {\n    model \"claude-3-7-sonnet-latest\"\n    api_key env.ANTHROPIC_API_KEY\n  }\n}\n\n\nclient<llm> Haiku {\n  provider anthropic\n  retry_policy Constant\n  options {\n    model \"claude-3-haiku-20240307\"\n    api_key env.ANTHROPIC_API_KEY\n  }\n}\n\n// https://docs.boundaryml.com/docs/snippets/clients/round-robin\nclient<llm> CustomFast {\n  provider round-robin\n  options {\n    // This will alternate between the two clients\n    strategy [GPT4oMini, Haiku]\n  }\n}\n\n// https://docs.boundaryml.com/docs/snippets/clients/fallback\nclient<llm> OpenaiFallback {\n  provider fallback\n  options {\n    // This will try the clients in order until one succeeds\n    strategy [GPT4oMini, GPT4oMini]\n  }\n}\n\n// https://docs.boundaryml.com/docs/snippets/clients/retry\nretry_policy Constant {\n  max_retries 3\n  // Strategy is optional\n  strategy {\n    type constant_delay\n    delay_ms 200\n  }\n}\n\nretry_policy Exponential {\n  max_retries 2\n  // Strategy is optional\n  strategy {\n    type exponential_backoff\n    delay_ms 300\n    multiplier 1.5\n    max_delay_ms 10000\n  }\n}",
     "generators.baml": "// This helps use auto generate libraries you can use in the language of\n// your choice. You can have multiple generators if you use multiple languages.\n// Just ensure that the output_dir is different for each generator.\ngenerator target {\n    // Valid values: \"python/pydantic\", \"typescript\", \"ruby/sorbet\", \"rest/openapi\"\n    output_type \"python/pydantic\"\n\n    // Where the generated code will be saved (relative to baml_src/)\n    output_dir \"../\"\n\n    // The version of the BAML package you have installed (e.g. same version as your baml-py or @boundaryml/baml).\n    // The BAML VSCode extension version should also match this version.\n    version \"0.87.2\"\n\n    // Valid values: \"sync\", \"async\"\n    // This controls what `b.FunctionName()` will be (sync or async).\n    default_client_mode sync\n}\n",
-    "translate.baml": "function GetLiteralTranslate(context: string, prompt: string, source_lang: string, target_lang: string, is_song: bool) -> string {\r\n\r\n  // Specify a client afrom clients.baml\r\n  client Gemini // Set Model\r\n  prompt #\"\r\n    {{context}}\r\n\r\n    Provide a literal, word-for-word translation of the following text into {{target_lang}}\r\n\r\n    <source_text>\r\n    {{ prompt }}\r\n    </source_text>\r\n\r\n    After each line or paragraph, provide alternative translations for key terms, ambiguous passages, and any challenging passages.\r\n    Use square brackets to indicate alternatives.\r\n    Include brief explanations and backtranslations of any alternative translations so that even a non-native speaker could understand what the choice means.\r\n\r\n    Use bullet points to organize your analysis.\r\n\r\n    Return as a markdown string\r\n  \"#\r\n}\r\n\r\nfunction GetClarity(context: string, prompt: string, analysis: string, target_lang: string, literal_translation: string) -> string {\r\n\r\n  // Specify a client afrom clients.baml\r\n  client Gemini // Set Model\r\n  prompt #\"\r\n    {{context}}\r\n\r\n    Adapt this literal translation into clear, simple {{target_lang}}, emphasizing clarity while retaining a reasonable amount of the original meaning.\r\n\r\n    Likewise, if a line is blank, include a blank line in the output.\r\n\r\n    If applicable, write an alternative translation after a phrase or line in square brackets.\r\n    For example, \"Amazing grace, how sweet the sound [Stunning grace, how it moves my ear]\".\r\n    Don't include backtranslations at this point.\r\n\r\n    If there are no reasonable alternatives, simply leave the line as is.\r\n\r\n    <original>\r\n    {{prompt}}\r\n    </original>\r\n\r\n    <analysis>\r\n    {{analysis}}\r\n    </analysis>\r\n\r\n    <literal_translation>\r\n    {{literal_translation}}\r\n    </literal_translation>\r\n\r\n    Use bullet points to organize your analysis.\r\n\r\n    Return as a markdown string\r\n  \"#\r\n}\r\n\r\nfunction GetAnalysis(context: string, target_lang: string, source_text: string, source_lang: string) -> string {\r\n  // Specify a client a from clients.baml\r\n  client Gemini // Set Model\r\n  prompt #\"\r\n\r\n    {{context}}\r\n\r\n    Please provide a detailed analysis of the source text to help guide the translation process.\r\n\r\n    <source_text>\r\n    {{source_text}}\r\n    <source_text>\r\n\r\n    Outline of the text, with the main ideas of each section\r\n    Provide a detailed analysis of the following aspects:\r\n\r\n        1. Theological concepts and terminology, including any specific references to scripture or doctrine. For each concept or reference, describe it in {{source_lang}} and {{target_lang}}, including a complete quote in {{target_lang}} if applicable.\r\n        2. Cultural references\r\n        3. Key metaphors and imagery\r\n        4. Potential translation challenges\r\n\r\n    Use bullet points to organize your analysis.\r\n\r\n    Return as a markdown string\r\n  \"#\r\n}\r\n\r\nfunction GetReview(\r\n  context: string,\r\n  target_lang: string,\r\n  source_text: string,\r\n  clarified_translation: string,\r\n  backtranslation: string,\r\n  syllabification: string | null) -> string {\r\n\r\n  client Gemini\r\n  prompt #\"\r\n    {{context}}\r\n\r\n    Please provide a comprehensive review of the translation, considering:\r\n\r\n      1. Accuracy of meaning\r\n      2. Preservation of theological concepts\r\n      3. Cultural appropriateness\r\n      4. Areas for potential improvement\r\n\r\n    One or more errors may have been introduced in the translation. Identify and correct them.\r\n\r\n    Compare:\r\n\r\n    Original:\r\n    {{source_text}}\r\n\r\n    Final Translation:\r\n    {{clarified_translation}}\r\n\r\n    Backtranslation:\r\n    {{backtranslation}}\r\n\r\n    The analysis should include both strengths and weaknesses. Provide specific recommendations for improvement.\r\n\r\n    Use bullet points to organize your analysis.\r\n\r\n    Return as a markdown string\r\n  \"#\r\n}\r\n\r\nfunction GetBackTranslation(\r\n  context: string,\r\n  source_lang: string,\r\n  clarified_translation: string) -> string {\r\n\r\n  client Gemini\r\n  prompt #\"\r\n    {{context}}\r\n\r\n    To verify the translation, we will backtranslate it into the original language.\r\n    Translate the following literally into {{source_lang}}, adding notes as needed in [ ] brackets:\r\n\r\n    <translation>\r\n    {{clarified_translation}}\r\n    </translation>\r\n  \"#\r\n}\r\n\r\nfunction GetFinalTranslation(\r\n  context: string,\r\n  target_lang: string,\r\n  source_text: string,\r\n  analysis: string,\r\n  clarified_translation: string,\r\n  final_review: string,\r\n  item_type: string\r\n) -> string {\r\n  client Gemini\r\n  prompt #\"\r\n    {{context}}\r\n\r\n    Based on the analysis, translation, backtranslation, and review, provide a final translation of the {{item_type}} into {{target_lang}}.\r\n\r\n    <original>\r\n    {{source_text}}\r\n    </original>\r\n\r\n    <analysis>\r\n    {{analysis}}\r\n    </analysis>\r\n\r\n    <translation>\r\n    {{clarified_translation}}\r\n    </translation>\r\n\r\n    <review>\r\n    {{final_review}}\r\n    </review>\r\n\r\n    Use bullet points to organize your analysis.\r\n\r\n    Return the tranlation as a simple string.\r\n  \"#\r\n}",
+    "translate.baml": "class Alternative {\n  text string @description(\"The alternative rendering\")\n  meaning string @description(\"Brief explanation and backtranslation, so a non-native speaker understands what the choice means\")\n}\n\nclass LiteralLine {\n  source string @description(\"The line or paragraph of the source text\")\n  translation string @description(\"Its literal, word-for-word translation\")\n  alternatives Alternative[] @description(\"Alternatives for key terms, ambiguous or challenging passages\")\n}\n\nclass LiteralTranslation {\n  lines LiteralLine[]\n}\n\nfunction GetLiteralTranslate(context: string, prompt: string, source_lang: string, target_lang: string, is_song: bool) -> LiteralTranslation {\n\n  // Specify a client afrom clients.baml\n  client Gemini // Set Model\n  prompt #\"\n    {{context}}\n\n    Provide a literal, word-for-word translation of the following text into {{target_lang}}\n\n    <source_text>\n    {{ prompt }}\n    </source_text>\n\n    Translate line by line or paragraph by paragraph, and for each one provide alternative translations for key terms, ambiguous passages, and any challenging passages.\n    Include brief explanations and backtranslations of any alternative translations so that even a non-native speaker could understand what the choice means.\n\n    {{ ctx.output_format }}\n  \"#\n}\n\nclass ClearLine {\n  translation string @description(\"The clear, simple rendering of the line; empty for a blank line\")\n  alternatives string[] @description(\"Reasonable alternative renderings of the line or of a phrase in it, if any\")\n}\n\nclass ClearTranslation {\n  lines ClearLine[]\n}\n\nfunction GetClarity(context: string, prompt: string, analysis: Analysis, target_lang: string, literal_translation: LiteralTranslation) -> ClearTranslation {\n\n  // Specify a client afrom clients.baml\n  client Gemini // Set Model\n  prompt #\"\n    {{context}}\n\n    Adapt this literal translation into clear, simple {{target_lang}}, emphasizing clarity while retaining a reasonable amount of the original meaning.\n\n    Likewise, if a line is blank, include a blank line in the output.\n\n    If applicable, give alternative translations of a phrase or line.\n    For example, \"Stunning grace, how it moves my ear\" for \"Amazing grace, how sweet the sound\".\n    Don't include backtranslations at this point.\n\n    If there are no reasonable alternatives, simply leave the line as is.\n\n    <original>\n    {{prompt}}\n    </original>\n\n    <analysis>\n    {% for term in analysis.terms %}\n    - {{ term.source_term }}: {{ term.target_term }} ({{ term.note }})\n    {% endfor %}\n    {% for item in analysis.cultural_references + analysis.imagery + analysis.challenges %}\n    - {{ item }}\n    {% endfor %}\n    </analysis>\n\n    <literal_translation>\n    {% for line in literal_translation.lines %}\n    {{ line.translation }}{% for alt in line.alternatives %} [{{ alt.text }}{% if alt.meaning %}: {{ alt.meaning }}{% endif %}]{% endfor %}\n    {% endfor %}\n    </literal_translation>\n\n    {{ ctx.output_format }}\n  \"#\n}\n\nclass TermNote {\n  source_term string\n  target_term string @description(\"How to render it in the target language\")\n  note string @description(\"What it means, with a complete quote in the target language for scripture references\")\n}\n\nclass Analysis {\n  outline string[] @description(\"The main idea of each section, in order\")\n  terms TermNote[] @description(\"Theological concepts and terminology, including references to scripture or doctrine\")\n  cultural_references string[]\n  imagery string[] @description(\"Key metaphors and imagery\")\n  challenges string[] @description(\"Potential translation challenges\")\n}\n\nfunction GetAnalysis(context: string, target_lang: string, source_text: string, source_lang: string) -> Analysis {\n  // Specify a client a from clients.baml\n  client Gemini // Set Model\n  prompt #\"\n\n    {{context}}\n\n    Please provide a detailed analysis of the source text to help guide the translation process.\n\n    <source_text>\n    {{source_text}}\n    <source_text>\n\n    Outline of the text, with the main ideas of each section\n    Provide a detailed analysis of the following aspects:\n\n        1. Theological concepts and terminology, including any specific references to scripture or doctrine. For each concept or reference, describe it in {{source_lang}} and {{target_lang}}, including a complete quote in {{target_lang}} if applicable.\n        2. Cultural references\n        3. Key metaphors and imagery\n        4. Potential translation challenges\n\n    {{ ctx.output_format }}\n  \"#\n}\n\nclass ReviewIssue {\n  location string @description(\"The line or phrase of the translation concerned\")\n  problem string\n  suggestion string @description(\"The corrected wording\")\n  severity int @description(\"1 = matter of taste, 2 = awkward but correct, 3 = unclear or misleading, 4 = meaning changed, 5 = meaning lost, added or reversed\")\n}\n\nclass Review {\n  issues ReviewIssue[]\n  severity int @description(\"The highest severity among the issues, 0 if there are none\")\n  summary string @description(\"Strengths and weaknesses of the translation, as markdown bullet points\")\n}\n\nfunction GetReview(\n  context: string,\n  target_lang: string,\n  source_text: string,\n  clarified_translation: string[],\n  backtranslation: BackTranslation,\n  syllabification: string | null) -> Review {\n\n  client Gemini\n  prompt #\"\n    {{context}}\n\n    Please provide a comprehensive review of the translation, considering:\n\n      1. Accuracy of meaning\n      2. Preservation of theological concepts\n      3. Cultural appropriateness\n      4. Areas for potential improvement\n\n    One or more errors may have been introduced in the translation. Identify and correct them.\n\n    Compare:\n\n    Original:\n    {{source_text}}\n\n    Final Translation:\n    {% for line in clarified_translation %}\n    {{ line }}\n    {% endfor %}\n\n    Backtranslation:\n    {% for line in backtranslation.lines %}\n    {{ line.text }}{% for note in line.notes %} [{{ note }}]{% endfor %}\n    {% endfor %}\n\n    The analysis should include both strengths and weaknesses. Provide specific recommendations for improvement.\n\n    List every problem you find as an issue, with its severity. Leave the list empty if there is nothing to correct.\n\n    {{ ctx.output_format }}\n  \"#\n}\n\nclass BackLine {\n  text string @description(\"The literal backtranslation of the line\")\n  notes string[] @description(\"Notes on wording that doesn't carry over\")\n}\n\nclass BackTranslation {\n  lines BackLine[]\n}\n\nfunction GetBackTranslation(\n  context: string,\n  source_lang: string,\n  clarified_translation: string[]) -> BackTranslation {\n\n  client Gemini\n  prompt #\"\n    {{context}}\n\n    To verify the translation, we will backtranslate it into the original language.\n    Translate the following literally into {{source_lang}}, line by line, adding notes as needed:\n\n    <translation>\n    {% for line in clarified_translation %}\n    {{ line }}\n    {% endfor %}\n    </translation>\n\n    {{ ctx.output_format }}\n  \"#\n}\n\nclass FinalTranslation {\n  translation string @description(\"The translation only, keeping the line breaks and blank lines of the original\")\n}\n\nfunction GetFinalTranslation(\n  context: string,\n  target_lang: string,\n  source_text: string,\n  analysis: Analysis,\n  clarified_translation: ClearTranslation,\n  final_review: Review,\n  item_type: string\n) -> FinalTranslation {\n  client Gemini\n  prompt #\"\n    {{context}}\n\n    Based on the analysis, translation, backtranslation, and review, provide a final translation of the {{item_type}} into {{target_lang}}.\n\n    <original>\n    {{source_text}}\n    </original>\n\n    <analysis>\n    {% for term in analysis.terms %}\n    - {{ term.source_term }}: {{ term.target_term }}\n    {% endfor %}\n    {% for item in analysis.challenges %}\n    - {{ item }}\n    {% endfor %}\n    </analysis>\n\n    <translation>\n    {% for line in clarified_translation.lines %}\n    {{ line.translation }}{% for alt in line.alternatives %} [{{ alt }}]{% endfor %}\n    {% endfor %}\n    </translation>\n\n    <review>\n    {% for issue in final_review.issues %}\n    - [severity {{ issue.severity }}] {{ issue.location }}: {{ issue.problem }} Suggested: {{ issue.suggestion }}\n    {% endfor %}\n    {{ final_review.summary }}\n    </review>\n\n    {{ ctx.output_format }}\n  \"#\n}\n\n// Stands in for GetFinalTranslation when the review found nothing worth a full\n// rewrite (see REVIEW_GATE in pipeline.py).\nfunction GetPolishedTranslation(\n  context: string,\n  target_lang: string,\n  clarified_translation: ClearTranslation\n) -> FinalTranslation {\n  client Gemini\n  prompt #\"\n    {{context}}\n\n    A review found no significant problems with this {{target_lang}} translation. Produce its final version: where a line offers alternatives in square brackets, keep the main wording unless an alternative is clearly better, and drop the brackets. Keep the line breaks and blank lines of the translation.\n\n    <translation>\n    {% for line in clarified_translation.lines %}\n    {{ line.translation }}{% for alt in line.alternatives %} [{{ alt }}]{% endfor %}\n    {% endfor %}\n    </translation>\n\n    {{ ctx.output_format }}\n  \"#\n}\n",
 }
 
 def get_baml_files():
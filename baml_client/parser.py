@@ -41,7 +41,7 @@ class LlmResponseParser:
         self,
         llm_response: str,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.Analysis:
       __tb__ = baml_options.get("tb", None)
       if __tb__ is not None:
         tb = __tb__._tb # type: ignore (we know how to use this private attribute)
@@ -61,13 +61,13 @@ class LlmResponseParser:
         __cr__,
       )
 
-      return cast(str, parsed)
+      return cast(types.Analysis, parsed)
     
     def GetBackTranslation(
         self,
         llm_response: str,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.BackTranslation:
       __tb__ = baml_options.get("tb", None)
       if __tb__ is not None:
         tb = __tb__._tb # type: ignore (we know how to use this private attribute)
@@ -87,13 +87,13 @@ class LlmResponseParser:
         __cr__,
       )
 
-      return cast(str, parsed)
+      return cast(types.BackTranslation, parsed)
     
     def GetClarity(
         self,
         llm_response: str,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.ClearTranslation:
       __tb__ = baml_options.get("tb", None)
       if __tb__ is not None:
         tb = __tb__._tb # type: ignore (we know how to use this private attribute)
@@ -113,13 +113,13 @@ class LlmResponseParser:
         __cr__,
       )
 
-      return cast(str, parsed)
+      return cast(types.ClearTranslation, parsed)
     
     def GetFinalTranslation(
         self,
         llm_response: str,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.FinalTranslation:
       __tb__ = baml_options.get("tb", None)
       if __tb__ is not None:
         tb = __tb__._tb # type: ignore (we know how to use this private attribute)
@@ -139,13 +139,13 @@ class LlmResponseParser:
         __cr__,
       )
 
-      return cast(str, parsed)
+      return cast(types.FinalTranslation, parsed)
     
     def GetLiteralTranslate(
         self,
         llm_response: str,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.LiteralTranslation:
       __tb__ = baml_options.get("tb", None)
       if __tb__ is not None:
         tb = __tb__._tb # type: ignore (we know how to use this private attribute)
@@ -165,13 +165,39 @@ class LlmResponseParser:
         __cr__,
       )
 
-      return cast(str, parsed)
+      return cast(types.LiteralTranslation, parsed)
+    
+    def GetPolishedTranslation(
+        self,
+        llm_response: str,
+        baml_options: BamlCallOptions = {},
+    ) -> types.FinalTranslation:
+      __tb__ = baml_options.get("tb", None)
+      if __tb__ is not None:
+        tb = __tb__._tb # type: ignore (we know how to use this private attribute)
+      else:
+        tb = None
+      __cr__ = baml_options.get("client_registry", None)
+
+      parsed = self.__runtime.parse_llm_response(
+        "GetPolishedTranslation",
+        llm_response,
+        types,
+        types,
+        partial_types,
+        False,
+        self.__ctx_manager.get(),
+        tb,
+        __cr__,
+      )
+
+      return cast(types.FinalTranslation, parsed)
     
     def GetReview(
         self,
         llm_response: str,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.Review:
       __tb__ = baml_options.get("tb", None)
       if __tb__ is not None:
         tb = __tb__._tb # type: ignore (we know how to use this private attribute)
@@ -191,7 +217,7 @@ class LlmResponseParser:
         __cr__,
       )
 
-      return cast(str, parsed)
+      return cast(types.Review, parsed)
     
 
 
@@ -208,7 +234,7 @@ class LlmStreamParser:
         self,
         llm_response: str,
         baml_options: BamlCallOptions = {},
-    ) -> Optional[str]:
+    ) -> partial_types.Analysis:
       __tb__ = baml_options.get("tb", None)
       if __tb__ is not None:
         tb = __tb__._tb # type: ignore (we know how to use this private attribute)
@@ -228,13 +254,13 @@ class LlmStreamParser:
         __cr__,
       )
 
-      return cast(Optional[str], parsed)
+      return cast(partial_types.Analysis, parsed)
     
     def GetBackTranslation(
         self,
         llm_response: str,
         baml_options: BamlCallOptions = {},
-    ) -> Optional[str]:
+    ) -> partial_types.BackTranslation:
       __tb__ = baml_options.get("tb", None)
       if __tb__ is not None:
         tb = __tb__._tb # type: ignore (we know how to use this private attribute)
@@ -254,13 +280,13 @@ class LlmStreamParser:
         __cr__,
       )
 
-      return cast(Optional[str], parsed)
+      return cast(partial_types.BackTranslation, parsed)
     
     def GetClarity(
         self,
         llm_response: str,
         baml_options: BamlCallOptions = {},
-    ) -> Optional[str]:
+    ) -> partial_types.ClearTranslation:
       __tb__ = baml_options.get("tb", None)
       if __tb__ is not None:
         tb = __tb__._tb # type: ignore (we know how to use this private attribute)
@@ -280,13 +306,13 @@ class LlmStreamParser:
         __cr__,
       )
 
-      return cast(Optional[str], parsed)
+      return cast(partial_types.ClearTranslation, parsed)
     
     def GetFinalTranslation(
         self,
         llm_response: str,
         baml_options: BamlCallOptions = {},
-    ) -> Optional[str]:
+    ) -> partial_types.FinalTranslation:
       __tb__ = baml_options.get("tb", None)
       if __tb__ is not None:
         tb = __tb__._tb # type: ignore (we know how to use this private attribute)
@@ -306,13 +332,13 @@ class LlmStreamParser:
         __cr__,
       )
 
-      return cast(Optional[str], parsed)
+      return cast(partial_types.FinalTranslation, parsed)
     
     def GetLiteralTranslate(
         self,
         llm_response: str,
         baml_options: BamlCallOptions = {},
-    ) -> Optional[str]:
+    ) -> partial_types.LiteralTranslation:
       __tb__ = baml_options.get("tb", None)
       if __tb__ is not None:
         tb = __tb__._tb # type: ignore (we know how to use this private attribute)
@@ -332,13 +358,39 @@ class LlmStreamParser:
         __cr__,
       )
 
-      return cast(Optional[str], parsed)
+      return cast(partial_types.LiteralTranslation, parsed)
+    
+    def GetPolishedTranslation(
+        self,
+        llm_response: str,
+        baml_options: BamlCallOptions = {},
+    ) -> partial_types.FinalTranslation:
+      __tb__ = baml_options.get("tb", None)
+      if __tb__ is not None:
+        tb = __tb__._tb # type: ignore (we know how to use this private attribute)
+      else:
+        tb = None
+      __cr__ = baml_options.get("client_registry", None)
+
+      parsed = self.__runtime.parse_llm_response(
+        "GetPolishedTranslation",
+        llm_response,
+        types,
+        types,
+        partial_types,
+        True,
+        self.__ctx_manager.get(),
+        tb,
+        __cr__,
+      )
+
+      return cast(partial_types.FinalTranslation, parsed)
     
     def GetReview(
         self,
         llm_response: str,
         baml_options: BamlCallOptions = {},
-    ) -> Optional[str]:
+    ) -> partial_types.Review:
       __tb__ = baml_options.get("tb", None)
       if __tb__ is not None:
         tb = __tb__._tb # type: ignore (we know how to use this private attribute)
@@ -358,7 +410,7 @@ class LlmStreamParser:
         __cr__,
       )
 
-      return cast(Optional[str], parsed)
+      return cast(partial_types.Review, parsed)
     
 
 
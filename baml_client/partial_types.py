@@ -34,4 +34,55 @@ class StreamState(BaseModel, Generic[T]):
     value: T
     state: Literal["Pending", "Incomplete", "Complete"]
 
-
\ No newline at end of file
+
+class Alternative(BaseModel):
+    text: Optional[str] = None
+    meaning: Optional[str] = None
+
+class Analysis(BaseModel):
+    outline: List[str]
+    terms: List["TermNote"]
+    cultural_references: List[str]
+    imagery: List[str]
+    challenges: List[str]
+
+class BackLine(BaseModel):
+    text: Optional[str] = None
+    notes: List[str]
+
+class BackTranslation(BaseModel):
+    lines: List["BackLine"]
+
+class ClearLine(BaseModel):
+    translation: Optional[str] = None
+    alternatives: List[str]
+
+class ClearTranslation(BaseModel):
+    lines: List["ClearLine"]
+
+class FinalTranslation(BaseModel):
+    translation: Optional[str] = None
+
+class LiteralLine(BaseModel):
+    source: Optional[str] = None
+    translation: Optional[str] = None
+    alternatives: List["Alternative"]
+
+class LiteralTranslation(BaseModel):
+    lines: List["LiteralLine"]
+
+class Review(BaseModel):
+    issues: List["ReviewIssue"]
+    severity: Optional[int] = None
+    summary: Optional[str] = None
+
+class ReviewIssue(BaseModel):
+    location: Optional[str] = None
+    problem: Optional[str] = None
+    suggestion: Optional[str] = None
+    severity: Optional[int] = None
+
+class TermNote(BaseModel):
+    source_term: Optional[str] = None
+    target_term: Optional[str] = None
+    note: Optional[str] = None
\ No newline at end of file
@@ -102,7 +102,7 @@ class BamlSyncClient:
         self,
         context: str,target_lang: str,source_text: str,source_lang: str,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.Analysis:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -123,13 +123,13 @@ class BamlSyncClient:
         __cr__,
         collectors,
       )
-      return cast(str, raw.cast_to(types, types, partial_types, False))
+      return cast(types.Analysis, raw.cast_to(types, types, partial_types, False))
     
     def GetBackTranslation(
         self,
-        context: str,source_lang: str,clarified_translation: str,
+        context: str,source_lang: str,clarified_translation: List[str],
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.BackTranslation:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -150,13 +150,13 @@ class BamlSyncClient:
         __cr__,
         collectors,
       )
-      return cast(str, raw.cast_to(types, types, partial_types, False))
+      return cast(types.BackTranslation, raw.cast_to(types, types, partial_types, False))
     
     def GetClarity(
         self,
-        context: str,prompt: str,analysis: str,target_lang: str,literal_translation: str,
+        context: str,prompt: str,analysis: types.Analysis,target_lang: str,literal_translation: types.LiteralTranslation,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.ClearTranslation:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -177,13 +177,13 @@ class BamlSyncClient:
         __cr__,
         collectors,
       )
-      return cast(str, raw.cast_to(types, types, partial_types, False))
+      return cast(types.ClearTranslation, raw.cast_to(types, types, partial_types, False))
     
     def GetFinalTranslation(
         self,
-        context: str,target_lang: str,source_text: str,analysis: str,clarified_translation: str,final_review: str,item_type: str,
+        context: str,target_lang: str,source_text: str,analysis: types.Analysis,clarified_translation: types.ClearTranslation,final_review: types.Review,item_type: str,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.FinalTranslation:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -204,13 +204,13 @@ class BamlSyncClient:
         __cr__,
         collectors,
       )
-      return cast(str, raw.cast_to(types, types, partial_types, False))
+      return cast(types.FinalTranslation, raw.cast_to(types, types, partial_types, False))
     
     def GetLiteralTranslate(
         self,
         context: str,prompt: str,source_lang: str,target_lang: str,is_song: bool,
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.LiteralTranslation:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -231,13 +231,40 @@ class BamlSyncClient:
         __cr__,
         collectors,
       )
-      return cast(str, raw.cast_to(types, types, partial_types, False))
+      return cast(types.LiteralTranslation, raw.cast_to(types, types, partial_types, False))
+    
+    def GetPolishedTranslation(
+        self,
+        context: str,target_lang: str,clarified_translation: types.ClearTranslation,
+        baml_options: BamlCallOptions = {},
+    ) -> types.FinalTranslation:
+      options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
+      __tb__ = options.get("tb", None)
+      if __tb__ is not None:
+        tb = __tb__._tb # type: ignore (we know how to use this private attribute)
+      else:
+        tb = None
+      __cr__ = options.get("client_registry", None)
+      collector = options.get("collector", None)
+      collectors = collector if isinstance(collector, list) else [collector] if collector is not None else []
+
+      raw = self.__runtime.call_function_sync(
+        "GetPolishedTranslation",
+        {
+          "context": context,"target_lang": target_lang,"clarified_translation": clarified_translation,
+        },
+        self.__ctx_manager.get(),
+        tb,
+        __cr__,
+        collectors,
+      )
+      return cast(types.FinalTranslation, raw.cast_to(types, types, partial_types, False))
     
     def GetReview(
         self,
-        context: str,target_lang: str,source_text: str,clarified_translation: str,backtranslation: str,syllabification: Union[str, Optional[None]],
+        context: str,target_lang: str,source_text: str,clarified_translation: List[str],backtranslation: types.BackTranslation,syllabification: Union[str, Optional[None]],
         baml_options: BamlCallOptions = {},
-    ) -> str:
+    ) -> types.Review:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -258,7 +285,7 @@ class BamlSyncClient:
         __cr__,
         collectors,
       )
-      return cast(str, raw.cast_to(types, types, partial_types, False))
+      return cast(types.Review, raw.cast_to(types, types, partial_types, False))
     
 
 
@@ -277,7 +304,7 @@ class BamlStreamClient:
         self,
         context: str,target_lang: str,source_text: str,source_lang: str,
         baml_options: BamlCallOptions = {},
-    ) -> baml_py.BamlSyncStream[Optional[str], str]:
+    ) -> baml_py.BamlSyncStream[partial_types.Analysis, types.Analysis]:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -303,18 +330,18 @@ class BamlStreamClient:
         collectors,
       )
 
-      return baml_py.BamlSyncStream[Optional[str], str](
+      return baml_py.BamlSyncStream[partial_types.Analysis, types.Analysis](
         raw,
-        lambda x: cast(Optional[str], x.cast_to(types, types, partial_types, True)),
-        lambda x: cast(str, x.cast_to(types, types, partial_types, False)),
+        lambda x: cast(partial_types.Analysis, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.Analysis, x.cast_to(types, types, partial_types, False)),
         self.__ctx_manager.get(),
       )
     
     def GetBackTranslation(
         self,
-        context: str,source_lang: str,clarified_translation: str,
+        context: str,source_lang: str,clarified_translation: List[str],
         baml_options: BamlCallOptions = {},
-    ) -> baml_py.BamlSyncStream[Optional[str], str]:
+    ) -> baml_py.BamlSyncStream[partial_types.BackTranslation, types.BackTranslation]:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -339,18 +366,18 @@ class BamlStreamClient:
         collectors,
       )
 
-      return baml_py.BamlSyncStream[Optional[str], str](
+      return baml_py.BamlSyncStream[partial_types.BackTranslation, types.BackTranslation](
         raw,
-        lambda x: cast(Optional[str], x.cast_to(types, types, partial_types, True)),
-        lambda x: cast(str, x.cast_to(types, types, partial_types, False)),
+        lambda x: cast(partial_types.BackTranslation, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.BackTranslation, x.cast_to(types, types, partial_types, False)),
         self.__ctx_manager.get(),
       )
     
     def GetClarity(
         self,
-        context: str,prompt: str,analysis: str,target_lang: str,literal_translation: str,
+        context: str,prompt: str,analysis: types.Analysis,target_lang: str,literal_translation: types.LiteralTranslation,
         baml_options: BamlCallOptions = {},
-    ) -> baml_py.BamlSyncStream[Optional[str], str]:
+    ) -> baml_py.BamlSyncStream[partial_types.ClearTranslation, types.ClearTranslation]:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -377,18 +404,18 @@ class BamlStreamClient:
         collectors,
       )
 
-      return baml_py.BamlSyncStream[Optional[str], str](
+      return baml_py.BamlSyncStream[partial_types.ClearTranslation, types.ClearTranslation](
         raw,
-        lambda x: cast(Optional[str], x.cast_to(types, types, partial_types, True)),
-        lambda x: cast(str, x.cast_to(types, types, partial_types, False)),
+        lambda x: cast(partial_types.ClearTranslation, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.ClearTranslation, x.cast_to(types, types, partial_types, False)),
         self.__ctx_manager.get(),
       )
     
     def GetFinalTranslation(
         self,
-        context: str,target_lang: str,source_text: str,analysis: str,clarified_translation: str,final_review: str,item_type: str,
+        context: str,target_lang: str,source_text: str,analysis: types.Analysis,clarified_translation: types.ClearTranslation,final_review: types.Review,item_type: str,
         baml_options: BamlCallOptions = {},
-    ) -> baml_py.BamlSyncStream[Optional[str], str]:
+    ) -> baml_py.BamlSyncStream[partial_types.FinalTranslation, types.FinalTranslation]:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -417,10 +444,10 @@ class BamlStreamClient:
         collectors,
       )
 
-      return baml_py.BamlSyncStream[Optional[str], str](
+      return baml_py.BamlSyncStream[partial_types.FinalTranslation, types.FinalTranslation](
         raw,
-        lambda x: cast(Optional[str], x.cast_to(types, types, partial_types, True)),
-        lambda x: cast(str, x.cast_to(types, types, partial_types, False)),
+        lambda x: cast(partial_types.FinalTranslation, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.FinalTranslation, x.cast_to(types, types, partial_types, False)),
         self.__ctx_manager.get(),
       )
     
@@ -428,7 +455,7 @@ class BamlStreamClient:
         self,
         context: str,prompt: str,source_lang: str,target_lang: str,is_song: bool,
         baml_options: BamlCallOptions = {},
-    ) -> baml_py.BamlSyncStream[Optional[str], str]:
+    ) -> baml_py.BamlSyncStream[partial_types.LiteralTranslation, types.LiteralTranslation]:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -455,18 +482,54 @@ class BamlStreamClient:
         collectors,
       )
 
-      return baml_py.BamlSyncStream[Optional[str], str](
+      return baml_py.BamlSyncStream[partial_types.LiteralTranslation, types.LiteralTranslation](
+        raw,
+        lambda x: cast(partial_types.LiteralTranslation, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.LiteralTranslation, x.cast_to(types, types, partial_types, False)),
+        self.__ctx_manager.get(),
+      )
+    
+    def GetPolishedTranslation(
+        self,
+        context: str,target_lang: str,clarified_translation: types.ClearTranslation,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.BamlSyncStream[partial_types.FinalTranslation, types.FinalTranslation]:
+      options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
+      __tb__ = options.get("tb", None)
+      if __tb__ is not None:
+        tb = __tb__._tb # type: ignore (we know how to use this private attribute)
+      else:
+        tb = None
+      __cr__ = options.get("client_registry", None)
+      collector = options.get("collector", None)
+      collectors = collector if isinstance(collector, list) else [collector] if collector is not None else []
+
+      raw = self.__runtime.stream_function_sync(
+        "GetPolishedTranslation",
+        {
+          "context": context,
+          "target_lang": target_lang,
+          "clarified_translation": clarified_translation,
+        },
+        None,
+        self.__ctx_manager.get(),
+        tb,
+        __cr__,
+        collectors,
+      )
+
+      return baml_py.BamlSyncStream[partial_types.FinalTranslation, types.FinalTranslation](
         raw,
-        lambda x: cast(Optional[str], x.cast_to(types, types, partial_types, True)),
-        lambda x: cast(str, x.cast_to(types, types, partial_types, False)),
+        lambda x: cast(partial_types.FinalTranslation, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.FinalTranslation, x.cast_to(types, types, partial_types, False)),
         self.__ctx_manager.get(),
       )
     
     def GetReview(
         self,
-        context: str,target_lang: str,source_text: str,clarified_translation: str,backtranslation: str,syllabification: Union[str, Optional[None]],
+        context: str,target_lang: str,source_text: str,clarified_translation: List[str],backtranslation: types.BackTranslation,syllabification: Union[str, Optional[None]],
         baml_options: BamlCallOptions = {},
-    ) -> baml_py.BamlSyncStream[Optional[str], str]:
+    ) -> baml_py.BamlSyncStream[partial_types.Review, types.Review]:
       options: BamlCallOptions = {**self.__baml_options, **(baml_options or {})}
       __tb__ = options.get("tb", None)
       if __tb__ is not None:
@@ -494,10 +557,10 @@ class BamlStreamClient:
         collectors,
       )
 
-      return baml_py.BamlSyncStream[Optional[str], str](
+      return baml_py.BamlSyncStream[partial_types.Review, types.Review](
         raw,
-        lambda x: cast(Optional[str], x.cast_to(types, types, partial_types, True)),
-        lambda x: cast(str, x.cast_to(types, types, partial_types, False)),
+        lambda x: cast(partial_types.Review, x.cast_to(types, types, partial_types, True)),
+        lambda x: cast(types.Review, x.cast_to(types, types, partial_types, False)),
         self.__ctx_manager.get(),
       )
     
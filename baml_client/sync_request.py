@@ -62,7 +62,7 @@ class HttpRequest:
     
     def GetBackTranslation(
         self,
-        context: str,source_lang: str,clarified_translation: str,
+        context: str,source_lang: str,clarified_translation: List[str],
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -85,7 +85,7 @@ class HttpRequest:
     
     def GetClarity(
         self,
-        context: str,prompt: str,analysis: str,target_lang: str,literal_translation: str,
+        context: str,prompt: str,analysis: types.Analysis,target_lang: str,literal_translation: types.LiteralTranslation,
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -108,7 +108,7 @@ class HttpRequest:
     
     def GetFinalTranslation(
         self,
-        context: str,target_lang: str,source_text: str,analysis: str,clarified_translation: str,final_review: str,item_type: str,
+        context: str,target_lang: str,source_text: str,analysis: types.Analysis,clarified_translation: types.ClearTranslation,final_review: types.Review,item_type: str,
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -152,9 +152,32 @@ class HttpRequest:
         False,
       )
     
+    def GetPolishedTranslation(
+        self,
+        context: str,target_lang: str,clarified_translation: types.ClearTranslation,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.HTTPRequest:
+      __tb__ = baml_options.get("tb", None)
+      if __tb__ is not None:
+        tb = __tb__._tb # type: ignore (we know how to use this private attribute)
+      else:
+        tb = None
+      __cr__ = baml_options.get("client_registry", None)
+
+      return self.__runtime.build_request_sync(
+        "GetPolishedTranslation",
+        {
+          "context": context,"target_lang": target_lang,"clarified_translation": clarified_translation,
+        },
+        self.__ctx_manager.get(),
+        tb,
+        __cr__,
+        False,
+      )
+    
     def GetReview(
         self,
-        context: str,target_lang: str,source_text: str,clarified_translation: str,backtranslation: str,syllabification: Union[str, Optional[None]],
+        context: str,target_lang: str,source_text: str,clarified_translation: List[str],backtranslation: types.BackTranslation,syllabification: Union[str, Optional[None]],
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -211,7 +234,7 @@ class HttpStreamRequest:
     
     def GetBackTranslation(
         self,
-        context: str,source_lang: str,clarified_translation: str,
+        context: str,source_lang: str,clarified_translation: List[str],
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -234,7 +257,7 @@ class HttpStreamRequest:
     
     def GetClarity(
         self,
-        context: str,prompt: str,analysis: str,target_lang: str,literal_translation: str,
+        context: str,prompt: str,analysis: types.Analysis,target_lang: str,literal_translation: types.LiteralTranslation,
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -257,7 +280,7 @@ class HttpStreamRequest:
     
     def GetFinalTranslation(
         self,
-        context: str,target_lang: str,source_text: str,analysis: str,clarified_translation: str,final_review: str,item_type: str,
+        context: str,target_lang: str,source_text: str,analysis: types.Analysis,clarified_translation: types.ClearTranslation,final_review: types.Review,item_type: str,
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -301,9 +324,32 @@ class HttpStreamRequest:
         True,
       )
     
+    def GetPolishedTranslation(
+        self,
+        context: str,target_lang: str,clarified_translation: types.ClearTranslation,
+        baml_options: BamlCallOptions = {},
+    ) -> baml_py.HTTPRequest:
+      __tb__ = baml_options.get("tb", None)
+      if __tb__ is not None:
+        tb = __tb__._tb # type: ignore (we know how to use this private attribute)
+      else:
+        tb = None
+      __cr__ = baml_options.get("client_registry", None)
+
+      return self.__runtime.build_request_sync(
+        "GetPolishedTranslation",
+        {
+          "context": context,"target_lang": target_lang,"clarified_translation": clarified_translation,
+        },
+        self.__ctx_manager.get(),
+        tb,
+        __cr__,
+        True,
+      )
+    
     def GetReview(
         self,
-        context: str,target_lang: str,source_text: str,clarified_translation: str,backtranslation: str,syllabification: Union[str, Optional[None]],
+        context: str,target_lang: str,source_text: str,clarified_translation: List[str],backtranslation: types.BackTranslation,syllabification: Union[str, Optional[None]],
         baml_options: BamlCallOptions = {},
     ) -> baml_py.HTTPRequest:
       __tb__ = baml_options.get("tb", None)
@@ -22,15 +22,583 @@ from .globals import DO_NOT_USE_DIRECTLY_UNLESS_YOU_KNOW_WHAT_YOURE_DOING_RUNTIM
 class TypeBuilder(_TypeBuilder):
     def __init__(self):
         super().__init__(classes=set(
-          []
+          ["Alternative","Analysis","BackLine","BackTranslation","ClearLine","ClearTranslation","FinalTranslation","LiteralLine","LiteralTranslation","Review","ReviewIssue","TermNote",]
         ), enums=set(
           []
         ), runtime=DO_NOT_USE_DIRECTLY_UNLESS_YOU_KNOW_WHAT_YOURE_DOING_RUNTIME)
 
 
+    @property
+    def Alternative(self) -> "AlternativeAst":
+        return AlternativeAst(self)
+
+    @property
+    def Analysis(self) -> "AnalysisAst":
+        return AnalysisAst(self)
+
+    @property
+    def BackLine(self) -> "BackLineAst":
+        return BackLineAst(self)
+
+    @property
+    def BackTranslation(self) -> "BackTranslationAst":
+        return BackTranslationAst(self)
+
+    @property
+    def ClearLine(self) -> "ClearLineAst":
+        return ClearLineAst(self)
+
+    @property
+    def ClearTranslation(self) -> "ClearTranslationAst":
+        return ClearTranslationAst(self)
+
+    @property
+    def FinalTranslation(self) -> "FinalTranslationAst":
+        return FinalTranslationAst(self)
+
+    @property
+    def LiteralLine(self) -> "LiteralLineAst":
+        return LiteralLineAst(self)
+
+    @property
+    def LiteralTranslation(self) -> "LiteralTranslationAst":
+        return LiteralTranslationAst(self)
+
+    @property
+    def Review(self) -> "ReviewAst":
+        return ReviewAst(self)
+
+    @property
+    def ReviewIssue(self) -> "ReviewIssueAst":
+        return ReviewIssueAst(self)
+
+    @property
+    def TermNote(self) -> "TermNoteAst":
+        return TermNoteAst(self)
+
+
+
+
+
+class AlternativeAst:
+    def __init__(self, tb: _TypeBuilder):
+        _tb = tb._tb # type: ignore (we know how to use this private attribute)
+        self._bldr = _tb.class_("Alternative")
+        self._properties: typing.Set[str] = set([ "text",  "meaning", ])
+        self._props = AlternativeProperties(self._bldr, self._properties)
+
+    def type(self) -> FieldType:
+        return self._bldr.field()
+
+    @property
+    def props(self) -> "AlternativeProperties":
+        return self._props
+
+
+class AlternativeViewer(AlternativeAst):
+    def __init__(self, tb: _TypeBuilder):
+        super().__init__(tb)
+
+    
+    def list_properties(self) -> typing.List[typing.Tuple[str, ClassPropertyViewer]]:
+        return [(name, ClassPropertyViewer(self._bldr.property(name))) for name in self._properties]
+
+
+
+class AlternativeProperties:
+    def __init__(self, bldr: ClassBuilder, properties: typing.Set[str]):
+        self.__bldr = bldr
+        self.__properties = properties
+
+    
+
+    @property
+    def text(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("text"))
+
+    @property
+    def meaning(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("meaning"))
+
+    
+
+class AnalysisAst:
+    def __init__(self, tb: _TypeBuilder):
+        _tb = tb._tb # type: ignore (we know how to use this private attribute)
+        self._bldr = _tb.class_("Analysis")
+        self._properties: typing.Set[str] = set([ "outline",  "terms",  "cultural_references",  "imagery",  "challenges", ])
+        self._props = AnalysisProperties(self._bldr, self._properties)
+
+    def type(self) -> FieldType:
+        return self._bldr.field()
+
+    @property
+    def props(self) -> "AnalysisProperties":
+        return self._props
+
+
+class AnalysisViewer(AnalysisAst):
+    def __init__(self, tb: _TypeBuilder):
+        super().__init__(tb)
+
+    
+    def list_properties(self) -> typing.List[typing.Tuple[str, ClassPropertyViewer]]:
+        return [(name, ClassPropertyViewer(self._bldr.property(name))) for name in self._properties]
+
+
+
+class AnalysisProperties:
+    def __init__(self, bldr: ClassBuilder, properties: typing.Set[str]):
+        self.__bldr = bldr
+        self.__properties = properties
+
+    
+
+    @property
+    def outline(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("outline"))
+
+    @property
+    def terms(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("terms"))
+
+    @property
+    def cultural_references(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("cultural_references"))
+
+    @property
+    def imagery(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("imagery"))
+
+    @property
+    def challenges(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("challenges"))
+
+    
+
+class BackLineAst:
+    def __init__(self, tb: _TypeBuilder):
+        _tb = tb._tb # type: ignore (we know how to use this private attribute)
+        self._bldr = _tb.class_("BackLine")
+        self._properties: typing.Set[str] = set([ "text",  "notes", ])
+        self._props = BackLineProperties(self._bldr, self._properties)
+
+    def type(self) -> FieldType:
+        return self._bldr.field()
+
+    @property
+    def props(self) -> "BackLineProperties":
+        return self._props
+
+
+class BackLineViewer(BackLineAst):
+    def __init__(self, tb: _TypeBuilder):
+        super().__init__(tb)
+
+    
+    def list_properties(self) -> typing.List[typing.Tuple[str, ClassPropertyViewer]]:
+        return [(name, ClassPropertyViewer(self._bldr.property(name))) for name in self._properties]
+
+
+
+class BackLineProperties:
+    def __init__(self, bldr: ClassBuilder, properties: typing.Set[str]):
+        self.__bldr = bldr
+        self.__properties = properties
+
+    
+
+    @property
+    def text(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("text"))
+
+    @property
+    def notes(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("notes"))
+
+    
+
+class BackTranslationAst:
+    def __init__(self, tb: _TypeBuilder):
+        _tb = tb._tb # type: ignore (we know how to use this private attribute)
+        self._bldr = _tb.class_("BackTranslation")
+        self._properties: typing.Set[str] = set([ "lines", ])
+        self._props = BackTranslationProperties(self._bldr, self._properties)
+
+    def type(self) -> FieldType:
+        return self._bldr.field()
+
+    @property
+    def props(self) -> "BackTranslationProperties":
+        return self._props
+
+
+class BackTranslationViewer(BackTranslationAst):
+    def __init__(self, tb: _TypeBuilder):
+        super().__init__(tb)
+
+    
+    def list_properties(self) -> typing.List[typing.Tuple[str, ClassPropertyViewer]]:
+        return [(name, ClassPropertyViewer(self._bldr.property(name))) for name in self._properties]
+
+
+
+class BackTranslationProperties:
+    def __init__(self, bldr: ClassBuilder, properties: typing.Set[str]):
+        self.__bldr = bldr
+        self.__properties = properties
+
+    
+
+    @property
+    def lines(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("lines"))
+
+    
+
+class ClearLineAst:
+    def __init__(self, tb: _TypeBuilder):
+        _tb = tb._tb # type: ignore (we know how to use this private attribute)
+        self._bldr = _tb.class_("ClearLine")
+        self._properties: typing.Set[str] = set([ "translation",  "alternatives", ])
+        self._props = ClearLineProperties(self._bldr, self._properties)
+
+    def type(self) -> FieldType:
+        return self._bldr.field()
+
+    @property
+    def props(self) -> "ClearLineProperties":
+        return self._props
+
+
+class ClearLineViewer(ClearLineAst):
+    def __init__(self, tb: _TypeBuilder):
+        super().__init__(tb)
+
+    
+    def list_properties(self) -> typing.List[typing.Tuple[str, ClassPropertyViewer]]:
+        return [(name, ClassPropertyViewer(self._bldr.property(name))) for name in self._properties]
+
+
+
+class ClearLineProperties:
+    def __init__(self, bldr: ClassBuilder, properties: typing.Set[str]):
+        self.__bldr = bldr
+        self.__properties = properties
+
+    
+
+    @property
+    def translation(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("translation"))
+
+    @property
+    def alternatives(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("alternatives"))
+
+    
+
+class ClearTranslationAst:
+    def __init__(self, tb: _TypeBuilder):
+        _tb = tb._tb # type: ignore (we know how to use this private attribute)
+        self._bldr = _tb.class_("ClearTranslation")
+        self._properties: typing.Set[str] = set([ "lines", ])
+        self._props = ClearTranslationProperties(self._bldr, self._properties)
+
+    def type(self) -> FieldType:
+        return self._bldr.field()
+
+    @property
+    def props(self) -> "ClearTranslationProperties":
+        return self._props
+
+
+class ClearTranslationViewer(ClearTranslationAst):
+    def __init__(self, tb: _TypeBuilder):
+        super().__init__(tb)
+
+    
+    def list_properties(self) -> typing.List[typing.Tuple[str, ClassPropertyViewer]]:
+        return [(name, ClassPropertyViewer(self._bldr.property(name))) for name in self._properties]
+
+
+
+class ClearTranslationProperties:
+    def __init__(self, bldr: ClassBuilder, properties: typing.Set[str]):
+        self.__bldr = bldr
+        self.__properties = properties
+
+    
+
+    @property
+    def lines(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("lines"))
+
+    
+
+class FinalTranslationAst:
+    def __init__(self, tb: _TypeBuilder):
+        _tb = tb._tb # type: ignore (we know how to use this private attribute)
+        self._bldr = _tb.class_("FinalTranslation")
+        self._properties: typing.Set[str] = set([ "translation", ])
+        self._props = FinalTranslationProperties(self._bldr, self._properties)
+
+    def type(self) -> FieldType:
+        return self._bldr.field()
+
+    @property
+    def props(self) -> "FinalTranslationProperties":
+        return self._props
+
+
+class FinalTranslationViewer(FinalTranslationAst):
+    def __init__(self, tb: _TypeBuilder):
+        super().__init__(tb)
+
+    
+    def list_properties(self) -> typing.List[typing.Tuple[str, ClassPropertyViewer]]:
+        return [(name, ClassPropertyViewer(self._bldr.property(name))) for name in self._properties]
+
+
+
+class FinalTranslationProperties:
+    def __init__(self, bldr: ClassBuilder, properties: typing.Set[str]):
+        self.__bldr = bldr
+        self.__properties = properties
+
+    
+
+    @property
+    def translation(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("translation"))
+
+    
+
+class LiteralLineAst:
+    def __init__(self, tb: _TypeBuilder):
+        _tb = tb._tb # type: ignore (we know how to use this private attribute)
+        self._bldr = _tb.class_("LiteralLine")
+        self._properties: typing.Set[str] = set([ "source",  "translation",  "alternatives", ])
+        self._props = LiteralLineProperties(self._bldr, self._properties)
+
+    def type(self) -> FieldType:
+        return self._bldr.field()
+
+    @property
+    def props(self) -> "LiteralLineProperties":
+        return self._props
+
+
+class LiteralLineViewer(LiteralLineAst):
+    def __init__(self, tb: _TypeBuilder):
+        super().__init__(tb)
+
+    
+    def list_properties(self) -> typing.List[typing.Tuple[str, ClassPropertyViewer]]:
+        return [(name, ClassPropertyViewer(self._bldr.property(name))) for name in self._properties]
+
+
+
+class LiteralLineProperties:
+    def __init__(self, bldr: ClassBuilder, properties: typing.Set[str]):
+        self.__bldr = bldr
+        self.__properties = properties
+
+    
+
+    @property
+    def source(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("source"))
+
+    @property
+    def translation(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("translation"))
+
+    @property
+    def alternatives(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("alternatives"))
+
+    
+
+class LiteralTranslationAst:
+    def __init__(self, tb: _TypeBuilder):
+        _tb = tb._tb # type: ignore (we know how to use this private attribute)
+        self._bldr = _tb.class_("LiteralTranslation")
+        self._properties: typing.Set[str] = set([ "lines", ])
+        self._props = LiteralTranslationProperties(self._bldr, self._properties)
+
+    def type(self) -> FieldType:
+        return self._bldr.field()
+
+    @property
+    def props(self) -> "LiteralTranslationProperties":
+        return self._props
+
+
+class LiteralTranslationViewer(LiteralTranslationAst):
+    def __init__(self, tb: _TypeBuilder):
+        super().__init__(tb)
+
+    
+    def list_properties(self) -> typing.List[typing.Tuple[str, ClassPropertyViewer]]:
+        return [(name, ClassPropertyViewer(self._bldr.property(name))) for name in self._properties]
+
+
+
+class LiteralTranslationProperties:
+    def __init__(self, bldr: ClassBuilder, properties: typing.Set[str]):
+        self.__bldr = bldr
+        self.__properties = properties
+
+    
+
+    @property
+    def lines(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("lines"))
+
+    
+
+class ReviewAst:
+    def __init__(self, tb: _TypeBuilder):
+        _tb = tb._tb # type: ignore (we know how to use this private attribute)
+        self._bldr = _tb.class_("Review")
+        self._properties: typing.Set[str] = set([ "issues",  "severity",  "summary", ])
+        self._props = ReviewProperties(self._bldr, self._properties)
+
+    def type(self) -> FieldType:
+        return self._bldr.field()
+
+    @property
+    def props(self) -> "ReviewProperties":
+        return self._props
+
+
+class ReviewViewer(ReviewAst):
+    def __init__(self, tb: _TypeBuilder):
+        super().__init__(tb)
+
+    
+    def list_properties(self) -> typing.List[typing.Tuple[str, ClassPropertyViewer]]:
+        return [(name, ClassPropertyViewer(self._bldr.property(name))) for name in self._properties]
+
+
+
+class ReviewProperties:
+    def __init__(self, bldr: ClassBuilder, properties: typing.Set[str]):
+        self.__bldr = bldr
+        self.__properties = properties
+
+    
+
+    @property
+    def issues(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("issues"))
+
+    @property
+    def severity(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("severity"))
+
+    @property
+    def summary(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("summary"))
+
+    
+
+class ReviewIssueAst:
+    def __init__(self, tb: _TypeBuilder):
+        _tb = tb._tb # type: ignore (we know how to use this private attribute)
+        self._bldr = _tb.class_("ReviewIssue")
+        self._properties: typing.Set[str] = set([ "location",  "problem",  "suggestion",  "severity", ])
+        self._props = ReviewIssueProperties(self._bldr, self._properties)
+
+    def type(self) -> FieldType:
+        return self._bldr.field()
+
+    @property
+    def props(self) -> "ReviewIssueProperties":
+        return self._props
+
+
+class ReviewIssueViewer(ReviewIssueAst):
+    def __init__(self, tb: _TypeBuilder):
+        super().__init__(tb)
+
+    
+    def list_properties(self) -> typing.List[typing.Tuple[str, ClassPropertyViewer]]:
+        return [(name, ClassPropertyViewer(self._bldr.property(name))) for name in self._properties]
+
+
+
+class ReviewIssueProperties:
+    def __init__(self, bldr: ClassBuilder, properties: typing.Set[str]):
+        self.__bldr = bldr
+        self.__properties = properties
+
+    
+
+    @property
+    def location(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("location"))
+
+    @property
+    def problem(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("problem"))
+
+    @property
+    def suggestion(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("suggestion"))
+
+    @property
+    def severity(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("severity"))
+
+    
+
+class TermNoteAst:
+    def __init__(self, tb: _TypeBuilder):
+        _tb = tb._tb # type: ignore (we know how to use this private attribute)
+        self._bldr = _tb.class_("TermNote")
+        self._properties: typing.Set[str] = set([ "source_term",  "target_term",  "note", ])
+        self._props = TermNoteProperties(self._bldr, self._properties)
+
+    def type(self) -> FieldType:
+        return self._bldr.field()
+
+    @property
+    def props(self) -> "TermNoteProperties":
+        return self._props
+
+
+class TermNoteViewer(TermNoteAst):
+    def __init__(self, tb: _TypeBuilder):
+        super().__init__(tb)
+
+    
+    def list_properties(self) -> typing.List[typing.Tuple[str, ClassPropertyViewer]]:
+        return [(name, ClassPropertyViewer(self._bldr.property(name))) for name in self._properties]
+
+
+
+class TermNoteProperties:
+    def __init__(self, bldr: ClassBuilder, properties: typing.Set[str]):
+        self.__bldr = bldr
+        self.__properties = properties
+
+    
+
+    @property
+    def source_term(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("source_term"))
 
+    @property
+    def target_term(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("target_term"))
 
+    @property
+    def note(self) -> ClassPropertyViewer:
+        return ClassPropertyViewer(self.__bldr.property("note"))
 
+    
 
 
 
@@ -39,4 +39,55 @@ def all_succeeded(checks: Dict[CheckName, Check]) -> bool:
     return all(check.status == "succeeded" for check in get_checks(checks))
 
 
-
\ No newline at end of file
+
+class Alternative(BaseModel):
+    text: str
+    meaning: str
+
+class Analysis(BaseModel):
+    outline: List[str]
+    terms: List["TermNote"]
+    cultural_references: List[str]
+    imagery: List[str]
+    challenges: List[str]
+
+class BackLine(BaseModel):
+    text: str
+    notes: List[str]
+
+class BackTranslation(BaseModel):
+    lines: List["BackLine"]
+
+class ClearLine(BaseModel):
+    translation: str
+    alternatives: List[str]
+
+class ClearTranslation(BaseModel):
+    lines: List["ClearLine"]
+
+class FinalTranslation(BaseModel):
+    translation: str
+
+class LiteralLine(BaseModel):
+    source: str
+    translation: str
+    alternatives: List["Alternative"]
+
+class LiteralTranslation(BaseModel):
+    lines: List["LiteralLine"]
+
+class Review(BaseModel):
+    issues: List["ReviewIssue"]
+    severity: int
+    summary: str
+
+class ReviewIssue(BaseModel):
+    location: str
+    problem: str
+    suggestion: str
+    severity: int
+
+class TermNote(BaseModel):
+    source_term: str
+    target_term: str
+    note: str
\ No newline at end of file
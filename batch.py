@@ -0,0 +1,163 @@
+""" Headless batch translation.
+
+    python batch.py corpus/ results.jsonl --pair English:French --pair English:German
+    python batch.py corpus.jsonl results.jsonl --concurrency 16
+
+A directory is read as one document per *.txt/*.md file (id = relative path).
+A JSONL file needs `id` and `source_text` per line and may carry its own
+`source_lang`, `target_lang` and `extra_context`, which take precedence over
+--pair. With --batch-api every phase goes out as provider batch jobs
+(batch_api.py): slower, cheaper, and best with a high --concurrency, which
+is how many documents share a job. Results are appended to OUTPUT as each document finishes; rerunning
+the same command skips every (id, source_lang, target_lang) already there.
+
+    python batch.py corpus/ results.jsonl --batch-api --mock              # local stand-in, batch jobs included
+    python batch.py corpus/ results.jsonl --base-url http://localhost:8089/v1
+
+--mock starts mock_llm.py in-process; --base-url sends every call to an
+OpenAI-compatible endpoint such as a running `python mock_llm.py`. Either
+way the phase cache stays in memory and the translation memory is left
+alone, so stand-in output never reaches real runs.
+"""
+from baml_client.async_client import b
+from batch_api import make_batch_client
+from llm_util import get_context_prompt, LOGGER
+from metrics import RunMetrics, start_metrics_server
+from mock_llm import mock_registry, start_mock_server
+from phase_cache import PhaseCache, make_phase_cache
+from routing import make_client
+from rate_limit import set_session
+from translation_memory import make_translation_memory
+from chunking import run_chunked_pipeline, CHUNK_CHARS
+from pathlib import Path
+from typing import List
+import asyncio, json, typer
+
+
+def load_documents(source: Path) -> list:
+    if source.is_dir():
+        return [
+            {"id": str(path.relative_to(source)), "source_text": path.read_text(encoding="utf-8")}
+            for path in sorted(source.rglob("*"))
+            if path.suffix in (".txt", ".md") and path.is_file()
+        ]
+    with open(source, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_finished(output: Path) -> set:
+    """ Keys of every document that already has results in `output`. """
+    finished = set()
+    if output.exists():
+        with open(output, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # a line cut short by an interrupted run
+                    continue
+                if "results" in record:
+                    finished.add((record["id"], record["source_lang"], record["target_lang"]))
+    return finished
+
+
+def expand_jobs(documents: list, pairs: list) -> list:
+    jobs = []
+    for doc in documents:
+        if "target_lang" in doc:
+            doc_pairs = [(doc.get("source_lang", "English"), doc["target_lang"])]
+        else:
+            doc_pairs = pairs
+        for source_lang, target_lang in doc_pairs:
+            jobs.append({**doc, "source_lang": source_lang, "target_lang": target_lang})
+    return jobs
+
+
+async def translate_all(jobs: list, output: Path, *, concurrency: int, client, cache, memory=None,
+                        max_chars: int = CHUNK_CHARS) -> None:
+    limit = asyncio.Semaphore(concurrency)
+    done = 0
+
+    with open(output, "a", encoding="utf-8") as out:
+
+        async def translate(job: dict):
+            nonlocal done
+            async with limit:
+                record = {"id": job["id"], "source_lang": job["source_lang"], "target_lang": job["target_lang"]}
+                inputs = dict(
+                    context=get_context_prompt(
+                        target_lang=job["target_lang"],
+                        source_lang=job["source_lang"],
+                        extra_context=job.get("extra_context", ""),
+                    ),
+                    source_lang=job["source_lang"],
+                    target_lang=job["target_lang"],
+                    source_text=job["source_text"],
+                )
+                # documents in flight share the provider quota round-robin
+                set_session(job["id"])
+                metrics = RunMetrics(document=job["id"], source_lang=job["source_lang"], target_lang=job["target_lang"])
+                try:
+                    record["results"] = await run_chunked_pipeline(inputs, client=client, cache=cache, max_chars=max_chars,
+                                                                   metrics=metrics, memory=memory)
+                    if memory is not None:
+                        memory.add_translation(job["source_lang"], job["target_lang"], job["source_text"], record["results"]["final"])
+                except Exception as e:
+                    LOGGER.error("batch item %s failed: %s", job["id"], e)
+                    record["error"] = str(e)
+                summary = metrics.finish()
+                record["seconds"] = round(summary["wall_ms"] / 1000, 3)
+                record["cost_usd"] = summary["cost_usd"]
+
+            # one write per line keeps the file resumable if we're killed mid-run
+            out.write(json.dumps(record, ensure_ascii=False, default=lambda value: value.model_dump(mode="json")) + "\n")
+            out.flush()
+            done += 1
+            typer.echo(f"[{done}/{len(jobs)}] {job['id']} {job['source_lang']}->{job['target_lang']} "
+                       f"{'failed' if 'error' in record else 'ok'} in {record['seconds']}s")
+
+        await asyncio.gather(*(translate(job) for job in jobs))
+
+
+def main(
+    source: Path = typer.Argument(..., exists=True, help="Directory of text files or a JSONL file"),
+    output: Path = typer.Argument(..., help="JSONL file results are appended to"),
+    pair: List[str] = typer.Option(["English:French"], help="SOURCE:TARGET language pair, repeatable"),
+    concurrency: int = typer.Option(8, help="Documents translated at the same time"),
+    max_chars: int = typer.Option(CHUNK_CHARS, help="Longer documents are split into chunks of this size"),
+    metrics_port: int = typer.Option(0, help="Serve Prometheus-style metrics on this port while running"),
+    batch_api: bool = typer.Option(False, help="Send calls as provider batch jobs instead of one by one"),
+    mock: bool = typer.Option(False, help="Send every call to a local mock_llm.py stand-in"),
+    base_url: str = typer.Option("", help="Send every call to this OpenAI-compatible endpoint instead"),
+):
+    pairs = [tuple(p.split(":", 1)) for p in pair]
+    finished = load_finished(output)
+    jobs = [
+        job for job in expand_jobs(load_documents(source), pairs)
+        if (job["id"], job["source_lang"], job["target_lang"]) not in finished
+    ]
+    typer.echo(f"{len(jobs)} to translate, {len(finished)} already done")
+    if metrics_port:
+        start_metrics_server(metrics_port)
+    registry = None
+    if mock:
+        _, base_url = start_mock_server()
+    if base_url:
+        registry = mock_registry(base_url)
+    batched = None
+    if batch_api:
+        client, batched = make_batch_client(b, registry)
+    else:
+        client = make_client(b, registry=registry)
+    # stand-in replies share cache keys with real ones
+    cache, memory = (PhaseCache(), None) if registry is not None else (make_phase_cache(), make_translation_memory())
+    asyncio.run(translate_all(jobs, output, concurrency=concurrency, client=client, cache=cache,
+                              memory=memory, max_chars=max_chars))
+    if batched is not None:
+        for job in batched.jobs:
+            typer.echo(f"batch {job['job']}: {job['requests']} {job['model']} requests, {job['failed']} failed, "
+                       f"{job['seconds']}s, ${job['cost_usd']}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,261 @@
+""" Sending phase calls through the providers' batch APIs instead of one request each.
+
+    python batch.py corpus/ results.jsonl --batch-api
+
+Batch jobs take minutes to hours instead of seconds but cost about half and
+don't count against the per-minute rate limits, which suits overnight corpus
+runs. BatchApiClient stands in for BamlAsyncClient: every call builds its raw
+HTTP request with `b.request`, waits in a queue for up to BATCH_WINDOW
+seconds, and goes out with the other calls queued by then as one batch job
+per provider endpoint and model. Since the pipeline runs phase by phase,
+that's one job per phase across all the documents in flight. Jobs are polled
+every BATCH_POLL seconds and each reply is parsed with `b.parse`.
+
+Supported: OpenAI and OpenAI-compatible endpoints (Files + Batches API),
+Anthropic (Message Batches) and Gemini (batchGenerateContent with inline
+requests). mock_llm.py implements the OpenAI flavour for local runs.
+"""
+from http_pool import INTERNAL_HEADERS, reply
+from llm_util import LOGGER
+from metrics import estimate_cost
+from routing import PRESETS, PhaseAssignedClient, target_client
+import asyncio, httpx, json, os, time, uuid
+
+BATCH_WINDOW = float(os.environ.get("BATCH_WINDOW", 5))       # seconds calls wait for company
+BATCH_MAX = int(os.environ.get("BATCH_MAX", 10000))           # requests per job
+BATCH_POLL = float(os.environ.get("BATCH_POLL", 30))          # seconds between status checks
+BATCH_TIMEOUT = float(os.environ.get("BATCH_TIMEOUT", 24 * 3600))
+BATCH_DISCOUNT = 0.5   # batch price relative to the regular one, for all three providers
+
+def _auth(request) -> dict:
+    # the request's body goes out inside a batch job, so its content type doesn't apply either
+    return {k: v for k, v in request.headers.items() if k.lower() not in INTERNAL_HEADERS | {"content-type"}}
+
+
+class OpenAIBatches:
+    """ https://platform.openai.com/docs/guides/batch """
+
+    def __init__(self, url: str):
+        self.base = url.rsplit("/chat/completions", 1)[0]
+        self.endpoint = "/v1/chat/completions"
+
+    async def submit(self, http: httpx.AsyncClient, headers: dict, items: list) -> str:
+        lines = "".join(
+            json.dumps({"custom_id": id, "method": "POST", "url": self.endpoint, "body": body}) + "\n" for id, body in items
+        )
+        upload = await http.post(f"{self.base}/files", headers=headers, data={"purpose": "batch"},
+                                 files={"file": ("batch.jsonl", lines.encode("utf-8"), "application/jsonl")})
+        upload.raise_for_status()
+        job = await http.post(f"{self.base}/batches", headers=headers, json={
+            "input_file_id": upload.json()["id"], "endpoint": self.endpoint, "completion_window": "24h"})
+        job.raise_for_status()
+        return job.json()["id"]
+
+    async def poll(self, http: httpx.AsyncClient, headers: dict, job: str):
+        """ None while running, else {custom_id: (reply text, input tokens, output tokens) or the exception} """
+        status = await http.get(f"{self.base}/batches/{job}", headers=headers)
+        status.raise_for_status()
+        status = status.json()
+        if status["status"] in ("validating", "in_progress", "finalizing"):
+            return None
+        if status["status"] != "completed":
+            raise RuntimeError(f"batch {job} {status['status']}: {status.get('errors')}")
+        results = {}
+        for key in ("output_file_id", "error_file_id"):
+            if status.get(key):
+                content = await http.get(f"{self.base}/files/{status[key]}/content", headers=headers)
+                content.raise_for_status()
+                for line in content.text.splitlines():
+                    if line.strip():
+                        results.update(self.result(json.loads(line)))
+        return results
+
+    @staticmethod
+    def result(line: dict) -> dict:
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            return {line["custom_id"]: RuntimeError(str(line.get("error") or response.get("body")))}
+        return {line["custom_id"]: reply("/chat/completions", response["body"])}
+
+
+class AnthropicBatches:
+    """ https://docs.anthropic.com/en/docs/build-with-claude/batch-processing """
+
+    def __init__(self, url: str):
+        self.base = f"{url}/batches"
+
+    async def submit(self, http: httpx.AsyncClient, headers: dict, items: list) -> str:
+        job = await http.post(self.base, headers=headers, json={
+            "requests": [{"custom_id": id, "params": body} for id, body in items]})
+        job.raise_for_status()
+        return job.json()["id"]
+
+    async def poll(self, http: httpx.AsyncClient, headers: dict, job: str):
+        status = await http.get(f"{self.base}/{job}", headers=headers)
+        status.raise_for_status()
+        status = status.json()
+        if status["processing_status"] != "ended":
+            return None
+        content = await http.get(status["results_url"], headers=headers)
+        content.raise_for_status()
+        results = {}
+        for line in content.text.splitlines():
+            if not line.strip():
+                continue
+            line = json.loads(line)
+            result = line["result"]
+            if result["type"] != "succeeded":
+                results[line["custom_id"]] = RuntimeError(f"{result['type']}: {result.get('error')}")
+                continue
+            results[line["custom_id"]] = reply("/messages", result["message"])
+        return results
+
+
+class GeminiBatches:
+    """ https://ai.google.dev/gemini-api/docs/batch-mode (inline requests) """
+
+    def __init__(self, url: str):
+        self.submit_url = url.replace(":generateContent", ":batchGenerateContent")
+        self.base = url.split("/models/", 1)[0]
+
+    async def submit(self, http: httpx.AsyncClient, headers: dict, items: list) -> str:
+        job = await http.post(self.submit_url, headers=headers, json={"batch": {
+            "display_name": f"translation-{uuid.uuid4().hex[:8]}",
+            "input_config": {"requests": {"requests": [{"request": body, "metadata": {"key": id}} for id, body in items]}},
+        }})
+        job.raise_for_status()
+        return job.json()["name"]
+
+    async def poll(self, http: httpx.AsyncClient, headers: dict, job: str):
+        status = await http.get(f"{self.base}/{job}", headers=headers)
+        status.raise_for_status()
+        status = status.json()
+        if not status.get("done"):
+            return None
+        if "error" in status:
+            raise RuntimeError(f"batch {job} failed: {status['error']}")
+        results = {}
+        for item in status["response"]["inlinedResponses"]["inlinedResponses"]:
+            id = item["metadata"]["key"]
+            if "error" in item:
+                results[id] = RuntimeError(str(item["error"]))
+                continue
+            results[id] = reply(":generateContent", item["response"])
+        return results
+
+
+def batches_for(url: str):
+    """ The batch API that goes with a request URL, or None. """
+    if ":generateContent" in url:
+        return GeminiBatches(url)
+    if url.endswith("/messages"):
+        return AnthropicBatches(url)
+    if url.endswith("/chat/completions"):
+        return OpenAIBatches(url)
+    return None
+
+
+class BatchApiClient:
+    """ Stand-in for BamlAsyncClient that sends calls as provider batch jobs.
+
+    `registry` is the ClientRegistry for calls that don't bring their own
+    (`b.request` doesn't see `with_options`). Results are the same as a direct
+    call's, so phase cache keys are too.
+    """
+
+    def __init__(self, client, registry=None, window: float = None, poll: float = None):
+        self._client = client
+        self.registry = registry
+        self.window = BATCH_WINDOW if window is None else window
+        self.poll = BATCH_POLL if poll is None else poll
+        self.queue = {}      # (url, model, headers) -> [(custom id, body, future)]
+        self.timers = {}
+        self.jobs = []       # one summary per job, for the end of the run
+
+    def client_config(self, function: str):
+        return None
+
+    def __getattr__(self, function: str):
+        async def call(baml_options=None, **kwargs):
+            options = {**(baml_options or {})}
+            if self.registry is not None and options.get("client_registry") is None:
+                options["client_registry"] = self.registry
+            request = await getattr(self._client.request, function)(**kwargs, baml_options=options)
+            text = await self.enqueue(request, target_client(options))
+            return getattr(self._client.parse, function)(text, baml_options=options)
+
+        return call
+
+    async def enqueue(self, request, client_name: str) -> str:
+        body = request.body.json()
+        key = (request.url, body.get("model", ""), json.dumps(_auth(request), sort_keys=True), client_name)
+        future = asyncio.get_running_loop().create_future()
+        self.queue.setdefault(key, []).append((request.id, body, future))
+        if len(self.queue[key]) >= BATCH_MAX:
+            self.flush(key)
+        elif key not in self.timers:
+            self.timers[key] = asyncio.get_running_loop().call_later(self.window, self.flush, key)
+        return await future
+
+    def flush(self, key):
+        timer = self.timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = self.queue.pop(key, [])
+        if items:
+            asyncio.ensure_future(self.run_job(key, items))
+
+    async def run_job(self, key, items: list):
+        url, model, headers, client_name = key
+        headers = json.loads(headers)
+        futures = {id: future for id, _, future in items}
+        batches = batches_for(url)
+        start = time.perf_counter()
+        try:
+            if batches is None:
+                raise RuntimeError(f"no batch API known for {url}")
+            async with httpx.AsyncClient(timeout=120) as http:
+                job = await batches.submit(http, headers, [(id, body) for id, body, _ in items])
+                LOGGER.info("batch %s: %d %s requests submitted", job, len(items), model)
+                results = None
+                while results is None:
+                    if time.perf_counter() - start > BATCH_TIMEOUT:
+                        raise TimeoutError(f"batch {job} still running after {BATCH_TIMEOUT:.0f}s")
+                    await asyncio.sleep(self.poll)
+                    results = await batches.poll(http, headers, job)
+        except Exception as e:
+            LOGGER.error("batch of %d %s requests failed: %s", len(items), model, e)
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        tokens_in = tokens_out = 0
+        for id, future in futures.items():
+            result = results.get(id, RuntimeError(f"batch {job} returned nothing for {id}"))
+            if isinstance(result, Exception):
+                future.set_exception(result)
+                continue
+            text, used_in, used_out = result
+            tokens_in += used_in or 0
+            tokens_out += used_out or 0
+            future.set_result(text)
+        self.jobs.append({
+            "job": job, "client": client_name, "model": model, "requests": len(items),
+            "failed": sum(isinstance(results.get(id), Exception) or id not in results for id in futures),
+            "seconds": round(time.perf_counter() - start, 1), "input_tokens": tokens_in, "output_tokens": tokens_out,
+            "cost_usd": round(estimate_cost(client_name, tokens_in, tokens_out) * BATCH_DISCOUNT, 6),
+        })
+
+
+def make_batch_client(client, registry=None, preset=None, overrides=None, **options):
+    """ BatchApiClient under the PHASE_PRESET assignments, like routing.make_client.
+
+    There's no rate limiting or latency routing: batch jobs have their own
+    quotas, and no latency worth routing on.
+    """
+    batched = BatchApiClient(client, registry, **options)
+    preset = preset if preset is not None else os.environ.get("PHASE_PRESET", "")
+    if not PRESETS.get(preset):
+        return batched, batched
+    return PhaseAssignedClient(batched, PRESETS[preset], overrides=overrides), batched
@@ -0,0 +1,103 @@
+""" Offline throughput/latency benchmark of the six-phase pipeline.
+
+    python benchmark.py --concurrency 1 --concurrency 8 --chars 500 --chars 8000
+
+Starts mock_llm.py's server in-process (or uses --base-url), routes every
+BAML function to it and runs complete workflows at each concurrency and text
+size. Texts are unique per run, so the phase cache never short-circuits a call
+and what's measured is our orchestration on top of the mock's latency.
+"""
+from baml_client.async_client import b
+from baml_client.config import set_log_level
+from chunking import run_chunked_pipeline
+from llm_util import get_context_prompt
+from mock_llm import mock_registry, start_mock_server
+from phase_cache import PhaseCache
+from typing import List
+import asyncio, json, time, typer
+
+SAMPLE = "In the beginning was the Word, and the Word was with God, and the Word was God. "
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))
+    return values[index]
+
+
+def make_text(i: int, chars: int) -> str:
+    # paragraph breaks every few sentences so the chunker has somewhere to cut
+    sentences = [f"{i}.{n} {SAMPLE}" for n in range(chars // len(SAMPLE) + 1)]
+    paragraphs = [" ".join(sentences[n:n + 5]) for n in range(0, len(sentences), 5)]
+    return "\n\n".join(paragraphs)[:chars]
+
+
+async def bench(client, *, runs: int, concurrency: int, chars: int, stream: bool) -> dict:
+    cache = PhaseCache()
+    limit = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        inputs = dict(
+            context=get_context_prompt(target_lang="French", source_lang="English", extra_context=""),
+            source_lang="English",
+            target_lang="French",
+            source_text=make_text(i, chars),
+        )
+        async with limit:
+            start = time.perf_counter()
+            await run_chunked_pipeline(
+                inputs, client=client, cache=cache,
+                on_partial=(lambda name, text: None) if stream else None,
+            )
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(runs)))
+    elapsed = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "chars": chars,
+        "runs": runs,
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p95_s": round(percentile(latencies, 95), 3),
+        "p99_s": round(percentile(latencies, 99), 3),
+        "runs_per_s": round(runs / elapsed, 3),
+    }
+
+
+def main(
+    concurrency: List[int] = typer.Option([1, 4, 16], help="Workflows in flight, repeatable"),
+    chars: List[int] = typer.Option([500, 4000], help="Source text length, repeatable"),
+    runs: int = typer.Option(16, help="Workflows per configuration (at least the concurrency)"),
+    latency: float = typer.Option(0.2, help="Mock seconds to first token"),
+    tokens_per_second: float = typer.Option(500.0),
+    output_tokens: int = typer.Option(200),
+    stream: bool = typer.Option(False, help="Exercise the streaming path"),
+    base_url: str = typer.Option("", help="Use an already running stand-in instead of starting one"),
+    json_out: str = typer.Option("", help="Also write the results to this JSON file"),
+):
+    # BAML logs every prompt and reply by default, which swamps the timings
+    set_log_level("WARN")
+    if not base_url:
+        _, base_url = start_mock_server(latency=latency, tokens_per_second=tokens_per_second, output_tokens=output_tokens)
+    client = b.with_options(client_registry=mock_registry(base_url))
+
+    results = []
+    typer.echo(f"{'conc':>5} {'chars':>6} {'runs':>5} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'runs/s':>7}")
+    for size in chars:
+        for conc in concurrency:
+            row = asyncio.run(bench(client, runs=max(runs, conc), concurrency=conc, chars=size, stream=stream))
+            results.append(row)
+            typer.echo(f"{row['concurrency']:>5} {row['chars']:>6} {row['runs']:>5} {row['p50_s']:>7} "
+                       f"{row['p95_s']:>7} {row['p99_s']:>7} {row['runs_per_s']:>7}")
+
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    typer.run(main)
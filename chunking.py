@@ -0,0 +1,170 @@
+from pipeline import run_pipeline, PHASES
+from spans import run_span, span
+import asyncio, re
+
+# Largest chunk sent through the per-chunk phases. The literal translation
+# comes back several times longer than its input (alternatives, notes), so
+# this keeps it well inside max_output_tokens in baml_src/clients.baml.
+CHUNK_CHARS = 3000
+
+# Boundaries tried in order: paragraphs, then lines (verses, lyrics), then sentences.
+BOUNDARIES = [
+    re.compile(r"(\n\s*\n)"),
+    re.compile(r"(\n)"),
+    re.compile(r"(?<=[.!?;。！？])(\s+)"),
+]
+
+
+def _split(text: str, boundaries: list, max_chars: int) -> list:
+    pieces = boundaries[0].split(text)
+    segments = []
+    # re.split with a group alternates text, separator, text, ...
+    for i in range(0, len(pieces), 2):
+        piece = pieces[i] + (pieces[i + 1] if i + 1 < len(pieces) else "")
+        if not piece:
+            continue
+        if len(piece) > max_chars and len(boundaries) > 1:
+            segments.extend(_split(piece, boundaries[1:], max_chars))
+        else:
+            segments.append(piece)
+    return segments
+
+
+def split_segments(text: str, max_chars: int = CHUNK_CHARS) -> list:
+    """ Split text into paragraphs, breaking paragraphs longer than `max_chars`
+    on lines and then sentences. Each segment keeps its trailing whitespace,
+    so "".join(split_segments(text)) == text.
+    """
+    return _split(text, BOUNDARIES, max_chars)
+
+
+def pack_segments(segments: list, max_chars: int = CHUNK_CHARS) -> list:
+    """ Join consecutive segments into chunks of at most `max_chars`. """
+    chunks = []
+    current = ""
+    for segment in segments:
+        if current and len(current) + len(segment) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += segment
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_text(text: str, max_chars: int = CHUNK_CHARS) -> list:
+    return pack_segments(split_segments(text, max_chars), max_chars)
+
+
+def join_parts(parts: list):
+    """ Stitch the chunk outputs of one phase back together, text or BAML class. """
+    parts = [part for part in parts if part]
+    if parts and not isinstance(parts[0], str):
+        return merge_models(parts)
+    return "\n\n".join(part.strip() for part in parts)
+
+
+def merge_models(parts: list):
+    """ One BAML class instance from several: lists concatenated, text joined, numbers maxed.
+
+    While streaming, some chunks are finished and others partial; the result
+    is then of the partial type.
+    """
+    cls = next((type(part) for part in parts if type(part).__module__.endswith("partial_types")), type(parts[0]))
+    fields = {}
+    for name in cls.model_fields:
+        values = [getattr(part, name) for part in parts if getattr(part, name) is not None]
+        if not values:
+            continue
+        if isinstance(values[0], list):
+            fields[name] = [item.model_dump() if hasattr(item, "model_dump") else item for value in values for item in value]
+        elif isinstance(values[0], str):
+            fields[name] = join_parts(values)
+        elif isinstance(values[0], (int, float)):
+            fields[name] = max(values)
+        else:
+            fields[name] = merge_models(values).model_dump()
+    return cls(**fields)
+
+
+async def run_chunks(inputs: dict, chunks: list, *, analysis, client, cache, refresh=(),
+                     previous=None, only=None, metrics=None, memory=None, on_result=None, on_partial=None, compact=None) -> list:
+    """ Run the per-chunk phases for every chunk at once, sharing one analysis.
+
+    `previous[i]`, when given, holds earlier results for chunk i and is passed
+    to run_pipeline as-is. Callbacks get the merged result of all chunks, and
+    `on_result` fires for a phase once every chunk has it.
+    """
+    previous = previous or [None] * len(chunks)
+    parts = {phase.name: [""] * len(chunks) for phase in PHASES}
+    finished = {phase.name: 0 for phase in PHASES}
+
+    def chunk_callbacks(i: int):
+        def partial(name: str, value):
+            if name == "analysis":
+                return
+            parts[name][i] = value
+            if on_partial is not None:
+                on_partial(name, join_parts(parts[name]))
+
+        def result(name: str, value):
+            if name == "analysis":
+                return
+            parts[name][i] = value
+            finished[name] += 1
+            if on_result is not None and finished[name] == len(chunks):
+                on_result(name, join_parts(parts[name]))
+
+        return partial, result
+
+    async def run_chunk(i: int, chunk: str):
+        partial, result = chunk_callbacks(i)
+        with span("chunk", index=i, chars=len(chunk)):
+            return await run_pipeline(
+                {**inputs, "source_text": chunk},
+                client=client, cache=cache,
+                refresh=set(refresh) - {"analysis"},
+                previous={**(previous[i] or {}), "analysis": analysis},
+                only=only,
+                metrics=metrics,
+                memory=memory,
+                on_result=result,
+                on_partial=partial if on_partial is not None else None,
+                compact=compact,
+            )
+
+    return await asyncio.gather(*(run_chunk(i, chunk) for i, chunk in enumerate(chunks)))
+
+
+async def run_chunked_pipeline(inputs: dict, *, client, cache, max_chars: int = CHUNK_CHARS,
+                               refresh=(), metrics=None, memory=None, on_result=None, on_partial=None, compact=None) -> dict:
+    """ Translate long texts chunk by chunk, all chunks at once.
+
+    Analysis runs once over the whole text and is handed to every chunk as
+    its precomputed analysis; the other phases run per chunk and their
+    outputs are stitched back together in source order.
+    Texts that fit in one chunk go straight to run_pipeline. There's no
+    `previous`: a Redo gets the phases it doesn't touch from the phase cache.
+    """
+    chunks = chunk_text(inputs["source_text"], max_chars)
+    if len(chunks) <= 1:
+        return await run_pipeline(inputs, client=client, cache=cache, refresh=refresh,
+                                  metrics=metrics, memory=memory, on_result=on_result, on_partial=on_partial, compact=compact)
+
+    with run_span(inputs, chunks=len(chunks)):
+        analysis = (await run_pipeline(
+            inputs, client=client, cache=cache, refresh=refresh, metrics=metrics,
+            on_result=on_result, on_partial=on_partial, compact=compact,
+            only=("analysis",),
+        ))["analysis"]
+
+        chunk_results = await run_chunks(
+            inputs, chunks, analysis=analysis, client=client, cache=cache, refresh=refresh,
+            metrics=metrics, memory=memory, on_result=on_result, on_partial=on_partial, compact=compact,
+        )
+
+        results = {"analysis": analysis}
+        for phase in PHASES:
+            if phase.name != "analysis":
+                results[phase.name] = join_parts([r[phase.name] for r in chunk_results])
+    return results
@@ -0,0 +1,68 @@
+""" Trimming upstream results down to what a downstream prompt needs.
+
+The templates in translate.baml already leave out whole fields (Review never
+sees the alternatives); this goes inside them, before the prompt is built:
+
+    clarity   glossary terms that occur in the source text; alternatives
+              without their explanations and backtranslations
+    final     the same glossary; review issues that aren't a matter of taste,
+              without the summary
+
+COMPACT_CONTEXT=0 turns it off. measure_compaction.py reports the input
+tokens this saves per phase and what it does to review results on a corpus.
+"""
+import os, re
+
+COMPACT_CONTEXT = os.environ.get("COMPACT_CONTEXT", "1") != "0"
+MIN_ISSUE_SEVERITY = 2   # issues below this don't reach Final
+
+
+def mentions(text: str, term: str) -> bool:
+    """ Whether `term`, or one of its longer words, occurs in `text`. """
+    text = text.casefold()
+    if term.casefold() in text:
+        return True
+    return any(len(word) > 3 and re.search(rf"\b{re.escape(word)}", text) for word in re.findall(r"\w+", term.casefold()))
+
+
+def glossary_for(analysis, text: str):
+    """ The analysis with only the terms that appear in `text` and no outline. """
+    return analysis.model_copy(update={
+        "outline": [],
+        "terms": [term for term in analysis.terms if mentions(text, term.source_term)],
+    })
+
+
+def without_explanations(literal):
+    lines = [
+        line.model_copy(update={"alternatives": [alt.model_copy(update={"meaning": ""}) for alt in line.alternatives]})
+        for line in literal.lines
+    ]
+    return literal.model_copy(update={"lines": lines})
+
+
+def issues_only(review):
+    return review.model_copy(update={
+        "issues": [issue for issue in review.issues if issue.severity >= MIN_ISSUE_SEVERITY],
+        "summary": "",
+    })
+
+
+# phase -> (prompt kwargs -> compacted prompt kwargs)
+COMPACTORS = {
+    "clarity": lambda kwargs: {
+        **kwargs,
+        "analysis": glossary_for(kwargs["analysis"], kwargs["prompt"]),
+        "literal_translation": without_explanations(kwargs["literal_translation"]),
+    },
+    "final": lambda kwargs: {
+        **kwargs,
+        "analysis": glossary_for(kwargs["analysis"], kwargs["source_text"]),
+        "final_review": issues_only(kwargs["final_review"]),
+    },
+}
+
+
+def compact_args(phase: str, kwargs: dict) -> dict:
+    compactor = COMPACTORS.get(phase)
+    return compactor(kwargs) if compactor else kwargs
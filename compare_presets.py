@@ -0,0 +1,105 @@
+""" Latency and cost of each phase preset (routing.PRESETS) on a fixed corpus.
+
+    python compare_presets.py                          # real providers
+    python compare_presets.py --mock                   # local stand-ins, no quota
+
+Every preset translates the whole corpus with an empty phase cache. With
+--mock, each client in clients.baml is replaced by its own mock server with
+the latency in MOCK_LATENCY, which is enough to check the orchestration and
+the report; real numbers need real providers.
+"""
+from baml_client.async_client import b
+from baml_client.config import set_log_level
+from batch import load_documents
+from chunking import run_chunked_pipeline
+from llm_util import get_context_prompt
+from metrics import RunMetrics
+from mock_llm import start_mock_server
+from phase_cache import PhaseCache
+from pipeline import PHASES
+from routing import PRESETS, make_client, client_registry
+from benchmark import percentile
+from pathlib import Path
+from typing import List
+import asyncio, json, time, typer
+
+# Seconds to first token for each client's stand-in in --mock mode.
+MOCK_LATENCY = {"Gemini": 0.4, "GPT4oMini": 0.3, "Haiku": 0.2, "Sonnet": 0.8}
+
+
+async def run_preset(client, documents: list, concurrency: int) -> dict:
+    cache = PhaseCache()
+    limit = asyncio.Semaphore(concurrency)
+    summaries = []
+
+    async def one(doc: dict):
+        inputs = dict(
+            context=get_context_prompt(target_lang=doc["target_lang"], source_lang=doc["source_lang"], extra_context=""),
+            source_lang=doc["source_lang"],
+            target_lang=doc["target_lang"],
+            source_text=doc["source_text"],
+        )
+        async with limit:
+            metrics = RunMetrics(document=doc["id"])
+            await run_chunked_pipeline(inputs, client=client, cache=cache, metrics=metrics)
+            summaries.append(metrics.summary())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(doc) for doc in documents))
+    elapsed = time.perf_counter() - start
+
+    phase_ms = {}
+    for phase in PHASES:
+        calls = [s["phases"][phase.name] for s in summaries if phase.name in s["phases"]]
+        total_calls = sum(c["calls"] for c in calls)
+        phase_ms[phase.name] = round(sum(c["wall_ms"] for c in calls) / total_calls, 1) if total_calls else None
+    return {
+        "runs": len(summaries),
+        "elapsed_s": round(elapsed, 2),
+        "p50_run_s": round(percentile([s["wall_ms"] / 1000 for s in summaries], 50), 2),
+        "input_tokens": sum(p["input_tokens"] for s in summaries for p in s["phases"].values()),
+        "output_tokens": sum(p["output_tokens"] for s in summaries for p in s["phases"].values()),
+        "cost_usd": round(sum(s["cost_usd"] for s in summaries), 5),
+        "phase_ms": phase_ms,
+    }
+
+
+def main(
+    corpus: Path = typer.Option(Path("corpus/sample.jsonl"), exists=True, help="Directory or JSONL, as for batch.py"),
+    preset: List[str] = typer.Option(list(PRESETS), help="Presets to compare, repeatable"),
+    concurrency: int = typer.Option(4),
+    mock: bool = typer.Option(False, help="Replace every client with a local stand-in"),
+    json_out: str = typer.Option("", help="Also write the results to this JSON file"),
+):
+    set_log_level("WARN")
+    documents = [{"source_lang": "English", "target_lang": "French", **doc} for doc in load_documents(corpus)]
+
+    registry, overrides = None, None
+    if mock:
+        overrides = {}
+        for name, latency in MOCK_LATENCY.items():
+            _, url = start_mock_server(latency=latency, output_tokens=150)
+            overrides[name] = ("openai-generic", {"base_url": url, "model": f"mock-{name}", "api_key": "mock"})
+        # phases a preset leaves alone still need a stand-in behind them
+        registry = client_registry("Gemini", overrides)
+
+    results = {}
+    for name in preset:
+        results[name] = asyncio.run(run_preset(make_client(b, preset=name, overrides=overrides, registry=registry), documents, concurrency))
+
+    header = ["preset", "runs", "elapsed s", "p50 run s", "tokens in", "tokens out", "cost $"] + [p.name for p in PHASES]
+    typer.echo("| " + " | ".join(header) + " |")
+    typer.echo("|" + "---|" * len(header))
+    for name, r in results.items():
+        row = [name, r["runs"], r["elapsed_s"], r["p50_run_s"], r["input_tokens"], r["output_tokens"], r["cost_usd"]]
+        row += [r["phase_ms"][p.name] for p in PHASES]
+        typer.echo("| " + " | ".join(str(v) for v in row) + " |")
+    typer.echo("(phase columns: mean ms per call)")
+
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    typer.run(main)
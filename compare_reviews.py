@@ -0,0 +1,151 @@
+""" GetReview on every client in clients.baml, side by side.
+
+    python compare_reviews.py                          # real providers
+    python compare_reviews.py --mock --variants 1      # local stand-ins, checks the plumbing only
+
+The cases are review_eval.py's: seed translations with known errors put into
+them, plus clean controls, so besides agreeing with each other the models can
+be scored against the truth. Every case is backtranslated once and then
+reviewed by all models at the same time. Latency and tokens come from the
+calls made in this run, timed by BAML from the request on, so waiting for
+our own rate limiter doesn't count; reviews answered from the phase cache
+still count for quality and agreement.
+
+Quality is balanced accuracy: the mean of recall over the corrupted cases
+and specificity over the clean ones. The recommendation is the fastest model
+within QUALITY_TOLERANCE of the best one.
+"""
+from baml_client.async_client import b
+from baml_client.config import set_log_level
+from baml_py import Collector
+from batch import load_documents
+from benchmark import percentile
+from compare_presets import MOCK_LATENCY
+from metrics import PRICES, estimate_cost
+from mock_llm import start_mock_server
+from phase_cache import PhaseCache, make_phase_cache
+from rate_limit import make_rate_limited_client
+from review_eval import seed_cases, backtranslate_case, review_case, score
+from routing import client_registry, make_client, target_client
+from pathlib import Path
+from typing import List
+import asyncio, json, typer
+
+QUALITY_TOLERANCE = 0.05
+
+
+async def compare(documents: list, models: list, *, client, reviewer, registries: dict, cache, variants: int,
+                  concurrency: int) -> dict:
+    """ {model: [scored case with latency and usage]} """
+    limit = asyncio.Semaphore(concurrency)
+    cases = await seed_cases(documents, client=client, cache=cache, variants=variants, concurrency=concurrency)
+    runs = {model: [] for model in models}
+
+    async def review(model: str, case: dict, backtranslation):
+        collector = Collector(name=model)
+        result = await review_case(case, backtranslation, client=reviewer, cache=cache, client_config={"client": model},
+                                   baml_options={"client_registry": registries[model], "collector": collector})
+        log = collector.last
+        runs[model].append({
+            "id": case["id"], "kind": case["kind"], **score(case, result),
+            # BAML's own timing: wall time here would include waiting for our rate limiter
+            "seconds": log.timing.duration_ms / 1000 if log is not None and log.timing.duration_ms is not None else None,
+            "input_tokens": (log.usage.input_tokens or 0) if log is not None else 0,
+            "output_tokens": (log.usage.output_tokens or 0) if log is not None else 0,
+        })
+
+    async def one(case: dict):
+        async with limit:
+            backtranslation = await backtranslate_case(case, client=client, cache=cache)
+            await asyncio.gather(*(review(model, case, backtranslation) for model in models))
+
+    await asyncio.gather(*(one(case) for case in cases))
+    return runs
+
+
+def quality(rows: list) -> dict:
+    corrupted = [r for r in rows if r["kind"] != "clean"]
+    controls = [r for r in rows if r["kind"] == "clean"]
+    recall = sum(r["detected"] for r in corrupted) / len(corrupted) if corrupted else 0.0
+    specificity = 1 - sum(r["detected"] for r in controls) / len(controls) if controls else 1.0
+    return {"recall": round(recall, 3), "false_positives": sum(r["detected"] for r in controls),
+            "quality": round((recall + specificity) / 2, 3)}
+
+
+def agreement(a: list, b: list) -> float:
+    detected = {r["id"]: r["detected"] for r in b}
+    shared = [r for r in a if r["id"] in detected]
+    return round(sum(r["detected"] == detected[r["id"]] for r in shared) / len(shared), 3) if shared else 0.0
+
+
+def main(
+    corpus: Path = typer.Option(Path("corpus/sample.jsonl"), exists=True, help="Seed texts: directory or JSONL, as for batch.py"),
+    model: List[str] = typer.Option(list(PRICES), help="Clients to compare, repeatable"),
+    variants: int = typer.Option(2, help="Cases per error type and seed"),
+    concurrency: int = typer.Option(4, help="Cases in flight; each one reviews with every model at once"),
+    mock: bool = typer.Option(False, help="Replace every client with a local stand-in"),
+    json_out: str = typer.Option("", help="Also write the results to this JSON file"),
+):
+    set_log_level("WARN")
+    documents = [{"source_lang": "English", "target_lang": "French", **doc} for doc in load_documents(corpus)]
+
+    registry, overrides = None, None
+    if mock:
+        overrides = {}
+        for name, latency in MOCK_LATENCY.items():
+            _, url = start_mock_server(latency=latency, output_tokens=150)
+            overrides[name] = ("openai-generic", {"base_url": url, "model": f"mock-{name}", "api_key": "mock"})
+        registry = client_registry("Gemini", overrides)
+
+    registries = {name: client_registry(name, overrides) for name in model}
+    runs = asyncio.run(compare(
+        documents, model, client=make_client(b, overrides=overrides, registry=registry), reviewer=make_rate_limited_client(b, target_client),
+        # mock replies share cache keys with real ones, so they stay out of the shared disk cache
+        registries=registries, cache=PhaseCache() if mock else make_phase_cache(), variants=variants, concurrency=concurrency,
+    ))
+
+    results = {}
+    for name, rows in runs.items():
+        seconds = [r["seconds"] for r in rows if r["seconds"] is not None]
+        tokens_in = sum(r["input_tokens"] for r in rows)
+        tokens_out = sum(r["output_tokens"] for r in rows)
+        results[name] = {
+            "reviews": len(rows),
+            "calls": len(seconds),
+            "p50_s": round(percentile(seconds, 50), 2) if seconds else None,
+            "p95_s": round(percentile(seconds, 95), 2) if seconds else None,
+            "input_tokens": tokens_in,
+            "output_tokens": tokens_out,
+            "cost_usd": round(estimate_cost(name, tokens_in, tokens_out), 5),
+            **quality(rows),
+        }
+    best = max(results, key=lambda name: results[name]["quality"])
+    for name in results:
+        results[name]["agreement_with_best"] = agreement(runs[name], runs[best])
+    good_enough = [name for name in results if results[name]["quality"] >= results[best]["quality"] - QUALITY_TOLERANCE]
+    pick = min(good_enough, key=lambda name: results[name]["p50_s"] if results[name]["p50_s"] is not None else float("inf"))
+
+    header = ["model", "reviews", "calls", "p50 s", "p95 s", "tokens in", "tokens out", "cost $", "recall", "false positives",
+              "quality", f"agrees with {best}"]
+    typer.echo("| " + " | ".join(header) + " |")
+    typer.echo("|" + "---|" * len(header))
+    for name, r in results.items():
+        row = [name, r["reviews"], r["calls"], r["p50_s"], r["p95_s"], r["input_tokens"], r["output_tokens"], r["cost_usd"],
+               r["recall"], r["false_positives"], r["quality"], r["agreement_with_best"]]
+        typer.echo("| " + " | ".join(str(v) for v in row) + " |")
+
+    typer.echo("\nAgreement on whether a case has a problem:\n")
+    typer.echo("| | " + " | ".join(model) + " |")
+    typer.echo("|" + "---|" * (len(model) + 1))
+    matrix = {a: {b_: agreement(runs[a], runs[b_]) for b_ in model} for a in model}
+    for a in model:
+        typer.echo(f"| {a} | " + " | ".join(str(matrix[a][b_]) for b_ in model) + " |")
+    typer.echo(f"\nFastest model within {QUALITY_TOLERANCE} of the best quality ({best}): {pick}")
+
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump({"models": results, "agreement": matrix, "best": best, "pick": pick, "cases": runs}, f, indent=2)
+
+
+if __name__ == "__main__":
+    typer.run(main)
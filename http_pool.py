@@ -0,0 +1,281 @@
+""" Sending phase calls over shared keep-alive connection pools.
+
+    HTTP_POOL=1 python batch.py corpus/ results.jsonl --concurrency 64
+
+By default the BAML runtime makes every call with its own connection
+handling. With HTTP_POOL=1, routing.make_client puts a PooledClient
+underneath instead: the request is built with `b.request` (or
+`b.stream_request`), sent over one httpx pool per provider origin and event
+loop, and the reply parsed with `b.parse` (or `b.parse_stream`). Connections
+stay open between calls, so a fan-out of small requests pays for TCP and TLS
+setup at most POOL_SIZE times per provider. HTTP/2 multiplexes the calls
+over even fewer connections when the `h2` package is installed
+(`pip install httpx[http2]`).
+
+These calls skip BAML's retry policies, so connection errors, 429 and 5xx
+replies are retried here (POOL_RETRIES). Collectors don't see them either;
+their token usage goes to metrics.record_outside_call.
+
+Pool metrics are served with the others: open connections, connections
+opened, requests, reuse ratio and time spent waiting for a free connection,
+per origin.
+"""
+from metrics import METRICS, record_outside_call
+from urllib.parse import urlsplit
+import asyncio, httpx, json, os, threading, time, weakref
+
+HTTP_POOL = os.environ.get("HTTP_POOL", "0") == "1"
+POOL_SIZE = int(os.environ.get("POOL_SIZE", 32))               # connections per origin and event loop
+POOL_KEEPALIVE = float(os.environ.get("POOL_KEEPALIVE", 90))   # seconds an idle connection stays open
+POOL_RETRIES = int(os.environ.get("POOL_RETRIES", 2))
+RETRY_DELAY = 0.3
+
+try:
+    import h2  # noqa: F401  (httpx only needs it to be importable)
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+# headers BAML adds for its own bookkeeping, not meant for the provider
+INTERNAL_HEADERS = {"baml-original-url", "content-length"}
+
+
+def reply(url: str, body: dict) -> tuple:
+    """ (text, input tokens, output tokens) from a provider's JSON reply to a request sent to `url`. """
+    if "generateContent" in url:
+        usage = body.get("usageMetadata", {})
+        parts = body["candidates"][0].get("content", {}).get("parts", []) if body.get("candidates") else []
+        return "".join(part.get("text", "") for part in parts), usage.get("promptTokenCount", 0), usage.get("candidatesTokenCount", 0)
+    if url.endswith("/messages"):
+        usage = body.get("usage", {})
+        text = "".join(block.get("text", "") for block in body.get("content", []))
+        return text, usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    usage = body.get("usage") or {}
+    text = (body["choices"][0]["message"]["content"] or "") if body.get("choices") else ""
+    return text, usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+def stream_event(url: str, event: dict) -> tuple:
+    """ (new text, input tokens, output tokens) from one server-sent event; 0 tokens where it doesn't say. """
+    if "generateContent" in url:
+        return reply(url, event)
+    if url.endswith("/messages"):
+        if event.get("type") == "content_block_delta":
+            return event["delta"].get("text", ""), 0, 0
+        if event.get("type") == "message_start":
+            return "", event["message"]["usage"].get("input_tokens", 0), 0
+        if event.get("type") == "message_delta":
+            return "", 0, event.get("usage", {}).get("output_tokens", 0)
+        return "", 0, 0
+    usage = event.get("usage") or {}
+    text = (event["choices"][0].get("delta", {}).get("content") or "") if event.get("choices") else ""
+    return text, usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+class PoolStats:
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.wait_seconds = 0.0
+
+
+class _Trace:
+    """ httpx trace callback: whether a request opened a connection, and how long it waited for one. """
+
+    def __init__(self, stats: PoolStats, lock: threading.Lock):
+        self.stats = stats
+        self.lock = lock
+        self.start = time.perf_counter()
+        self.setup_started = None
+        self.setup = 0.0
+
+    async def __call__(self, event: str, info: dict):
+        now = time.perf_counter()
+        if event == "connection.connect_tcp.started":
+            self.setup_started = now
+        elif event in ("connection.connect_tcp.complete", "connection.start_tls.complete") and self.setup_started:
+            self.setup = now - self.setup_started
+        elif event.endswith("send_request_headers.started"):
+            with self.lock:
+                self.stats.requests += 1
+                self.stats.connections += self.setup_started is not None
+                self.stats.wait_seconds += max(0.0, now - self.start - self.setup)
+
+
+class ConnectionPools:
+    """ One httpx client per (event loop, origin), and statistics per origin. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients = weakref.WeakKeyDictionary()   # event loop -> {origin: httpx.AsyncClient}
+        self.stats = {}
+        METRICS.add_gauge("translation_http_pool_open_connections", "gauge", "origin", self.open_connections)
+        METRICS.add_gauge("translation_http_pool_connections_total", "counter", "origin",
+                          lambda: {origin: s.connections for origin, s in self.stats.items()})
+        METRICS.add_gauge("translation_http_pool_requests_total", "counter", "origin",
+                          lambda: {origin: s.requests for origin, s in self.stats.items()})
+        METRICS.add_gauge("translation_http_pool_reuse_ratio", "gauge", "origin", self.reuse_ratios)
+        METRICS.add_gauge("translation_http_pool_wait_seconds_total", "counter", "origin",
+                          lambda: {origin: s.wait_seconds for origin, s in self.stats.items()})
+
+    def client_for(self, url: str):
+        """ (httpx client, trace callback) for a request to `url` from the running event loop. """
+        origin = "{0.scheme}://{0.netloc}".format(urlsplit(url))
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # asyncio.run() (as in the Streamlit app) closes its loop and leaves the pools on it unusable
+            for closed in [other for other in self._clients if other.is_closed()]:
+                del self._clients[closed]
+            clients = self._clients.setdefault(loop, {})
+            if origin not in clients:
+                clients[origin] = httpx.AsyncClient(http2=HTTP2, timeout=httpx.Timeout(600, connect=10), limits=httpx.Limits(
+                    max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE, keepalive_expiry=POOL_KEEPALIVE))
+            stats = self.stats.setdefault(origin, PoolStats())
+        return clients[origin], _Trace(stats, self._lock)
+
+    def open_connections(self) -> dict:
+        counts = {origin: 0 for origin in self.stats}
+        with self._lock:
+            for loop, clients in list(self._clients.items()):
+                if loop.is_closed():
+                    continue
+                for origin, client in clients.items():
+                    # httpcore's pool behind httpx's transport; its connection list is public
+                    pool = getattr(client._transport, "_pool", None)
+                    counts[origin] += sum(not c.is_closed() for c in getattr(pool, "connections", []))
+        return counts
+
+    def reuse_ratios(self) -> dict:
+        return {origin: 1 - s.connections / s.requests for origin, s in self.stats.items() if s.requests}
+
+
+_POOLS = None
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pools() -> ConnectionPools:
+    """ The process-wide pools, created on first use. """
+    global _POOLS
+    with _POOLS_LOCK:
+        if _POOLS is None:
+            _POOLS = ConnectionPools()
+        return _POOLS
+
+
+async def send(request, stream: bool = False) -> httpx.Response:
+    """ Send a baml_py.HTTPRequest over the pool, retrying what's worth retrying. """
+    headers = {k: v for k, v in request.headers.items() if k.lower() not in INTERNAL_HEADERS}
+    content = bytes(request.body.raw())
+    for attempt in range(POOL_RETRIES + 1):
+        client, trace = get_pools().client_for(request.url)
+        last = attempt == POOL_RETRIES
+        try:
+            response = await client.send(client.build_request(
+                request.method, request.url, headers=headers, content=content, extensions={"trace": trace}), stream=stream)
+        except httpx.TransportError:
+            if last:
+                raise
+        else:
+            if response.status_code < 400:
+                return response
+            if last or not (response.status_code == 429 or response.status_code >= 500):
+                await response.aread()
+                await response.aclose()
+                response.raise_for_status()
+            await response.aclose()
+        await asyncio.sleep(RETRY_DELAY * 1.5 ** attempt)
+
+
+class PooledClient:
+    """ Stand-in for BamlAsyncClient that sends calls over the shared pools.
+
+    `client_of(baml_options)` names the clients.baml client a call will use,
+    for its cost. `registry` is the ClientRegistry for calls that don't bring
+    their own (`b.request` doesn't see `with_options`).
+    """
+
+    def __init__(self, client, client_of, registry=None):
+        self._client = client
+        self.client_of = client_of
+        self.registry = registry
+        self.stream = _PooledStreams(self)
+
+    def client_config(self, function: str):
+        return None
+
+    def _options(self, baml_options) -> dict:
+        options = {k: v for k, v in (baml_options or {}).items() if v is not None}
+        if self.registry is not None and options.get("client_registry") is None:
+            options["client_registry"] = self.registry
+        return options
+
+    def __getattr__(self, function: str):
+        async def call(baml_options=None, **kwargs):
+            options = self._options(baml_options)
+            request = await getattr(self._client.request, function)(**kwargs, baml_options=options)
+            response = await send(request)
+            text, tokens_in, tokens_out = reply(request.url, response.json())
+            record_outside_call(options.get("collector"), self.client_of(options), tokens_in, tokens_out)
+            return getattr(self._client.parse, function)(text, baml_options=options)
+
+        return call
+
+
+class _PooledStreams:
+    def __init__(self, pooled: PooledClient):
+        self._pooled = pooled
+
+    def __getattr__(self, function: str):
+        def stream(baml_options=None, **kwargs):
+            return _PooledStream(self._pooled, function, kwargs, self._pooled._options(baml_options))
+
+        return stream
+
+
+class _PooledStream:
+    """ Like BAML's stream: iterate for partial results, then get_final_response. """
+
+    def __init__(self, pooled: PooledClient, function: str, kwargs: dict, options: dict):
+        self._pooled = pooled
+        self._function = function
+        self._kwargs = kwargs
+        self._options = options
+        self._text = None
+
+    async def __aiter__(self):
+        client = self._pooled._client
+        request = await getattr(client.stream_request, self._function)(**self._kwargs, baml_options=self._options)
+        start = time.perf_counter()
+        ttft = None
+        text, tokens_in, tokens_out = "", 0, 0
+        response = await send(request, stream=True)
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:") or line[5:].strip() == "[DONE]":
+                    continue
+                delta, used_in, used_out = stream_event(request.url, json.loads(line[5:]))
+                tokens_in, tokens_out = used_in or tokens_in, used_out or tokens_out
+                if not delta:
+                    continue
+                ttft = ttft or (time.perf_counter() - start) * 1000
+                text += delta
+                try:
+                    partial = getattr(client.parse_stream, self._function)(text, baml_options=self._options)
+                except Exception:
+                    continue
+                yield partial
+        finally:
+            await response.aclose()
+        self._text = text
+        record_outside_call(self._options.get("collector"), self._pooled.client_of(self._options), tokens_in, tokens_out, ttft)
+
+    async def get_final_response(self):
+        if self._text is None:
+            async for _ in self:
+                pass
+        return getattr(self._pooled._client.parse, self._function)(self._text, baml_options=self._options)
+
+
+def make_pooled_client(client, client_of, registry=None):
+    """ Wrap `client` in a PooledClient if HTTP_POOL=1. """
+    return PooledClient(client, client_of, registry) if HTTP_POOL else client
@@ -0,0 +1,213 @@
+from chunking import CHUNK_CHARS, split_segments, pack_segments, chunk_text, join_parts, run_chunks
+from pipeline import run_pipeline, dependents
+from spans import run_span
+from bisect import bisect_right
+from difflib import SequenceMatcher
+
+# Size of the groups of segments that are re-translated independently once
+# an edit has been diffed. Smaller groups make edits cheaper but give each
+# call less surrounding text; a first run sends the text whole.
+SEGMENT_CHARS = 800
+
+# Phases run per segment group; Review and Final always see the merged text.
+SEGMENT_PHASES = ("literal", "clarity", "backtranslation")
+
+# Beyond this share of edited characters the old analysis is no longer trusted.
+REANALYZE_RATIO = 0.3
+
+SETTINGS = ("context", "source_lang", "target_lang")
+
+
+def align_chunks(old_chunks: list, new_text: str, max_chars: int = SEGMENT_CHARS):
+    """ Lay out `new_text` in chunks, keeping every old chunk that survived the edit.
+
+    Old and new texts are diffed segment by segment; an old chunk whose
+    segments all reappear, in order and next to each other, is kept verbatim.
+    The edited stretches in between are packed into fresh chunks.
+    Returns (chunk_text, old_index or None) pairs covering the new text in
+    order, and how many characters of the new text sit in edited segments.
+    """
+    new_segments = split_segments(new_text, max_chars)
+    # split the old text as a whole (a chunk on its own may split differently)
+    # and give each segment to the chunk it starts in
+    old_segments = split_segments("".join(old_chunks), max_chars)
+    chunk_starts, offset = [], 0
+    for chunk in old_chunks:
+        chunk_starts.append(offset)
+        offset += len(chunk)
+    owner, offset = [], 0
+    for segment in old_segments:
+        owner.append(bisect_right(chunk_starts, offset) - 1)
+        offset += len(segment)
+
+    moved = {}
+    changed = 0
+    matcher = SequenceMatcher(None, old_segments, new_segments, autojunk=False)
+    for tag, i1, i2, k1, k2 in matcher.get_opcodes():
+        if tag == "equal":
+            for offset in range(i2 - i1):
+                moved[i1 + offset] = k1 + offset
+        else:
+            changed += sum(len(segment) for segment in new_segments[k1:k2])
+
+    starts = {}
+    for j, chunk in enumerate(old_chunks):
+        members = [n for n in range(len(old_segments)) if owner[n] == j]
+        landed = [moved.get(n) for n in members]
+        if (
+            landed and None not in landed
+            and landed == list(range(landed[0], landed[0] + len(landed)))
+            and "".join(old_segments[n] for n in members) == chunk
+        ):
+            starts[landed[0]] = (j, len(landed))
+
+    layout, gap = [], []
+
+    def flush():
+        layout.extend((chunk, None) for chunk in pack_segments(gap, max_chars))
+        gap.clear()
+
+    k = 0
+    while k < len(new_segments):
+        if k in starts:
+            flush()
+            j, n = starts[k]
+            layout.append((old_chunks[j], j))
+            k += n
+        else:
+            gap.append(new_segments[k])
+            k += 1
+    flush()
+    return layout, changed
+
+
+def split_results(chunk: str, result: dict, max_chars: int = SEGMENT_CHARS):
+    """ Per-group results of a chunk translated whole, or None if its lines can't be placed.
+
+    The groups are what align_chunks makes of the chunk. Literal lines are
+    placed by their source text; Clarity and Backtranslation follow them line
+    for line, so they need as many lines. Returns (group, results) pairs.
+    """
+    groups = chunk_text(chunk, max_chars)
+    literal = result["literal"].lines
+    if len(groups) < 2 or any(len(result[name].lines) != len(literal) for name in SEGMENT_PHASES[1:]):
+        return None
+    ends, offset = [], 0
+    for group in groups:
+        offset += len(group)
+        ends.append(offset)
+    owner, position, k = [], 0, 0
+    for line in literal:
+        source = line.source.strip()
+        if source:
+            start = chunk.find(source, position)
+            if start < 0:
+                return None
+            while start >= ends[k]:
+                k += 1
+            position = start + len(source)
+            if position > ends[k]:
+                return None  # one line across two groups
+        owner.append(k)
+    if set(owner) != set(range(len(groups))):
+        return None
+    parts = []
+    for k, group in enumerate(groups):
+        part = dict(result)
+        for name in SEGMENT_PHASES:
+            part[name] = type(result[name])(lines=[line for line, o in zip(result[name].lines, owner) if o == k])
+        parts.append((group, part))
+    return parts
+
+
+def coarsen(layout: list, previous: list, max_chars: int = CHUNK_CHARS):
+    """ Consecutive groups merged into chunks of up to `max_chars`; a chunk keeps the
+    earlier results of its groups (merged) if every one of them has some. """
+    chunks, members = [], []
+    for (chunk, _), carried in zip(layout, previous):
+        if chunks and len(chunks[-1]) + len(chunk) <= max_chars:
+            chunks[-1] += chunk
+            members[-1].append(carried)
+        else:
+            chunks.append(chunk)
+            members.append([carried])
+    merged = [
+        {name: join_parts([carried[name] for carried in group]) for name in group[0]} if None not in group else None
+        for group in members
+    ]
+    return chunks, merged
+
+
+async def run_incremental(inputs: dict, last=None, *, client, cache, refresh=(), metrics=None, memory=None,
+                          on_result=None, on_partial=None, max_chars: int = SEGMENT_CHARS, compact=None):
+    """ Translate, reusing everything from `last` that an edit didn't touch.
+
+    `last` is the state returned by the previous call for the same session.
+    Only changed segment groups go back through Literal Translation, Clarity
+    and Backtranslation; the analysis is kept for small edits; Review and
+    Final run over the merged result (cache hits if nothing changed).
+    Groups are sent whole (one call per CHUNK_CHARS) when all of them make a
+    call anyway: a first run, an edit that kept none of them, a Redo of a
+    per-segment phase or a new analysis.
+    Their results are then split back into groups of `max_chars`, so the next
+    edit only re-sends the groups it touched.
+    Returns (results, state).
+    """
+    text = inputs["source_text"]
+    same_setting = (
+        last is not None and "chunks" in last
+        and all(last["inputs"][key] == inputs[key] for key in SETTINGS)
+    )
+    stale = set(refresh)
+    for name in refresh:
+        stale |= dependents(name)
+
+    if same_setting:
+        layout, changed = align_chunks(last["chunks"], text, max_chars)
+    else:
+        layout, changed = [(chunk, None) for chunk in chunk_text(text, CHUNK_CHARS)], len(text)
+
+    with run_span(inputs, changed_chars=changed) as root:
+        if same_setting and "analysis" not in stale and changed <= REANALYZE_RATIO * len(text):
+            analysis = last["results"]["analysis"]
+            if on_result is not None:
+                on_result("analysis", analysis)
+        else:
+            analysis = (await run_pipeline(
+                inputs, client=client, cache=cache, refresh=refresh, metrics=metrics,
+                only=("analysis",), on_result=on_result, on_partial=on_partial, compact=compact,
+            ))["analysis"]
+
+        # what kept groups carry over: nothing translated against a different analysis
+        same_analysis = same_setting and analysis == last["results"]["analysis"]
+        carried = [name for name in SEGMENT_PHASES if same_setting and (same_analysis or name not in dependents("analysis"))]
+        previous = [{name: last["chunk_results"][j][name] for name in carried} if j is not None and carried else None
+                    for _, j in layout]
+        chunks = [chunk for chunk, _ in layout]
+        if not same_analysis or stale.intersection(SEGMENT_PHASES) or all(j is None for _, j in layout):
+            # every group makes a call: fewer, larger ones, still reusing what's upstream of the redone phase
+            chunks, previous = coarsen(layout, previous)
+        if root is not None:
+            root.set(chunks=len(chunks))
+        chunk_results = await run_chunks(
+            inputs, chunks, analysis=analysis, client=client, cache=cache, refresh=refresh, previous=previous,
+            only=(SEGMENT_PHASES[-1],), metrics=metrics, memory=memory, on_result=on_result, on_partial=on_partial, compact=compact,
+        )
+
+        merged = {name: join_parts([r[name] for r in chunk_results]) for name in SEGMENT_PHASES}
+        results = await run_pipeline(
+            inputs, client=client, cache=cache,
+            # only what was pressed: Review and Final rerun anyway when their inputs changed,
+            # and a refreshed Final skips the review gate
+            refresh=set(refresh).intersection({"review", "final"}),
+            previous={"analysis": analysis, **merged},
+            metrics=metrics, on_result=on_result, on_partial=on_partial, compact=compact,
+        )
+
+    groups, group_results = [], []
+    for chunk, result in zip(chunks, chunk_results):
+        for group, group_result in split_results(chunk, result, max_chars) or [(chunk, result)]:
+            groups.append(group)
+            group_results.append(group_result)
+    state = {"inputs": inputs, "chunks": groups, "chunk_results": group_results, "results": results}
+    return results, state
@@ -1,35 +1,67 @@
-from google.genai import types
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-import streamlit as st
-import logging, re
+import atexit, gzip, json, logging, os, queue, re, shutil
 
 model_name = "gemini-2.0-flash"
 
-def create_logger(path="logs/info.log"):
-    """ Create a logger for the project. """
-    logging.basicConfig(
-        filename=Path(path),
-        filemode="a",
-        format='%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s',
-        datefmt="%Y-%m-%d %H:%M:%S",
-        # level=logging.INFO
-    )
-    return logging.getLogger()
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_MAX_BYTES = int(os.environ.get("LOG_MAX_BYTES", 10 * 2**20))   # rotate past this size
+LOG_BACKUPS = int(os.environ.get("LOG_BACKUPS", 5))                 # rotated files kept
+LOG_COMPRESS = os.environ.get("LOG_COMPRESS", "1") != "0"           # gzip rotated files
 
-LOGGER = create_logger()
+class JsonFormatter(logging.Formatter):
+    """ One JSON object per line: time, level, logger, then the event's fields (see log_event) or the message. """
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        fields = getattr(record, "fields", None)
+        if fields is not None:
+            entry.update(fields)
+        else:
+            entry["message"] = record.getMessage()
+        return json.dumps(entry, ensure_ascii=False, default=str)
 
-def removeMarkdownTag(text: str) -> str:
-    """Extract text inside a pair of tags.
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as f, gzip.open(dest, "wb") as out:
+        shutil.copyfileobj(f, out)
+    os.remove(source)
 
-    If there's no such tag, return the whole text.
+def create_logger(name="translation", path="logs/info.log", level=LOG_LEVEL):
+    """ Logger whose records are written by a background thread, so logging never waits on the disk.
+
+    The calling thread only puts the record on a queue; a QueueListener
+    writes it to `path` as a JSON line, rotating at LOG_MAX_BYTES and keeping
+    LOG_BACKUPS older files (gzipped unless LOG_COMPRESS=0).
     """
-    text = text.replace("```markdown\n", "")
-    text = text.replace("\n```", "")
-    return text
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    handler = RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8", delay=True)
+    if LOG_COMPRESS:
+        handler.namer = lambda name: name + ".gz"
+        handler.rotator = _gzip_rotator
+    handler.setFormatter(JsonFormatter())
+    records = queue.SimpleQueue()
+    listener = QueueListener(records, handler)
+    listener.start()
+    # write out whatever is still queued when the process ends
+    atexit.register(listener.stop)
+    logger.addHandler(QueueHandler(records))
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+def log_event(logger, event: str, **fields):
+    """ Log a structured event: `fields` become keys of its JSON line. """
+    logger.info(event, extra={"fields": {"event": event, **fields}})
 
-def removeFinalTag(text: str) -> str:
-    text = text.replace("*   **Final Translation:**", "")
-    return text
+LOGGER = create_logger()
 
 def get_context_prompt(*, target_lang: str, source_lang: str, is_song=False, extra_context) -> str:
     if is_song:
@@ -45,4 +77,64 @@ This step is one part of a multi-step process to translate the text. Do only wha
 
     if extra_context:
         return f"{base}\n\nThe following extra context was provided by the user. Please use it only if it is helpful. <extra_context>\n{extra_context}</extra_context>\n"
-    return base
\ No newline at end of file
+    return base
+
+# Markdown for each phase's BAML class. Streamed partial results have None
+# for fields that haven't arrived yet, so every field is optional here.
+
+def _bullets(title: str, items) -> str:
+    items = [item for item in items or [] if item]
+    return f"**{title}**\n\n" + "\n".join(f"*   {item}" for item in items) if items else ""
+
+def _line(text, extras) -> str:
+    return (text or "") + "".join(f" [{extra}]" for extra in extras or [] if extra)
+
+def format_analysis(analysis) -> str:
+    terms = [f"**{t.source_term}**: {t.target_term or ''} - {t.note or ''}" for t in analysis.terms or [] if t.source_term]
+    sections = [
+        _bullets("Outline", analysis.outline),
+        _bullets("Terms", terms),
+        _bullets("Cultural references", analysis.cultural_references),
+        _bullets("Metaphors and imagery", analysis.imagery),
+        _bullets("Translation challenges", analysis.challenges),
+    ]
+    return "\n\n".join(section for section in sections if section)
+
+def format_literal(literal) -> str:
+    lines = []
+    for line in literal.lines or []:
+        lines.append(f"*   {line.translation or ''}")
+        for alt in line.alternatives or []:
+            if alt.text:
+                lines.append(f"    *   [{alt.text}] {alt.meaning or ''}")
+    return "\n".join(lines)
+
+def format_clarity(clarity) -> str:
+    return "  \n".join(_line(line.translation, line.alternatives) for line in clarity.lines or [])
+
+def format_backtranslation(backtranslation) -> str:
+    return "  \n".join(_line(line.text, line.notes) for line in backtranslation.lines or [])
+
+def format_review(review) -> str:
+    """ Markdown for a Review, including a partial one that is still streaming. """
+    lines = []
+    for issue in review.issues or []:
+        if issue.problem is None:
+            continue
+        line = f"*   **Severity {issue.severity if issue.severity is not None else '?'}** ({issue.location or ''}): {issue.problem}"
+        if issue.suggestion:
+            line += f" *Suggested:* {issue.suggestion}"
+        lines.append(line)
+    if not lines and review.severity is not None:
+        lines.append("*   No issues found.")
+    if review.summary:
+        lines.append("\n" + review.summary)
+    return "\n".join(lines)
+
+def get_memory_prompt(matches) -> str:
+    """ Context block listing earlier translations of similar passages.
+
+    `matches` are (similarity, source, translation) tuples from the translation memory.
+    """
+    pairs = "\n\n".join(f"<source>\n{source}\n</source>\n<translation>\n{target}\n</translation>" for _, source, target in matches)
+    return f"\n\nEarlier approved translations of similar passages follow. Keep wording consistent with them where the text matches. <translation_memory>\n{pairs}\n</translation_memory>\n"
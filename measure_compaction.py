@@ -0,0 +1,127 @@
+""" Input tokens saved by context compaction (compact.py), and what it does to quality.
+
+    python measure_compaction.py                 # real providers
+    python measure_compaction.py --mock          # local stand-in: token counts only
+
+Every document goes through the pipeline twice, without and with compaction,
+sharing one phase cache: Analysis and Literal Translation are made once and
+both variants build on the same results. The review gate is off so Final
+always gets its full prompt.
+
+Reported per phase: the input tokens of each variant and the saving (a
+compacted call answered from the cache had the same prompt as the full one,
+so it counts the same tokens). For quality: the review's issues and top
+severity in each variant, and how close the two final translations are
+(difflib ratio, 1.0 = identical).
+"""
+from baml_client.async_client import b
+from baml_client.config import set_log_level
+from batch import load_documents
+from chunking import run_chunked_pipeline
+from llm_util import get_context_prompt
+from metrics import RunMetrics
+from mock_llm import mock_registry, start_mock_server
+from phase_cache import PhaseCache
+from pipeline import PHASES, dependents
+from routing import make_client
+from difflib import SequenceMatcher
+from pathlib import Path
+import asyncio, json, pipeline, typer
+
+# the phases compaction can change: everything built on Analysis and Literal Translation
+MEASURED = [phase.name for phase in PHASES if phase.name in dependents("analysis") & dependents("literal")]
+
+
+async def run_variant(client, cache, documents: list, compact: bool, concurrency: int) -> dict:
+    """ {document id: (RunMetrics, results)} """
+    limit = asyncio.Semaphore(concurrency)
+    runs = {}
+
+    async def one(doc: dict):
+        inputs = dict(
+            context=get_context_prompt(target_lang=doc["target_lang"], source_lang=doc["source_lang"], extra_context=""),
+            source_lang=doc["source_lang"],
+            target_lang=doc["target_lang"],
+            source_text=doc["source_text"],
+        )
+        async with limit:
+            metrics = RunMetrics(document=doc["id"], compact=compact)
+            results = await run_chunked_pipeline(inputs, client=client, cache=cache, metrics=metrics, compact=compact)
+            runs[doc["id"]] = (metrics, results)
+
+    await asyncio.gather(*(one(doc) for doc in documents))
+    return runs
+
+
+def input_tokens(metrics: RunMetrics, phase: str):
+    """ Input tokens of a phase's calls in one run, or None if they were all cache hits. """
+    records = [r for r in metrics.phases if r["phase"] == phase]
+    if not records or all(r["cache_hit"] for r in records):
+        return None
+    return sum(r["input_tokens"] for r in records)
+
+
+def review_stats(runs: dict) -> dict:
+    reviews = [results["review"] for _, results in runs.values()]
+    return {
+        "issues": round(sum(len(r.issues) for r in reviews) / len(reviews), 2),
+        "max_severity": round(sum(max([r.severity] + [i.severity for i in r.issues]) for r in reviews) / len(reviews), 2),
+    }
+
+
+def main(
+    corpus: Path = typer.Option(Path("corpus/sample.jsonl"), exists=True, help="Directory or JSONL, as for batch.py"),
+    concurrency: int = typer.Option(4),
+    mock: bool = typer.Option(False, help="Use a local stand-in instead of the real clients"),
+    json_out: str = typer.Option("", help="Also write the results to this JSON file"),
+):
+    set_log_level("WARN")
+    pipeline.REVIEW_GATE = "off"
+    documents = [{"source_lang": "English", "target_lang": "French", **doc} for doc in load_documents(corpus)]
+
+    if mock:
+        _, url = start_mock_server(latency=0.1, output_tokens=150)
+        client = b.with_options(client_registry=mock_registry(url))
+    else:
+        client = make_client(b)
+
+    cache = PhaseCache()
+    full = asyncio.run(run_variant(client, cache, documents, False, concurrency))
+    compact = asyncio.run(run_variant(client, cache, documents, True, concurrency))
+
+    phases = {}
+    for name in MEASURED:
+        before = after = 0
+        for id, (metrics, _) in full.items():
+            tokens = input_tokens(metrics, name) or 0
+            compacted = input_tokens(compact[id][0], name)
+            before += tokens
+            after += tokens if compacted is None else compacted
+        phases[name] = {"full": before, "compact": after, "saved": before - after,
+                        "saved_pct": round(100 * (before - after) / before, 1) if before else None}
+    quality = {
+        "full": review_stats(full),
+        "compact": review_stats(compact),
+        "final_similarity": round(sum(
+            SequenceMatcher(None, full[id][1]["final"], compact[id][1]["final"]).ratio() for id in full
+        ) / len(full), 3),
+    }
+
+    typer.echo("| phase | tokens in, full | tokens in, compact | saved | saved % |")
+    typer.echo("|---|---|---|---|---|")
+    for name, p in phases.items():
+        typer.echo(f"| {name} | {p['full']} | {p['compact']} | {p['saved']} | {p['saved_pct']} |")
+    typer.echo("")
+    typer.echo("| variant | review issues (mean) | review max severity (mean) |")
+    typer.echo("|---|---|---|")
+    for variant in ("full", "compact"):
+        typer.echo(f"| {variant} | {quality[variant]['issues']} | {quality[variant]['max_severity']} |")
+    typer.echo(f"\nfinal translation similarity, full vs compact: {quality['final_similarity']}")
+
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump({"phases": phases, "quality": quality}, f, indent=2)
+
+
+if __name__ == "__main__":
+    typer.run(main)
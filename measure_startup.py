@@ -0,0 +1,77 @@
+""" Cold-start time of the Streamlit app.
+
+    python measure_startup.py --runs 5
+    python measure_startup.py --runs 5 --json-out startup.json   # keep a record to compare against
+
+Every run is a fresh interpreter, like a new Streamlit worker, that does the
+app's first page load headless (streamlit.testing's AppTest on app.py). It
+reports the median time to import Streamlit and to finish that first run,
+and the modules that took longest to import (`python -X importtime`,
+cumulative microseconds, median over the runs).
+"""
+from benchmark import percentile
+from collections import defaultdict
+import json, re, subprocess, sys, typer
+
+PROBE = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+app = AppTest.from_file("app.py", default_timeout=120)
+app.run()
+done = time.perf_counter()
+print("STARTUP", imported - start, done - imported, bool(app.exception))
+"""
+IMPORT_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)")
+
+
+def probe() -> dict:
+    run = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE], capture_output=True, text=True)
+    match = re.search(r"STARTUP (\S+) (\S+) (\S+)", run.stdout)
+    if match is None:
+        raise RuntimeError(f"startup probe failed:\n{run.stderr[-2000:]}")
+    modules = {}
+    for line in run.stderr.splitlines():
+        m = IMPORT_LINE.match(line)
+        # only top-level packages: their time includes everything they pull in
+        if m and len(m.group(2)) == 1:
+            modules[m.group(3)] = int(m.group(1))
+    return {"streamlit_s": float(match.group(1)), "first_run_s": float(match.group(2)),
+            "error": match.group(3) == "True", "modules": modules}
+
+
+def main(
+    runs: int = typer.Option(5, help="Fresh interpreters to measure"),
+    top: int = typer.Option(10, help="Slowest imports to list"),
+    json_out: str = typer.Option("", help="Also write the results to this JSON file"),
+):
+    probes = [probe() for _ in range(runs)]
+    if any(p["error"] for p in probes):
+        typer.echo("warning: app.py raised during its first run; times may be short")
+    modules = defaultdict(list)
+    for p in probes:
+        for name, us in p["modules"].items():
+            modules[name].append(us)
+    slowest = sorted(((name, percentile(us, 50)) for name, us in modules.items()), key=lambda item: -item[1])[:top]
+    summary = {
+        "runs": runs,
+        "streamlit_s": round(percentile([p["streamlit_s"] for p in probes], 50), 3),
+        "first_run_s": round(percentile([p["first_run_s"] for p in probes], 50), 3),
+        "slowest_imports_ms": {name: round(us / 1000, 1) for name, us in slowest},
+    }
+
+    typer.echo(f"import streamlit: {summary['streamlit_s']}s, first run of app.py: {summary['first_run_s']}s "
+               f"(medians of {runs})\n")
+    typer.echo("| module | import ms |")
+    typer.echo("|---|---|")
+    for name, ms in summary["slowest_imports_ms"].items():
+        typer.echo(f"| {name} | {ms} |")
+
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,245 @@
+from baml_py import Collector
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from llm_util import create_logger, log_event
+import logging, threading, time, uuid
+
+# USD per million tokens (input, output), keyed by client name in baml_src/clients.baml.
+PRICES = {
+    "Gemini": (0.10, 0.40),
+    "GPT4oMini": (0.15, 0.60),
+    "Sonnet": (3.00, 15.00),
+    "Haiku": (0.25, 1.25),
+}
+
+
+# phase and run events, one JSON object per line, kept apart from the error log
+METRICS_LOGGER = create_logger("metrics", "logs/metrics.jsonl", logging.INFO)
+
+
+def estimate_cost(client: str, input_tokens, output_tokens) -> float:
+    price_in, price_out = PRICES.get(client, (0.0, 0.0))
+    return ((input_tokens or 0) * price_in + (output_tokens or 0) * price_out) / 1e6
+
+
+# id(collector) -> (collector, usage) for calls made outside the BAML runtime
+# (http_pool.py), which collectors never see; the oldest go past MAX_OUTSIDE_CALLS
+OUTSIDE_CALLS = OrderedDict()
+MAX_OUTSIDE_CALLS = 10000
+_OUTSIDE_LOCK = threading.Lock()
+
+
+def record_outside_call(collector, client: str, input_tokens, output_tokens, ttft_ms=None) -> None:
+    """ Usage of a call made without BAML, for whoever reads `collector` next. """
+    if collector is None:
+        return
+    with _OUTSIDE_LOCK:
+        OUTSIDE_CALLS[id(collector)] = (collector, {
+            "client": client, "input_tokens": input_tokens or 0, "output_tokens": output_tokens or 0, "ttft_ms": ttft_ms,
+        })
+        while len(OUTSIDE_CALLS) > MAX_OUTSIDE_CALLS:
+            OUTSIDE_CALLS.popitem(last=False)
+
+
+def outside_call(collector):
+    """ What record_outside_call noted for `collector`, or None. """
+    with _OUTSIDE_LOCK:
+        entry = OUTSIDE_CALLS.get(id(collector))
+    return entry[1] if entry is not None and entry[0] is collector else None
+
+
+# id(collector) -> (collector, epoch ms) of a streamed call's first partial; BAML's
+# timing has no time to first token (time_to_first_parsed_ms stays None on 0.87)
+FIRST_PARTIALS = OrderedDict()
+
+
+def record_first_partial(collector) -> None:
+    """ Note that the call `collector` watches has just streamed its first partial. """
+    if collector is None:
+        return
+    with _OUTSIDE_LOCK:
+        FIRST_PARTIALS[id(collector)] = (collector, time.time() * 1000)
+        while len(FIRST_PARTIALS) > MAX_OUTSIDE_CALLS:
+            FIRST_PARTIALS.popitem(last=False)
+
+
+def first_partial(collector):
+    """ When record_first_partial was called for `collector` (epoch ms), or None. """
+    with _OUTSIDE_LOCK:
+        entry = FIRST_PARTIALS.get(id(collector))
+    return entry[1] if entry is not None and entry[0] is collector else None
+
+
+def phase_record(phase: str, function: str, collector: Collector, wall_ms: float) -> dict:
+    """ Flatten what a phase call's collector saw into one record.
+
+    A call served from the phase cache never reaches BAML, so its collector
+    is empty and the record only carries the wall time. A call sent outside
+    BAML (record_outside_call) has its usage but no retry count.
+    """
+    record = {
+        "phase": phase,
+        "function": function,
+        "wall_ms": round(wall_ms, 1),
+        "cache_hit": True,
+        "client": None,
+        "ttft_ms": None,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "retries": 0,
+        "cost_usd": 0.0,
+        "error": None,
+    }
+    log = collector.last
+    if log is None:
+        outside = outside_call(collector)
+        if outside is not None:
+            record.update(outside, cache_hit=False)
+            record["cost_usd"] = estimate_cost(outside["client"], outside["input_tokens"], outside["output_tokens"])
+        return record
+
+    call = log.selected_call
+    record["cache_hit"] = False
+    record["input_tokens"] = log.usage.input_tokens or 0
+    record["output_tokens"] = log.usage.output_tokens or 0
+    record["retries"] = max(len(log.calls) - 1, 0)
+    if call is not None:
+        record["client"] = call.client_name
+        # from the request that answered, so neither quota waits nor failed attempts count
+        first = first_partial(collector)
+        if first is not None and call.timing.start_time_utc_ms:
+            record["ttft_ms"] = round(first - call.timing.start_time_utc_ms, 1)
+        else:
+            record["ttft_ms"] = call.timing.time_to_first_parsed_ms
+    record["cost_usd"] = estimate_cost(record["client"], record["input_tokens"], record["output_tokens"])
+    return record
+
+
+class MetricsRegistry:
+    """ Process-wide running totals, rendered in the Prometheus text format. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._phases = {}
+        self._runs = {"count": 0, "seconds": 0.0, "cost_usd": 0.0}
+        self._gauges = []
+
+    def add_gauge(self, name: str, kind: str, label: str, read) -> None:
+        """ Series read at scrape time: `read()` returns {label value: number}. """
+        with self._lock:
+            self._gauges.append((name, kind, label, read))
+
+    def add_phase(self, record: dict) -> None:
+        labels = (record["phase"], record["client"] or "", "hit" if record["cache_hit"] else "miss")
+        with self._lock:
+            totals = self._phases.setdefault(labels, {
+                "count": 0, "seconds": 0.0, "ttft_seconds": 0.0, "input_tokens": 0,
+                "output_tokens": 0, "retries": 0, "errors": 0, "cost_usd": 0.0,
+            })
+            totals["count"] += 1
+            totals["seconds"] += record["wall_ms"] / 1000
+            totals["ttft_seconds"] += (record["ttft_ms"] or 0) / 1000
+            totals["input_tokens"] += record["input_tokens"]
+            totals["output_tokens"] += record["output_tokens"]
+            totals["retries"] += record["retries"]
+            totals["errors"] += record["error"] is not None
+            totals["cost_usd"] += record["cost_usd"]
+
+    def add_run(self, seconds: float, cost_usd: float) -> None:
+        with self._lock:
+            self._runs["count"] += 1
+            self._runs["seconds"] += seconds
+            self._runs["cost_usd"] += cost_usd
+
+    def prometheus_text(self) -> str:
+        lines = []
+        with self._lock:
+            series = [
+                ("translation_phase_calls_total", "counter", "count"),
+                ("translation_phase_seconds_total", "counter", "seconds"),
+                ("translation_phase_ttft_seconds_total", "counter", "ttft_seconds"),
+                ("translation_phase_input_tokens_total", "counter", "input_tokens"),
+                ("translation_phase_output_tokens_total", "counter", "output_tokens"),
+                ("translation_phase_retries_total", "counter", "retries"),
+                ("translation_phase_errors_total", "counter", "errors"),
+                ("translation_phase_cost_usd_total", "counter", "cost_usd"),
+            ]
+            for name, kind, field in series:
+                lines.append(f"# TYPE {name} {kind}")
+                for (phase, client, cache), totals in sorted(self._phases.items()):
+                    lines.append(f'{name}{{phase="{phase}",client="{client}",cache="{cache}"}} {totals[field]}')
+            for field in ("count", "seconds", "cost_usd"):
+                name = "translation_runs_total" if field == "count" else f"translation_run_{field}_total"
+                lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name} {self._runs[field]}")
+            gauges = list(self._gauges)
+        for name, kind, label, read in gauges:
+            lines.append(f"# TYPE {name} {kind}")
+            for value, number in sorted(read().items()):
+                lines.append(f'{name}{{{label}="{value}"}} {number}')
+        return "\n".join(lines) + "\n"
+
+METRICS = MetricsRegistry()
+
+
+class RunMetrics:
+    """ Collects the phase records of one workflow run. """
+
+    def __init__(self, run_id=None, **tags):
+        self.run_id = run_id or uuid.uuid4().hex
+        self.tags = tags
+        self.phases = []
+        self.started = time.perf_counter()
+
+    def record(self, phase: str, function: str, collector: Collector, wall_ms: float, **extra) -> dict:
+        record = {**phase_record(phase, function, collector, wall_ms), **extra}
+        self.phases.append(record)
+        METRICS.add_phase(record)
+        log_event(METRICS_LOGGER, "phase", run_id=self.run_id, **self.tags, **record)
+        return record
+
+    def summary(self) -> dict:
+        per_phase = {}
+        for record in self.phases:
+            totals = per_phase.setdefault(record["phase"], {"calls": 0, "wall_ms": 0.0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0})
+            totals["calls"] += 1
+            totals["wall_ms"] += record["wall_ms"]
+            totals["input_tokens"] += record["input_tokens"]
+            totals["output_tokens"] += record["output_tokens"]
+            totals["cost_usd"] += record["cost_usd"]
+        return {
+            "run_id": self.run_id,
+            **self.tags,
+            "wall_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "cost_usd": sum(r["cost_usd"] for r in self.phases),
+            "phases": per_phase,
+        }
+
+    def finish(self) -> dict:
+        summary = self.summary()
+        METRICS.add_run(summary["wall_ms"] / 1000, summary["cost_usd"])
+        log_event(METRICS_LOGGER, "run", **summary)
+        return summary
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = METRICS.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """ Serve METRICS at http://host:port/metrics from a daemon thread. """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,230 @@
+""" Local OpenAI-compatible stand-in for benchmarking without spending quota.
+
+    python mock_llm.py --port 8089 --latency 0.4 --tokens-per-second 200
+
+Answers POST /v1/chat/completions (plain and streamed) after `latency`
+seconds, then produces `output_tokens` tokens at `tokens_per_second`.
+Functions that return a BAML class get an instance of its schema back.
+Point the BAML functions at it with `mock_registry(url)`.
+
+It also takes OpenAI batch jobs (POST /v1/files, POST /v1/batches, GET
+/v1/batches/ID, GET /v1/files/ID/content, see batch_api.py); a job completes
+`batch_seconds` after it was submitted.
+"""
+from baml_py import ClientRegistry
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json, re, threading, time, typer, uuid
+
+WORD = "lorem "
+SCHEMA_MARKER = "Answer in JSON using this schema:"
+EXAMPLES = {"string": '"lorem ipsum"', "int": "0", "float": "0.0", "bool": "false"}
+
+
+def mock_registry(base_url: str) -> ClientRegistry:
+    """ Client registry that sends every BAML function to the mock server. """
+    registry = ClientRegistry()
+    registry.add_llm_client("Mock", "openai-generic", {
+        "base_url": base_url,
+        "model": "mock",
+        "api_key": "mock",
+    })
+    registry.set_primary("Mock")
+    return registry
+
+
+def schema_example(prompt: str) -> str:
+    """ A reply that parses as the class described by BAML's output format block. """
+    schema = re.sub(r"//.*", "", prompt.split(SCHEMA_MARKER, 1)[1])
+    schema = re.sub(r"\b(string|int|float|bool)\[\]", lambda m: f"[{EXAMPLES[m.group(1)]}]", schema)
+    return re.sub(r"\b(string|int|float|bool)\b( or null)?", lambda m: EXAMPLES[m.group(1)], schema)
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.5
+    tokens_per_second = 200.0
+    output_tokens = 300
+    batch_seconds = 2.0
+    files = {}     # file id -> JSONL text; replaced per server by start_mock_server
+    batches = {}   # batch id -> batch object
+
+    def reply(self, request: dict):
+        """ (content, usage) for a chat completion request. """
+        prompt = "".join(str(m.get("content", "")) for m in request.get("messages", []))
+        prompt_chars = len(prompt)
+        content = schema_example(prompt) if SCHEMA_MARKER in prompt else WORD * self.output_tokens
+        usage = {
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": self.output_tokens,
+            "total_tokens": prompt_chars // 4 + self.output_tokens,
+        }
+        return content, usage
+
+    def completion(self, content: str, usage: dict) -> dict:
+        return {
+            "id": "mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "mock",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        }
+
+    def do_POST(self):
+        path = self.path.rstrip("/")
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if path.endswith("/files"):
+            self.upload(body)
+            return
+        if path.endswith("/batches"):
+            self.create_batch(json.loads(body))
+            return
+        if not path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        request = json.loads(body or b"{}")
+        content, usage = self.reply(request)
+        time.sleep(self.latency)
+        if request.get("stream"):
+            self.stream(content, usage)
+        else:
+            time.sleep(self.output_tokens / self.tokens_per_second)
+            self.send_json(self.completion(content, usage))
+
+    def do_GET(self):
+        path = self.path.rstrip("/")
+        if m := re.search(r"/files/([^/]+)/content$", path):
+            text = self.files.get(m.group(1))
+            if text is None:
+                self.send_error(404)
+                return
+            body = text.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/jsonl")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif m := re.search(r"/batches/([^/]+)$", path):
+            batch = self.batches.get(m.group(1))
+            if batch is None:
+                self.send_error(404)
+                return
+            if batch["status"] == "in_progress" and time.time() >= batch["created_at"] + self.batch_seconds:
+                self.complete_batch(batch)
+            self.send_json(batch)
+        else:
+            self.send_error(404)
+
+    def upload(self, body: bytes):
+        form = BytesParser().parsebytes(f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body)
+        content = next(part.get_payload(decode=True) for part in form.get_payload() if part.get_filename())
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        self.files[file_id] = content.decode("utf-8")
+        self.send_json({"id": file_id, "object": "file", "purpose": "batch", "bytes": len(content)})
+
+    def create_batch(self, request: dict):
+        if request.get("input_file_id") not in self.files:
+            self.send_error(400)
+            return
+        batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+        self.batches[batch_id] = {
+            "id": batch_id, "object": "batch", "endpoint": request["endpoint"], "status": "in_progress",
+            "input_file_id": request["input_file_id"], "created_at": time.time(),
+            "output_file_id": None, "error_file_id": None, "errors": None,
+        }
+        self.send_json(self.batches[batch_id])
+
+    def complete_batch(self, batch: dict):
+        lines = []
+        for line in self.files[batch["input_file_id"]].splitlines():
+            if line.strip():
+                item = json.loads(line)
+                response = {"status_code": 200, "body": self.completion(*self.reply(item["body"]))}
+                lines.append(json.dumps({"id": f"req-{uuid.uuid4().hex[:8]}", "custom_id": item["custom_id"],
+                                         "response": response, "error": None}))
+        output_id = f"file-{uuid.uuid4().hex[:12]}"
+        self.files[output_id] = "\n".join(lines) + "\n"
+        batch.update(status="completed", output_file_id=output_id)
+
+    def send_json(self, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream(self, content: str, usage: dict):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(payload):
+            data = f"data: {payload if isinstance(payload, str) else json.dumps(payload)}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        # send a handful of tokens per event so slow rates don't flood the socket
+        step = max(1, int(self.tokens_per_second // 20))
+        per_token = len(content) / self.output_tokens
+        for sent in range(0, self.output_tokens, step):
+            n = min(step, self.output_tokens - sent)
+            event({
+                "id": "mock", "object": "chat.completion.chunk", "model": "mock",
+                "choices": [{"index": 0, "delta": {"content": content[round(sent * per_token):round((sent + n) * per_token)]},
+                             "finish_reason": None}],
+            })
+            time.sleep(n / self.tokens_per_second)
+        event({
+            "id": "mock", "object": "chat.completion.chunk", "model": "mock",
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "usage": usage,
+        })
+        event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_mock_server(port: int = 0, *, latency=0.5, tokens_per_second=200.0, output_tokens=300, batch_seconds=2.0,
+                      host="127.0.0.1"):
+    """ Start the mock in a daemon thread; returns (server, base_url). Port 0 picks a free one. """
+    handler = type("ConfiguredMockLLMHandler", (MockLLMHandler,), {
+        "latency": latency,
+        "tokens_per_second": tokens_per_second,
+        "output_tokens": output_tokens,
+        "batch_seconds": batch_seconds,
+        "files": {},
+        "batches": {},
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main(
+    port: int = typer.Option(8089),
+    latency: float = typer.Option(0.5, help="Seconds before the first token"),
+    tokens_per_second: float = typer.Option(200.0),
+    output_tokens: int = typer.Option(300, help="Tokens in every response"),
+    batch_seconds: float = typer.Option(2.0, help="Seconds until a batch job completes"),
+):
+    server, url = start_mock_server(port, latency=latency, tokens_per_second=tokens_per_second, output_tokens=output_tokens,
+                                    batch_seconds=batch_seconds)
+    typer.echo(f"mock LLM listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,320 @@
+from collections import OrderedDict
+from functools import cache
+from hashlib import sha256
+from pathlib import Path
+from metrics import record_first_partial
+from spans import event
+import asyncio, concurrent.futures, json, os, sqlite3, threading, time
+
+@cache
+def baml_fingerprint() -> str:
+    """ Hash of the inlined baml_src. Every prompt and client definition lives
+    there, so it ties each cached result to the exact prompt/model config that
+    made it. Computed on first use: importing baml_client builds the runtime. """
+    from baml_client.inlinedbaml import get_baml_files
+    return sha256(json.dumps(get_baml_files(), sort_keys=True).encode("utf-8")).hexdigest()
+
+def phase_key(function: str, *, client_config=None, **kwargs) -> str:
+    """ Content-address a phase call: function name, prompt arguments and client config. """
+    payload = json.dumps(
+        {
+            "function": function,
+            "args": kwargs,
+            "baml": baml_fingerprint(),
+            "client": client_config,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return sha256(payload.encode("utf-8")).hexdigest()
+
+
+def encode(value):
+    """ JSON-ready form of a phase output; BAML classes keep their type name. """
+    if hasattr(value, "model_dump"):
+        return {"__baml_class__": type(value).__name__, "value": value.model_dump(mode="json")}
+    return value
+
+
+def decode(value):
+    if isinstance(value, dict) and "__baml_class__" in value:
+        from baml_client import types
+        return getattr(types, value["__baml_class__"]).model_validate(value["value"])
+    return value
+
+
+class PhaseCache:
+    """ Thread-safe LRU map of phase key -> phase output. """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            if key not in self._results:
+                return None
+            self._results.move_to_end(key)
+            return self._results[key]
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._results[key] = value
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._results.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+    def __len__(self):
+        return len(self._results)
+
+
+class DiskPhaseCache:
+    """ SQLite-backed phase cache shared by every worker process on the host.
+
+    Entries expire after `ttl` seconds and the least recently used ones are
+    evicted once the stored outputs exceed `max_bytes`. WAL mode lets readers
+    run alongside a writer; writers from other processes wait on the busy timeout.
+    """
+
+    EVICT_EVERY = 32  # writes between size checks
+
+    def __init__(self, directory, max_bytes: int = 256 * 2**20, ttl: float = 30 * 24 * 3600):
+        self.path = Path(directory) / "phases.sqlite3"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS phases ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS phases_accessed ON phases (accessed)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        conn = self._connect()
+        row = conn.execute("SELECT value, created FROM phases WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[1] > self.ttl:
+            self.invalidate(key)
+            return None
+        conn.execute("UPDATE phases SET accessed = ? WHERE key = ?", (now, key))
+        return decode(json.loads(row[0]))
+
+    def set(self, key: str, value) -> None:
+        data = json.dumps(encode(value), ensure_ascii=False)
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO phases (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+            (key, data, len(data.encode("utf-8")), now, now),
+        )
+        self._writes += 1
+        if self._writes % self.EVICT_EVERY == 1:
+            self.evict()
+
+    def invalidate(self, key: str) -> None:
+        self._connect().execute("DELETE FROM phases WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM phases")
+
+    def evict(self) -> None:
+        """ Drop expired entries, then least recently used ones until under `max_bytes`. """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM phases WHERE created < ?", (time.time() - self.ttl,))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM phases").fetchone()[0]
+            if total > self.max_bytes:
+                # walk from the oldest access time and cut once enough space is freed
+                cutoff, freed = None, 0
+                for accessed, size in conn.execute("SELECT accessed, size FROM phases ORDER BY accessed"):
+                    cutoff, freed = accessed, freed + size
+                    if total - freed <= self.max_bytes:
+                        break
+                conn.execute("DELETE FROM phases WHERE accessed <= ?", (cutoff,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM phases").fetchone()[0]
+
+
+class TieredPhaseCache:
+    """ In-memory LRU in front of a shared disk cache. """
+
+    def __init__(self, memory: PhaseCache, disk: DiskPhaseCache):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str):
+        result = self.memory.get(key)
+        if result is None:
+            result = self.disk.get(key)
+            if result is not None:
+                self.memory.set(key, result)
+        return result
+
+    def set(self, key: str, value) -> None:
+        self.memory.set(key, value)
+        self.disk.set(key, value)
+
+    def invalidate(self, key: str) -> None:
+        self.memory.invalidate(key)
+        self.disk.invalidate(key)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.disk.clear()
+
+
+class _Abandoned(Exception):
+    """ The call a waiter joined was cancelled; the waiter should make its own. """
+
+
+class SingleFlight:
+    """ Identical calls in flight at the same time share one request.
+
+    Streamlit runs every session in its own thread and event loop, so the
+    shared call is a concurrent.futures.Future any loop can wait on. The first
+    caller makes the request; the rest get its result, or its exception. If
+    the first caller is cancelled (its session reran), one of the waiters
+    takes over.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.joined = 0
+
+    async def do(self, key: str, call):
+        while True:
+            with self._lock:
+                future = self._calls.get(key)
+                leader = future is None
+                if leader:
+                    future = self._calls[key] = concurrent.futures.Future()
+                else:
+                    self.joined += 1
+            if leader:
+                break
+            event("joined_in_flight_call")
+            try:
+                # shielded so a waiter that gives up doesn't cancel the shared call
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _Abandoned:
+                continue
+
+        try:
+            result = await call()
+        except BaseException as e:
+            with self._lock:
+                del self._calls[key]
+            future.set_exception(_Abandoned() if isinstance(e, asyncio.CancelledError) else e)
+            raise
+        with self._lock:
+            del self._calls[key]
+        future.set_result(result)
+        return result
+
+    def __len__(self):
+        with self._lock:
+            return len(self._calls)
+
+# Process-wide, so identical phase calls from different sessions coalesce.
+IN_FLIGHT = SingleFlight()
+
+
+def make_phase_cache():
+    """ Build the phase cache from the environment.
+
+    PHASE_CACHE_DIR           directory for the shared SQLite store (empty disables it)
+    PHASE_CACHE_MAX_MB        size limit of the disk store
+    PHASE_CACHE_TTL_HOURS     age after which disk entries expire
+    """
+    memory = PhaseCache()
+    directory = os.environ.get("PHASE_CACHE_DIR", ".cache/phases")
+    if not directory:
+        return memory
+    disk = DiskPhaseCache(
+        directory,
+        max_bytes=int(float(os.environ.get("PHASE_CACHE_MAX_MB", 256)) * 2**20),
+        ttl=float(os.environ.get("PHASE_CACHE_TTL_HOURS", 30 * 24)) * 3600,
+    )
+    return TieredPhaseCache(memory, disk)
+
+
+async def cached_acall(cache, client, function: str, *, refresh=False, client_config=None, baml_options=None,
+                       on_partial=None, on_miss=None, **kwargs):
+    """ Await `client.<function>(**kwargs)` unless an identical call is already cached.
+
+    `refresh=True` drops the cached entry first (used by the Redo buttons).
+    `baml_options` (collectors etc.) is passed through but not part of the key.
+    With `on_partial`, a cache miss is streamed through `client.stream` and
+    `on_partial(text_so_far)` is called for every chunk; a hit returns at once.
+    The first chunk's arrival goes to metrics.record_first_partial for the
+    call's collector, which is how phase records get their time to first token.
+    A miss identical to a call already in flight (from any session) waits for
+    that call instead of making its own; it gets no partials, only the result.
+    `on_miss(kwargs)` is asked first on a miss and returns (result, kwargs):
+    a result to use without calling, or None and the arguments to call with.
+    Either way the result is cached under the key of the original arguments.
+    """
+    key = phase_key(function, client_config=client_config, **kwargs)
+    if refresh:
+        cache.invalidate(key)
+    else:
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+    async def call():
+        result, arguments = on_miss(kwargs) if on_miss is not None else (None, kwargs)
+        if result is not None:
+            cache.set(key, result)
+            return result
+        if on_partial is None:
+            result = await getattr(client, function)(**arguments, baml_options=baml_options or {})
+        else:
+            stream = getattr(client.stream, function)(**arguments, baml_options=baml_options or {})
+            first = True
+            async for partial in stream:
+                if partial:
+                    if first:
+                        record_first_partial((baml_options or {}).get("collector"))
+                        first = False
+                    on_partial(partial)
+            result = await stream.get_final_response()
+        cache.set(key, result)
+        return result
+
+    return await IN_FLIGHT.do(key, call)
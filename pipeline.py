@@ -0,0 +1,250 @@
+from llm_util import get_memory_prompt, format_analysis, format_literal, format_clarity, format_backtranslation, format_review
+from baml_py import Collector
+from compact import COMPACT_CONTEXT, compact_args
+from metrics import phase_record
+from phase_cache import cached_acall
+from spans import current_span, run_span, span
+from typing import Callable, NamedTuple
+import asyncio, os, time
+
+# What to do with the final phase when no review issue is above REVIEW_THRESHOLD:
+#   off       always run GetFinalTranslation
+#   shortcut  run the much smaller GetPolishedTranslation over the clarified text
+#   skip      make no call: the clarified lines without their alternatives
+REVIEW_GATE = os.environ.get("REVIEW_GATE", "shortcut")
+REVIEW_THRESHOLD = int(os.environ.get("REVIEW_THRESHOLD", 2))
+
+# what the final phase calls instead of its own function under REVIEW_GATE=shortcut
+POLISH_FUNCTION = "GetPolishedTranslation"
+
+
+class Phase(NamedTuple):
+    name: str
+    title: str
+    function: str          # BAML function in baml_src/translate.baml
+    deps: tuple            # phases whose output feeds the prompt
+    args: Callable         # (inputs, upstream results) -> BAML kwargs
+    show: Callable         # result (a BAML class, maybe partial) -> markdown
+    post: Callable = None  # BAML class -> what the phase hands on, if not the class itself
+
+
+def _final_text(final) -> str:
+    return (final.translation or "").strip()
+
+
+def clear_lines(clarity) -> list:
+    """ The clarified translation without its alternatives, one string per line. """
+    return [line.translation for line in clarity.lines]
+
+
+def _literal_from_memory(source_text: str, translation: str):
+    from baml_client.types import LiteralLine, LiteralTranslation
+    sources, targets = source_text.splitlines(), translation.splitlines()
+    if len(sources) != len(targets):
+        sources = [""] * len(targets)
+    return LiteralTranslation(lines=[LiteralLine(source=s, translation=t, alternatives=[]) for s, t in zip(sources, targets)])
+
+
+# `inputs` holds context, source_lang, target_lang and source_text. Every
+# function returns a BAML class (baml_client/types.py), and each prompt only
+# takes the parts of upstream results it uses: Backtranslation and Review see
+# the clarified lines without their alternatives.
+PHASES = [
+    Phase("analysis", "Analysis", "GetAnalysis", (), lambda i, r: dict(
+        context=i["context"], source_lang=i["source_lang"], target_lang=i["target_lang"], source_text=i["source_text"]),
+        format_analysis),
+    Phase("literal", "Literal Translation", "GetLiteralTranslate", (), lambda i, r: dict(
+        context=i["context"], prompt=i["source_text"], source_lang=i["source_lang"], target_lang=i["target_lang"], is_song=False),
+        format_literal),
+    Phase("clarity", "Clarity", "GetClarity", ("analysis", "literal"), lambda i, r: dict(
+        context=i["context"], prompt=i["source_text"], target_lang=i["target_lang"], literal_translation=r["literal"], analysis=r["analysis"]),
+        format_clarity),
+    Phase("backtranslation", "Backtranslation", "GetBackTranslation", ("clarity",), lambda i, r: dict(
+        context=i["context"], source_lang=i["source_lang"], clarified_translation=clear_lines(r["clarity"])),
+        format_backtranslation),
+    Phase("review", "Review", "GetReview", ("clarity", "backtranslation"), lambda i, r: dict(
+        context=i["context"], target_lang=i["target_lang"], source_text=i["source_text"],
+        clarified_translation=clear_lines(r["clarity"]), backtranslation=r["backtranslation"], syllabification=""),
+        format_review),
+    # hands on the translation text itself: it's what users copy and the translation memory stores
+    Phase("final", "Final Translation", "GetFinalTranslation", ("analysis", "clarity", "review"), lambda i, r: dict(
+        context=i["context"], target_lang=i["target_lang"], source_text=i["source_text"], analysis=r["analysis"],
+        clarified_translation=r["clarity"], final_review=r["review"], item_type="text"),
+        str, _final_text),
+]
+
+PHASES_BY_NAME = {phase.name: phase for phase in PHASES}
+
+
+def render(name: str, value) -> str:
+    """ Markdown for a phase result (or a streamed partial one). """
+    return value if isinstance(value, str) else PHASES_BY_NAME[name].show(value)
+
+
+def review_passed(review, threshold: int = None) -> bool:
+    """ True when no issue in a Review is above `threshold` (default REVIEW_THRESHOLD). """
+    threshold = REVIEW_THRESHOLD if threshold is None else threshold
+    if getattr(review, "issues", None) is None:
+        return False
+    return max([review.severity or 0] + [issue.severity for issue in review.issues]) <= threshold
+
+
+def ancestors(name: str) -> set:
+    """ Every phase whose output `name` needs, directly or further up. """
+    found = set()
+    for dep in PHASES_BY_NAME[name].deps:
+        found |= {dep} | ancestors(dep)
+    return found
+
+
+def dependents(name: str) -> set:
+    """ Every phase that consumes `name`'s output, directly or further down. """
+    found = set()
+    for phase in PHASES:
+        if name in phase.deps or found.intersection(phase.deps):
+            found.add(phase.name)
+    return found
+
+
+async def run_pipeline(inputs: dict, *, client, cache, refresh=(), previous=None, only=None,
+                       metrics=None, memory=None, on_result=None, on_partial=None, compact=None) -> dict:
+    """ Run every phase as soon as the phases it depends on have finished.
+
+    Analysis and Literal Translation share no inputs besides the source text,
+    so they go out together; the rest follow the dependency chain.
+    `refresh` names phases whose cached result should be ignored (Redo).
+    `previous` holds the results of an earlier run over the same inputs; those
+    are reused as-is unless the phase is refreshed or depends on one that is,
+    so a Redo makes exactly one fresh call plus whatever sits downstream of it.
+    `only` restricts the run to the named phases and what they depend on.
+    `metrics` (a metrics.RunMetrics) gets one record per phase call, fed by a
+    BAML collector attached to the call; a call that fails is recorded with
+    its error before the exception goes on.
+    `memory` (a translation_memory.TranslationMemory) is consulted when the
+    literal translation isn't in the phase cache: a text made only of known
+    segments skips the call, otherwise close matches are added to the prompt's
+    context. Either way the result is cached as if the memory hadn't been used.
+    Final goes through the review gate (REVIEW_GATE, REVIEW_THRESHOLD).
+    `compact` (default COMPACT_CONTEXT) trims upstream results to what each
+    prompt needs first (compact.py).
+    Every phase gets a span (spans.py), under the run's root span, which is
+    opened here unless the caller already has one.
+    Results are the BAML classes the functions return, except Final's, which
+    is the translation text; `render` makes markdown of any of them.
+    `on_result(name, value)` is called as each phase completes. With
+    `on_partial(name, value)`, uncached phases are streamed and the callback
+    receives the post-processed result so far after every chunk.
+    """
+    tasks = {}
+    previous = previous or {}
+    compact = COMPACT_CONTEXT if compact is None else compact
+    stale = set(refresh)
+    for name in refresh:
+        stale |= dependents(name)
+
+    async def run(phase: Phase):
+        with span(phase.name, phase=phase.name):
+            return await run_phase(phase)
+
+    async def run_phase(phase: Phase):
+        current = current_span()
+        if phase.name in previous and phase.name not in stale:
+            result = previous[phase.name]
+            if current is not None:
+                current.set(reused=True)
+            if on_result is not None:
+                on_result(phase.name, result)
+            return result
+
+        upstream = {}
+        for dep in phase.deps:
+            upstream[dep] = await tasks[dep]
+        if current is not None:
+            # everything before this was waiting on upstream phases
+            current.event("ready")
+        kwargs = phase.args(inputs, upstream)
+        function, gate = phase.function, None
+
+        # a clean review doesn't need the big final prompt; a Redo of Final always gets it
+        if phase.name == "final" and REVIEW_GATE != "off" and phase.name not in refresh and review_passed(upstream["review"]):
+            gate = REVIEW_GATE
+            if gate == "skip":
+                result = "\n".join(clear_lines(upstream["clarity"])).strip()
+                if current is not None:
+                    current.set(gate=gate)
+                if metrics is not None:
+                    metrics.record(phase.name, phase.function, Collector(name=phase.name), 0.0, gate=gate)
+                if on_result is not None:
+                    on_result(phase.name, result)
+                return result
+            function = POLISH_FUNCTION
+            kwargs = dict(context=inputs["context"], target_lang=inputs["target_lang"], clarified_translation=upstream["clarity"])
+        elif compact:
+            kwargs = compact_args(phase.name, kwargs)
+
+        from_memory, on_miss = [], None
+        if memory is not None and phase.name == "literal" and phase.name not in refresh:
+            # only on a cache miss, so the memory never replaces a literal translation already shown,
+            # and the result is cached under the key without the matches
+            def on_miss(kwargs: dict):
+                translation, matches = memory.lookup(inputs["source_lang"], inputs["target_lang"], inputs["source_text"])
+                if translation is not None:
+                    from_memory.append(translation)
+                    return _literal_from_memory(inputs["source_text"], translation), kwargs
+                if matches:
+                    kwargs = {**kwargs, "context": kwargs["context"] + get_memory_prompt(matches)}
+                return None, kwargs
+
+        stream_to = None
+        if on_partial is not None:
+            stream_to = lambda value: on_partial(phase.name, phase.post(value) if phase.post else value)
+        config_for = getattr(client, "client_config", None)
+        collector = Collector(name=phase.name)
+        start = time.perf_counter()
+        extra = {"gate": gate} if gate else {}
+        try:
+            result = await cached_acall(
+                cache, client, function,
+                refresh=phase.name in refresh,
+                client_config=config_for(function) if config_for else None,
+                baml_options={"collector": collector},
+                on_partial=stream_to,
+                on_miss=on_miss,
+                **kwargs,
+            )
+        except Exception as e:
+            if metrics is not None:
+                metrics.record(phase.name, function, collector, (time.perf_counter() - start) * 1000, error=str(e), **extra)
+            raise
+        wall_ms = (time.perf_counter() - start) * 1000
+        if from_memory:
+            extra["memory"] = "exact"
+        if current is not None:
+            current.set(**phase_record(phase.name, function, collector, wall_ms), **extra)
+        if metrics is not None:
+            metrics.record(phase.name, function, collector, wall_ms, **extra)
+        if phase.post is not None:
+            result = phase.post(result)
+        if on_result is not None:
+            on_result(phase.name, result)
+        return result
+
+    wanted = None
+    if only is not None:
+        wanted = set(only)
+        for name in only:
+            wanted |= ancestors(name)
+
+    with run_span(inputs):
+        # PHASES is in topological order, so every dependency already has a task
+        for phase in PHASES:
+            if wanted is not None and phase.name not in wanted:
+                continue
+            tasks[phase.name] = asyncio.ensure_future(run(phase))
+
+        try:
+            results = await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+    return dict(zip(tasks, results))
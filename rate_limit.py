@@ -0,0 +1,342 @@
+""" Client-side token buckets that keep us under each provider's quota.
+
+Every BAML call waits for one request and its estimated tokens from the
+buckets of the provider it goes to, so bursts queue here instead of turning
+into 429s and `Exponential` retries. Waiting calls are served round-robin
+across sessions (a browser session, a batch document), so one long document
+can't starve everyone else.
+
+    RATE_LIMITS=google-ai=2000/4000000,openai=500/200000   # requests/tokens per minute
+    RATE_LIMITS=off                                          # no limiting
+    RATE_LIMIT_FILE=.cache/rate_limit.json                   # share the buckets between processes
+
+The buckets live in the process unless RATE_LIMIT_FILE is set, in which case
+their levels are kept in that file under an exclusive lock, so several
+Streamlit or batch workers on one machine draw from the same quota.
+"""
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from llm_util import LOGGER
+from metrics import METRICS, outside_call
+from pathlib import Path
+from spans import event
+import asyncio, json, os, threading, time
+
+# Client name in baml_src/clients.baml -> provider whose quota it draws on.
+PROVIDERS = {
+    "Gemini": "google-ai",
+    "GPT4oMini": "openai",
+    "Sonnet": "anthropic",
+    "Haiku": "anthropic",
+}
+
+# (requests per minute, tokens per minute); entry-tier quotas, override with RATE_LIMITS.
+DEFAULT_LIMITS = {
+    "google-ai": (2000, 4_000_000),
+    "openai": (500, 200_000),
+    "anthropic": (50, 50_000),
+}
+
+BURST_SECONDS = 10.0          # a full bucket holds this many seconds of quota
+EXPECTED_OUTPUT_TOKENS = 1000 # reserved per call until the real usage is known
+POLL = 0.05                   # longest a waiting call sleeps before checking again
+
+# Calls are queued fairly between sessions; set it per browser session or batch job.
+SESSION = ContextVar("rate_limit_session", default="default")
+
+
+def set_session(name: str) -> None:
+    SESSION.set(name)
+
+
+def estimate_tokens(kwargs: dict) -> int:
+    """ Rough input tokens (4 characters each) plus the output we expect back.
+
+    Upstream results are BAML classes and lists, so the arguments are measured
+    as JSON; the field names roughly stand in for the prompt's own labels.
+    """
+    chars = len(json.dumps(kwargs, ensure_ascii=False, default=lambda v: v.model_dump() if hasattr(v, "model_dump") else str(v)))
+    return chars // 4 + EXPECTED_OUTPUT_TOKENS
+
+
+def used_tokens(baml_options):
+    """ Tokens the call actually used, if a collector saw it. """
+    collector = (baml_options or {}).get("collector")
+    log = collector.last if collector is not None else None
+    if log is None:
+        outside = outside_call(collector) if collector is not None else None
+        return outside["input_tokens"] + outside["output_tokens"] if outside is not None else None
+    if log.usage.input_tokens is None:
+        return None
+    return (log.usage.input_tokens or 0) + (log.usage.output_tokens or 0)
+
+
+class LocalStore:
+    """ Bucket levels for this process only. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}
+
+    @contextmanager
+    def locked(self):
+        with self._lock:
+            yield self._state
+
+
+class FileStore:
+    """ Bucket levels kept in a JSON file that every process on the machine locks in turn. """
+
+    def __init__(self, path):
+        import fcntl
+        self._fcntl = fcntl
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def locked(self):
+        with self._lock, open(self.path, "a+", encoding="utf-8") as f:
+            self._fcntl.flock(f, self._fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                state = json.loads(f.read() or "{}")
+            except ValueError:
+                state = {}
+            yield state
+            f.seek(0)
+            f.truncate()
+            f.write(json.dumps(state))
+            f.flush()
+
+
+class _Ticket:
+    __slots__ = ("tokens", "granted")
+
+    def __init__(self, tokens: int):
+        self.tokens = tokens
+        self.granted = False
+
+
+class ProviderQuota:
+    """ Request and token buckets for one provider, and the calls waiting on them. """
+
+    def __init__(self, provider: str, requests_per_minute: float, tokens_per_minute: float, store):
+        self.provider = provider
+        self.limits = {"requests": requests_per_minute, "tokens": tokens_per_minute}
+        self.store = store
+        self.queues = OrderedDict()   # session -> deque of tickets, in serving order
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def _level(self, state: dict, bucket: str, now: float) -> float:
+        per_minute = self.limits[bucket]
+        capacity = per_minute * BURST_SECONDS / 60
+        level, updated = state.get(f"{self.provider}:{bucket}", (capacity, now))
+        return min(capacity, level + (now - updated) * per_minute / 60)
+
+    def _wait(self, state: dict, bucket: str, amount: float, now: float) -> float:
+        per_minute = self.limits[bucket]
+        # a call bigger than the whole bucket goes once it's full and leaves it in debt
+        amount = min(amount, per_minute * BURST_SECONDS / 60)
+        missing = amount - self._level(state, bucket, now)
+        return missing * 60 / per_minute if missing > 0 else 0.0
+
+    def _take(self, state: dict, bucket: str, amount: float, now: float) -> None:
+        state[f"{self.provider}:{bucket}"] = (self._level(state, bucket, now) - amount, now)
+
+    def _dispatch(self) -> float:
+        """ Grant waiting tickets round-robin across sessions; returns seconds until the next one fits. """
+        with self.store.locked() as state:
+            while self.queues:
+                session, queue = next(iter(self.queues.items()))
+                ticket = queue[0]
+                now = time.time()
+                wait = max(self._wait(state, "requests", 1, now), self._wait(state, "tokens", ticket.tokens, now))
+                if wait > 0:
+                    return wait
+                self._take(state, "requests", 1, now)
+                self._take(state, "tokens", ticket.tokens, now)
+                ticket.granted = True
+                queue.popleft()
+                del self.queues[session]
+                if queue:
+                    self.queues[session] = queue
+        return 0.0
+
+    async def acquire(self, tokens: int, session: str) -> None:
+        ticket = _Ticket(tokens)
+        start = time.perf_counter()
+        with self._lock:
+            self.queues.setdefault(session, deque()).append(ticket)
+        try:
+            while True:
+                with self._lock:
+                    wait = self._dispatch()
+                    if ticket.granted:
+                        break
+                await asyncio.sleep(min(max(wait, 0.005), POLL))
+        finally:
+            with self._lock:
+                if not ticket.granted:
+                    queue = self.queues.get(session)
+                    if queue is not None and ticket in queue:
+                        queue.remove(ticket)
+                        if not queue:
+                            del self.queues[session]
+                self.waited += time.perf_counter() - start
+        waited = time.perf_counter() - start
+        if waited > 0.01:
+            event("rate_limit_wait", provider=self.provider, seconds=round(waited, 3), tokens=tokens)
+        if waited > 1:
+            LOGGER.info("waited %.1fs for %s quota (%d tokens)", waited, self.provider, tokens)
+
+    def settle(self, estimated: int, actual) -> None:
+        """ Correct the token bucket once the real usage of a call is known. """
+        if actual is None or actual == estimated:
+            return
+        with self._lock, self.store.locked() as state:
+            self._take(state, "tokens", actual - estimated, time.time())
+
+    def queue_depth(self) -> int:
+        with self._lock:
+            return sum(len(queue) for queue in self.queues.values())
+
+
+class RateLimiter:
+    """ One ProviderQuota per provider, shared by every client wrapper in the process. """
+
+    def __init__(self, limits: dict, store=None):
+        store = store or LocalStore()
+        self.quotas = {provider: ProviderQuota(provider, rpm, tpm, store) for provider, (rpm, tpm) in limits.items()}
+        METRICS.add_gauge("translation_rate_limit_queue_depth", "gauge", "provider", self.queue_depths)
+        METRICS.add_gauge("translation_rate_limit_wait_seconds_total", "counter", "provider",
+                          lambda: {provider: quota.waited for provider, quota in self.quotas.items()})
+
+    def for_client(self, name: str):
+        return self.quotas.get(PROVIDERS.get(name, name))
+
+    def queue_depths(self) -> dict:
+        return {provider: quota.queue_depth() for provider, quota in self.quotas.items()}
+
+
+def parse_limits(spec: str) -> dict:
+    """ "google-ai=2000/4000000,openai=500/200000" -> {"google-ai": (2000.0, 4000000.0), ...} """
+    limits = dict(DEFAULT_LIMITS)
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        provider, _, quota = item.partition("=")
+        rpm, _, tpm = quota.partition("/")
+        limits[PROVIDERS.get(provider.strip(), provider.strip())] = (float(rpm), float(tpm))
+    return limits
+
+
+_LIMITER = None
+_LIMITER_LOCK = threading.Lock()
+
+
+def get_rate_limiter():
+    """ The process-wide limiter configured by RATE_LIMITS / RATE_LIMIT_FILE, or None when off. """
+    global _LIMITER
+    spec = os.environ.get("RATE_LIMITS", "")
+    if spec.strip().lower() == "off":
+        return None
+    with _LIMITER_LOCK:
+        if _LIMITER is None:
+            store = None
+            path = os.environ.get("RATE_LIMIT_FILE", "")
+            if path:
+                try:
+                    store = FileStore(path)
+                except ImportError:
+                    LOGGER.error("RATE_LIMIT_FILE needs fcntl; limiting this process only")
+            _LIMITER = RateLimiter(parse_limits(spec), store)
+        return _LIMITER
+
+
+class RateLimitedClient:
+    """ Stand-in for BamlAsyncClient that waits for quota before every call.
+
+    `client_of(baml_options)` names the clients.baml client a call will use,
+    which decides whose quota it draws on.
+    """
+
+    def __init__(self, client, limiter: RateLimiter, client_of):
+        self._client = client
+        self.limiter = limiter
+        self.client_of = client_of
+        self.stream = _LimitedStreams(self)
+
+    def client_config(self, function: str):
+        config = getattr(self._client, "client_config", None)
+        return config(function) if config else None
+
+    def __getattr__(self, function: str):
+        async def call(baml_options=None, **kwargs):
+            baml_options = baml_options or {}
+            quota = self.limiter.for_client(self.client_of(baml_options))
+            if quota is None:
+                return await getattr(self._client, function)(**kwargs, baml_options=baml_options)
+            estimate = estimate_tokens(kwargs)
+            await quota.acquire(estimate, SESSION.get())
+            try:
+                return await getattr(self._client, function)(**kwargs, baml_options=baml_options)
+            finally:
+                quota.settle(estimate, used_tokens(baml_options))
+
+        return call
+
+
+class _LimitedStreams:
+    def __init__(self, limited: RateLimitedClient):
+        self._limited = limited
+
+    def __getattr__(self, function: str):
+        limited = self._limited
+
+        def stream(baml_options=None, **kwargs):
+            baml_options = baml_options or {}
+            make = lambda: getattr(limited._client.stream, function)(**kwargs, baml_options=baml_options)
+            quota = limited.limiter.for_client(limited.client_of(baml_options))
+            if quota is None:
+                return make()
+            return _LimitedStream(make, quota, estimate_tokens(kwargs), baml_options)
+
+        return stream
+
+
+class _LimitedStream:
+    """ Opens the underlying stream only once quota has been granted. """
+
+    def __init__(self, make, quota: ProviderQuota, estimate: int, baml_options: dict):
+        self._make = make
+        self._quota = quota
+        self._estimate = estimate
+        self._baml_options = baml_options
+        self._stream = None
+
+    async def _open(self):
+        if self._stream is None:
+            await self._quota.acquire(self._estimate, SESSION.get())
+            self._stream = self._make()
+        return self._stream
+
+    async def __aiter__(self):
+        stream = await self._open()
+        async for partial in stream:
+            yield partial
+
+    async def get_final_response(self):
+        stream = await self._open()
+        try:
+            return await stream.get_final_response()
+        finally:
+            self._quota.settle(self._estimate, used_tokens(self._baml_options))
+
+
+def make_rate_limited_client(client, client_of):
+    """ Wrap `client` in a RateLimitedClient unless RATE_LIMITS=off. """
+    limiter = get_rate_limiter()
+    return RateLimitedClient(client, limiter, client_of) if limiter is not None else client
@@ -0,0 +1,234 @@
+""" How well GetReview catches errors put into translations on purpose.
+
+    python review_eval.py                        # corpus/sample.jsonl, real providers
+    python review_eval.py --variants 3 --mock    # local stand-in, checks the plumbing only
+
+For every seed document the pipeline first produces a clean clarified
+translation. Each case then corrupts it one way, backtranslates the result
+and asks GetReview about it (see ideas.md and design.ipynb):
+
+    clean              nothing changed; anything flagged here is a false positive
+    typo               two letters swapped, or one dropped, in a word of the translation
+    omission           a word of the translation left out
+    made_up_language   an invented target language and a gibberish translation
+    missing_text       a third of the source words blanked out
+
+A case is detected when the review reports an issue of severity
+DETECT_SEVERITY or more; for typos and omissions it is also located when such
+an issue names the affected word. Precision for an error type counts the
+clean cases flagged as false positives. Cases are seeded by their id and every
+call goes through the phase cache (PHASE_CACHE_DIR), so a rerun only pays for
+cases it hasn't seen.
+"""
+from baml_client.async_client import b
+from baml_client.config import set_log_level
+from batch import load_documents
+from llm_util import get_context_prompt
+from mock_llm import mock_registry, start_mock_server
+from phase_cache import PhaseCache, cached_acall, make_phase_cache
+from pipeline import run_pipeline, clear_lines
+from routing import make_client
+from pathlib import Path
+import asyncio, json, random, re, typer
+
+DETECT_SEVERITY = 3
+MADE_UP_LANGUAGES = ["Vortlandic", "Quenebrish", "Ostravelan", "Miruvian"]
+SYLLABLES = ["do", "re", "mi", "fa", "sol", "la", "si"]
+
+
+def _pick_word(rng: random.Random, lines: list):
+    words = [(i, m) for i, line in enumerate(lines) for m in re.finditer(r"\w{4,}", line)]
+    return rng.choice(words) if words else None
+
+
+def _replace(lines: list, i: int, start: int, end: int, text: str) -> list:
+    lines = list(lines)
+    lines[i] = lines[i][:start] + text + lines[i][end:]
+    return lines
+
+
+def typo(rng, source_text, target_lang, lines):
+    picked = _pick_word(rng, lines)
+    if picked is None:
+        return None
+    i, m = picked
+    word = m.group()
+    j = rng.randrange(len(word) - 1)
+    broken = word[:j] + word[j + 1] + word[j] + word[j + 2:]
+    if broken == word or rng.random() < 0.5:
+        broken = word[:j] + word[j + 1:]
+    return dict(source_text=source_text, target_lang=target_lang, lines=_replace(lines, i, m.start(), m.end(), broken),
+                words=[broken, word])
+
+
+def omission(rng, source_text, target_lang, lines):
+    picked = _pick_word(rng, lines)
+    if picked is None:
+        return None
+    i, m = picked
+    end = m.end() + 1 if lines[i][m.end():m.end() + 1] == " " else m.end()
+    return dict(source_text=source_text, target_lang=target_lang, lines=_replace(lines, i, m.start(), end, ""),
+                words=[m.group()])
+
+
+def made_up_language(rng, source_text, target_lang, lines):
+    gibberish = [" ".join("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))) for _ in line.split())
+                 for line in lines]
+    return dict(source_text=source_text, target_lang=rng.choice(MADE_UP_LANGUAGES), lines=gibberish, words=[])
+
+
+def missing_text(rng, source_text, target_lang, lines):
+    words = list(re.finditer(r"\w+", source_text))
+    if len(words) < 3:
+        return None
+    blanked = source_text
+    for m in sorted(rng.sample(words, len(words) // 3), key=lambda m: m.start(), reverse=True):
+        blanked = blanked[:m.start()] + "___" + blanked[m.end():]
+    return dict(source_text=blanked, target_lang=target_lang, lines=lines, words=[])
+
+
+def clean(rng, source_text, target_lang, lines):
+    return dict(source_text=source_text, target_lang=target_lang, lines=lines, words=[])
+
+
+# error type -> (rng, source_text, target_lang, clarified lines) -> case, or None if it doesn't apply
+CORRUPTIONS = {
+    "clean": clean,
+    "typo": typo,
+    "omission": omission,
+    "made_up_language": made_up_language,
+    "missing_text": missing_text,
+}
+
+
+def make_cases(doc: dict, lines: list, variants: int) -> list:
+    cases = []
+    for kind, corrupt in CORRUPTIONS.items():
+        for n in range(1 if kind == "clean" else variants):
+            case_id = f"{doc['id']}:{kind}:{n}"
+            case = corrupt(random.Random(case_id), doc["source_text"], doc["target_lang"], lines)
+            if case is not None:
+                cases.append({"id": case_id, "kind": kind, "source_lang": doc["source_lang"], **case})
+    return cases
+
+
+def _context(case: dict) -> str:
+    return get_context_prompt(target_lang=case["target_lang"], source_lang=case["source_lang"], extra_context="")
+
+
+def _config(client, function: str):
+    config_for = getattr(client, "client_config", None)
+    return config_for(function) if config_for else None
+
+
+async def backtranslate_case(case: dict, *, client, cache):
+    return await cached_acall(cache, client, "GetBackTranslation", client_config=_config(client, "GetBackTranslation"),
+                              context=_context(case), source_lang=case["source_lang"], clarified_translation=case["lines"])
+
+
+async def review_case(case: dict, backtranslation, *, client, cache, client_config=None, baml_options=None):
+    """ GetReview over one case; `client_config` overrides the client's own (see phase_cache.phase_key). """
+    return await cached_acall(
+        cache, client, "GetReview",
+        client_config=client_config or _config(client, "GetReview"), baml_options=baml_options,
+        context=_context(case), target_lang=case["target_lang"], source_text=case["source_text"],
+        clarified_translation=case["lines"], backtranslation=backtranslation, syllabification="",
+    )
+
+
+def score(case: dict, review) -> dict:
+    flagged = [issue for issue in review.issues if issue.severity >= DETECT_SEVERITY]
+    detected = bool(flagged) or review.severity >= DETECT_SEVERITY
+    located = detected
+    if case["words"]:
+        text = " ".join(f"{i.location} {i.problem} {i.suggestion}" for i in flagged).casefold()
+        located = any(word.casefold() in text for word in case["words"])
+    return {"detected": detected, "located": located, "severity": review.severity}
+
+
+def summarize(scored: list) -> dict:
+    false_positives = sum(s["detected"] for s in scored if s["kind"] == "clean")
+    table = {}
+    for kind in CORRUPTIONS:
+        rows = [s for s in scored if s["kind"] == kind]
+        if not rows:
+            continue
+        detected = sum(s["detected"] for s in rows)
+        entry = {"cases": len(rows), "detected": detected}
+        if kind == "clean":
+            entry["false_positive_rate"] = round(detected / len(rows), 3)
+        else:
+            entry["recall"] = round(detected / len(rows), 3)
+            entry["located"] = round(sum(s["located"] for s in rows) / len(rows), 3) if rows[0]["words"] else None
+            entry["precision"] = round(detected / (detected + false_positives), 3) if detected + false_positives else None
+        table[kind] = entry
+    return table
+
+
+async def seed_cases(documents: list, *, client, cache, variants: int, concurrency: int) -> list:
+    """ Translate the seeds (up to Clarity) and corrupt the results into cases. """
+    limit = asyncio.Semaphore(concurrency)
+
+    async def seed(doc: dict) -> list:
+        inputs = dict(
+            context=get_context_prompt(target_lang=doc["target_lang"], source_lang=doc["source_lang"], extra_context=""),
+            source_lang=doc["source_lang"],
+            target_lang=doc["target_lang"],
+            source_text=doc["source_text"],
+        )
+        async with limit:
+            results = await run_pipeline(inputs, client=client, cache=cache, only=("clarity",))
+        return make_cases(doc, clear_lines(results["clarity"]), variants)
+
+    return [case for cases in await asyncio.gather(*(seed(doc) for doc in documents)) for case in cases]
+
+
+async def evaluate(documents: list, *, client, cache, variants: int, concurrency: int) -> list:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(case: dict) -> dict:
+        async with limit:
+            backtranslation = await backtranslate_case(case, client=client, cache=cache)
+            review = await review_case(case, backtranslation, client=client, cache=cache)
+        return {**case, **score(case, review), "review": review.model_dump(mode="json")}
+
+    cases = await seed_cases(documents, client=client, cache=cache, variants=variants, concurrency=concurrency)
+    return await asyncio.gather(*(one(case) for case in cases))
+
+
+def main(
+    corpus: Path = typer.Option(Path("corpus/sample.jsonl"), exists=True, help="Seed texts: directory or JSONL, as for batch.py"),
+    variants: int = typer.Option(2, help="Cases per error type and seed"),
+    concurrency: int = typer.Option(8),
+    mock: bool = typer.Option(False, help="Use a local stand-in instead of the real clients"),
+    json_out: str = typer.Option("", help="Also write every case and its review to this JSON file"),
+):
+    set_log_level("WARN")
+    documents = [{"source_lang": "English", "target_lang": "French", **doc} for doc in load_documents(corpus)]
+    if mock:
+        _, url = start_mock_server(latency=0.1, output_tokens=150)
+        client = b.with_options(client_registry=mock_registry(url))
+    else:
+        client = make_client(b)
+
+    # mock replies share cache keys with real ones, so they stay out of the shared disk cache
+    cache = PhaseCache() if mock else make_phase_cache()
+    scored = asyncio.run(evaluate(documents, client=client, cache=cache, variants=variants, concurrency=concurrency))
+    table = summarize(scored)
+
+    typer.echo("| error type | cases | detected | recall | located | precision |")
+    typer.echo("|---|---|---|---|---|---|")
+    for kind, entry in table.items():
+        if kind == "clean":
+            typer.echo(f"| clean | {entry['cases']} | {entry['detected']} | - | - | false positive rate {entry['false_positive_rate']} |")
+        else:
+            typer.echo(f"| {kind} | {entry['cases']} | {entry['detected']} | {entry['recall']} | "
+                       f"{entry['located'] if entry['located'] is not None else '-'} | {entry['precision']} |")
+
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump({"summary": table, "cases": scored}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,397 @@
+""" Choosing which client in baml_src/clients.baml serves each phase call.
+
+Set PHASE_PRESET (see PRESETS) to pin phases to particular clients, and/or
+ROUTER_CLIENTS=Gemini,Haiku,GPT4oMini to let the remaining phases go to
+whichever of those is currently fastest and healthy. With neither, every
+function keeps the client written in translate.baml.
+"""
+from baml_py import ClientRegistry
+from collections import deque
+from llm_util import LOGGER
+from pipeline import PHASES_BY_NAME, POLISH_FUNCTION
+from rate_limit import make_rate_limited_client
+import asyncio, os, threading, time
+
+WINDOW = 50            # calls remembered per client
+MIN_SAMPLES = 10       # before a client's p95 is trusted for hedging
+MAX_ERROR_RATE = 0.5   # above this a client is skipped until it cools down
+COOLDOWN = 60.0        # seconds an unhealthy client sits out
+
+
+# Phase -> client name. Phases left out keep their translate.baml client.
+PRESETS = {
+    "default": {},
+    # mechanical steps on small fast models, judgement calls stay on Gemini
+    "fast": {"literal": "Haiku", "backtranslation": "GPT4oMini"},
+    # the bulky per-line phases on OpenAI's quota, leaving Gemini's for the rest (a little dearer per token)
+    "spread": {"literal": "GPT4oMini", "clarity": "GPT4oMini", "backtranslation": "GPT4oMini"},
+    "careful": {"review": "Sonnet", "final": "Sonnet"},
+}
+
+
+# The client every function in translate.baml is written against.
+DEFAULT_CLIENT = "Gemini"
+
+# id(registry) -> client name, so wrappers further down can tell where a call goes
+REGISTRY_CLIENT = {}
+
+
+def client_registry(name: str, overrides=None) -> ClientRegistry:
+    """ Registry that points every function at the named client.
+
+    `overrides` maps client names to (provider, options) that replace the
+    definitions in clients.baml, e.g. to aim them at a local stand-in.
+    """
+    registry = ClientRegistry()
+    for client, (provider, options) in (overrides or {}).items():
+        registry.add_llm_client(client, provider, options)
+    registry.set_primary(name)
+    REGISTRY_CLIENT[id(registry)] = name
+    return registry
+
+
+def target_client(baml_options) -> str:
+    """ Name of the client a call with these options will use. """
+    registry = (baml_options or {}).get("client_registry")
+    return REGISTRY_CLIENT.get(id(registry), DEFAULT_CLIENT) if registry is not None else DEFAULT_CLIENT
+
+
+class ClientStats:
+    def __init__(self):
+        self.latencies = deque(maxlen=WINDOW)
+        self.errors = deque(maxlen=WINDOW)
+        self.benched_until = 0.0
+
+    def percentile(self, q: float):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors) / len(self.errors) if self.errors else 0.0
+
+
+class Router:
+    """ Rolling latency and error statistics per client, and the choice they imply. """
+
+    def __init__(self, clients: list, overrides=None):
+        self.clients = list(clients)
+        self.registries = {name: client_registry(name, overrides) for name in self.clients}
+        self.stats = {name: ClientStats() for name in self.clients}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            stats = self.stats[name]
+            stats.errors.append(not ok)
+            if ok:
+                stats.latencies.append(seconds)
+            elif len(stats.errors) >= 3 and stats.error_rate > MAX_ERROR_RATE:
+                stats.benched_until = time.monotonic() + COOLDOWN
+                stats.errors.clear()
+
+    def ranked(self) -> list:
+        """ Healthy clients, fastest median first; clients without data go first so they get measured. """
+        now = time.monotonic()
+        with self._lock:
+            healthy = [name for name in self.clients if self.stats[name].benched_until <= now]
+            if not healthy:
+                healthy = list(self.clients)
+            return sorted(healthy, key=lambda name: self.stats[name].percentile(50) or 0.0)
+
+    def hedge_after(self, name: str):
+        """ Seconds to wait on `name` before also asking the runner-up: its p95. """
+        with self._lock:
+            stats = self.stats[name]
+            return stats.percentile(95) if len(stats.latencies) >= MIN_SAMPLES else None
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    "p50_s": stats.percentile(50),
+                    "p95_s": stats.percentile(95),
+                    "error_rate": stats.error_rate,
+                    "calls": len(stats.latencies),
+                }
+                for name, stats in self.stats.items()
+            }
+
+
+class RoutedClient:
+    """ Stand-in for BamlAsyncClient that sends each call to the router's pick.
+
+    A call still running after the chosen client's p95 is hedged: the
+    runner-up gets the same request and whichever answers first wins. A
+    failed call is retried once on the next client. Streams do the same on
+    their first partial (_RoutedStream).
+    """
+
+    def __init__(self, client, router: Router):
+        self._client = client
+        self.router = router
+        self.stream = _RoutedStreams(client, router)
+
+    def client_config(self, function: str) -> dict:
+        # results may come from any of these, so that's what the phase cache keys on
+        return {"router": sorted(self.router.clients)}
+
+    async def _call(self, name: str, function: str, kwargs: dict, baml_options: dict):
+        start = time.perf_counter()
+        try:
+            result = await getattr(self._client, function)(
+                **kwargs, baml_options={**baml_options, "client_registry": self.router.registries[name]})
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.router.record(name, time.perf_counter() - start, ok=False)
+            raise
+        self.router.record(name, time.perf_counter() - start, ok=True)
+        return result
+
+    def __getattr__(self, function: str):
+        async def call(baml_options=None, **kwargs):
+            baml_options = baml_options or {}
+            ranked = self.router.ranked()
+            tried = [ranked[0]]
+            first = asyncio.ensure_future(self._call(ranked[0], function, kwargs, baml_options))
+            pending = {first}
+            delay = self.router.hedge_after(ranked[0])
+            try:
+                if delay is not None and len(ranked) > 1:
+                    done, _ = await asyncio.wait(pending, timeout=delay)
+                    if not done:
+                        LOGGER.info("hedging %s: %s slower than %.2fs, also asking %s", function, ranked[0], delay, ranked[1])
+                        tried.append(ranked[1])
+                        pending.add(asyncio.ensure_future(self._call(ranked[1], function, kwargs, baml_options)))
+                error = None
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            return task.result()
+                        error = task.exception()
+                # every attempt failed: one more try on a client not used yet
+                untried = [name for name in ranked if name not in tried]
+                if not untried:
+                    raise error
+                LOGGER.error("%s failed on %s (%s), retrying on %s", function, ", ".join(tried), error, untried[0])
+                return await self._call(untried[0], function, kwargs, baml_options)
+            finally:
+                for task in pending:
+                    task.cancel()
+
+        return call
+
+
+class _RoutedStreams:
+    def __init__(self, client, router: Router):
+        self._client = client
+        self.router = router
+
+    def __getattr__(self, function: str):
+        def stream(baml_options=None, **kwargs):
+            return _RoutedStream(self._client, self.router, function, kwargs, baml_options or {})
+
+        return stream
+
+
+# put after a stream's last partial
+_END = object()
+
+
+class _StreamAttempt:
+    """ One client's stream, read in the background so several can race for the first partial. """
+
+    def __init__(self, client, router: Router, name: str, function: str, kwargs: dict, baml_options: dict):
+        self.name = name
+        self.router = router
+        self.partials = asyncio.Queue()
+        self.started = asyncio.Event()   # first partial, or the end
+        self.sent = False
+        self._stream = getattr(client.stream, function)(
+            **kwargs, baml_options={**baml_options, "client_registry": router.registries[name]})
+        self.task = asyncio.ensure_future(self._read())
+        # a stream that lost the race still ends on its own; nobody awaits its error
+        self.task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    async def _read(self):
+        start = time.perf_counter()
+        try:
+            async for partial in self._stream:
+                self.partials.put_nowait(partial)
+                self.sent = True
+                self.started.set()
+            result = await self._stream.get_final_response()
+        except Exception:
+            self.router.record(self.name, time.perf_counter() - start, ok=False)
+            raise
+        finally:
+            self.partials.put_nowait(_END)
+            self.started.set()
+        self.router.record(self.name, time.perf_counter() - start, ok=True)
+        return result
+
+    @property
+    def failed(self):
+        """ The exception the stream ended with, if it ended before anything came of it. """
+        if self.sent or not self.task.done() or self.task.cancelled():
+            return None
+        return self.task.exception()
+
+
+class _RoutedStream:
+    """ Like BAML's stream, from the router's pick.
+
+    A stream that hasn't sent its first partial after the chosen client's p95
+    (of whole calls) is hedged: the runner-up opens the same stream and
+    whichever sends something first is the one read. A stream that fails
+    before sending anything is retried once on a client not used yet; once
+    partials have gone out, an error is final. A stream that loses the race
+    is left to finish and feed the statistics: BAML's stream blocks the event
+    loop while it winds down if it's cancelled.
+    """
+
+    def __init__(self, client, router: Router, function: str, kwargs: dict, baml_options: dict):
+        self._client = client
+        self._router = router
+        self._function = function
+        self._kwargs = kwargs
+        self._options = baml_options
+        self._attempt = None
+
+    def _open(self, name: str) -> _StreamAttempt:
+        return _StreamAttempt(self._client, self._router, name, self._function, self._kwargs, self._options)
+
+    async def _pick(self) -> _StreamAttempt:
+        if self._attempt is not None:
+            return self._attempt
+        ranked = self._router.ranked()
+        tried = [ranked[0]]
+        pending = [self._open(ranked[0])]
+        delay = self._router.hedge_after(ranked[0]) if len(ranked) > 1 else None
+        retried = False
+        while True:
+            waits = {asyncio.ensure_future(attempt.started.wait()): attempt for attempt in pending}
+            done, rest = await asyncio.wait(waits, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+            for wait in rest:
+                wait.cancel()
+            if not done:
+                LOGGER.info("hedging stream %s: nothing from %s after %.2fs, also asking %s",
+                            self._function, ranked[0], delay, ranked[1])
+                tried.append(ranked[1])
+                pending.append(self._open(ranked[1]))
+                delay = None
+                continue
+            # a failure ends the wait for a hedge: the runner-up is the retry
+            error, delay = None, None
+            for wait in done:
+                attempt = waits[wait]
+                if attempt.failed is None:
+                    self._attempt = attempt
+                    return attempt
+                error = attempt.failed
+                pending.remove(attempt)
+            if pending:
+                continue
+            # every stream failed before sending anything: one more try on a client not used yet
+            untried = [name for name in ranked if name not in tried]
+            if retried or not untried:
+                raise error
+            LOGGER.error("stream %s failed on %s (%s), retrying on %s", self._function, ", ".join(tried), error, untried[0])
+            retried = True
+            tried.append(untried[0])
+            pending.append(self._open(untried[0]))
+
+    async def __aiter__(self):
+        attempt = await self._pick()
+        while True:
+            partial = await attempt.partials.get()
+            if partial is _END:
+                break
+            yield partial
+
+    async def get_final_response(self):
+        attempt = await self._pick()
+        return await attempt.task
+
+
+class PhaseAssignedClient:
+    """ Stand-in for BamlAsyncClient that pins phases to clients.
+
+    `assignment` maps phase names to client names; calls for other phases go
+    to `fallback` (the plain client, or a RoutedClient).
+    """
+
+    def __init__(self, client, assignment: dict, fallback=None, overrides=None):
+        self._client = client
+        self._fallback = fallback or client
+        self.functions = {PHASES_BY_NAME[phase].function: name for phase, name in assignment.items()}
+        if "final" in assignment:
+            # the review gate's shortcut stands in for Final, so it goes where Final goes
+            self.functions[POLISH_FUNCTION] = assignment["final"]
+        self.registries = {name: client_registry(name, overrides) for name in set(self.functions.values())}
+        self.stream = _AssignedStreams(self)
+
+    def client_config(self, function: str):
+        if function in self.functions:
+            return {"client": self.functions[function]}
+        config = getattr(self._fallback, "client_config", None)
+        return config(function) if config else None
+
+    def _options(self, function: str, baml_options) -> dict:
+        return {**(baml_options or {}), "client_registry": self.registries[self.functions[function]]}
+
+    def __getattr__(self, function: str):
+        if function not in self.functions:
+            return getattr(self._fallback, function)
+
+        async def call(baml_options=None, **kwargs):
+            return await getattr(self._client, function)(**kwargs, baml_options=self._options(function, baml_options))
+
+        return call
+
+
+class _AssignedStreams:
+    def __init__(self, assigned: PhaseAssignedClient):
+        self._assigned = assigned
+
+    def __getattr__(self, function: str):
+        assigned = self._assigned
+        if function not in assigned.functions:
+            return getattr(assigned._fallback.stream, function)
+
+        def stream(baml_options=None, **kwargs):
+            return getattr(assigned._client.stream, function)(**kwargs, baml_options=assigned._options(function, baml_options))
+
+        return stream
+
+
+def make_routed_client(client, clients=None, overrides=None):
+    """ Wrap `client` in a RoutedClient when two or more clients (default: ROUTER_CLIENTS) are given. """
+    if clients is None:
+        clients = [name.strip() for name in os.environ.get("ROUTER_CLIENTS", "").split(",") if name.strip()]
+    if len(clients) < 2:
+        return client
+    return RoutedClient(client, Router(clients, overrides))
+
+
+def make_client(client, preset=None, overrides=None, registry=None):
+    """ The client the pipeline should use: PHASE_PRESET assignments over ROUTER_CLIENTS
+    routing, with every call waiting for its provider's quota (RATE_LIMITS) and
+    sent over the shared connection pools if HTTP_POOL=1. `registry` is the
+    ClientRegistry for calls that don't bring their own. """
+    if os.environ.get("HTTP_POOL", "0") == "1":
+        # imported here: httpx alone costs the app's cold start more than everything else in this package
+        from http_pool import make_pooled_client
+        client = make_pooled_client(client, target_client, registry)
+    elif registry is not None:
+        client = client.with_options(client_registry=registry)
+    client = make_rate_limited_client(client, target_client)
+    routed = make_routed_client(client, overrides=overrides)
+    preset = preset if preset is not None else os.environ.get("PHASE_PRESET", "")
+    if not PRESETS.get(preset):
+        return routed
+    return PhaseAssignedClient(client, PRESETS[preset], fallback=routed, overrides=overrides)
@@ -0,0 +1,195 @@
+""" Run-level tracing: a root span per workflow run, child spans per chunk and phase.
+
+    TRACE_FILE=logs/traces.jsonl python batch.py corpus/ results.jsonl
+    TRACE_ENDPOINT=http://localhost:4318/v1/traces streamlit run app.py
+
+Spans are written in the OpenTelemetry protocol's JSON encoding: to
+TRACE_FILE, one export request per line (as the OpenTelemetry Collector's
+file exporter writes them, and its otlpjsonfile receiver reads them), and/or
+POSTed to an OTLP/HTTP collector at TRACE_ENDPOINT. With neither set, span()
+does nothing. Spans are queued and exported every TRACE_FLUSH seconds by a
+background thread, and at exit.
+
+The run span carries the language pair and text length; phase spans the
+client, tokens and cache hit, with a `ready` event when their inputs
+arrived, so the time before it is waiting on upstream phases. Waits for
+provider quota (rate_limit.py) and for an identical call already in flight
+(phase_cache.py) show up as events too.
+
+When BAML publishes its own traces (BOUNDARY_API_KEY set), every span also
+opens one there with the BAML trace hooks, tagged with the OpenTelemetry
+trace and span ids so the two can be joined.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from llm_util import LOGGER
+import atexit, json, os, queue, secrets, threading, time, urllib.request
+
+TRACE_FILE = os.environ.get("TRACE_FILE", "")
+TRACE_ENDPOINT = os.environ.get("TRACE_ENDPOINT", "")
+TRACE_FLUSH = float(os.environ.get("TRACE_FLUSH", 5))
+SERVICE_NAME = "translation-workflow"
+
+CURRENT = ContextVar("current_span", default=None)
+
+
+class Span:
+    def __init__(self, name: str, parent=None, attributes=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent is not None else ""
+        self.attributes = dict(attributes or {})
+        self.events = []
+        self.error = None
+        self.start = time.time_ns()
+        self.end = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def event(self, name: str, **attributes):
+        self.events.append((time.time_ns(), name, attributes))
+
+    def otlp(self) -> dict:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "kind": 1,  # internal
+            "startTimeUnixNano": str(self.start),
+            "endTimeUnixNano": str(self.end),
+            "attributes": _attributes(self.attributes),
+            "events": [{"timeUnixNano": str(t), "name": name, "attributes": _attributes(a)} for t, name, a in self.events],
+            "status": {"code": 2, "message": self.error} if self.error is not None else {"code": 1},
+        }
+
+
+def _value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: dict) -> list:
+    return [{"key": key, "value": _value(value)} for key, value in attributes.items() if value is not None]
+
+
+class Exporter:
+    """ Queues finished spans; a daemon thread writes them out in batches. """
+
+    def __init__(self, path: str = "", endpoint: str = "", interval: float = TRACE_FLUSH):
+        self.path = path
+        self.endpoint = endpoint
+        self.interval = interval
+        self.spans = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        threading.Thread(target=self._loop, daemon=True).start()
+        atexit.register(self.flush)
+
+    def export(self, span: Span) -> None:
+        self.spans.put(span)
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            spans = []
+            while True:
+                try:
+                    spans.append(self.spans.get_nowait().otlp())
+                except queue.Empty:
+                    break
+            if not spans:
+                return
+            request = {"resourceSpans": [{
+                "resource": {"attributes": _attributes({"service.name": SERVICE_NAME})},
+                "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": spans}],
+            }]}
+            body = json.dumps(request, ensure_ascii=False)
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(body + "\n")
+            if self.endpoint:
+                try:
+                    urllib.request.urlopen(urllib.request.Request(
+                        self.endpoint, data=body.encode("utf-8"), headers={"Content-Type": "application/json"}), timeout=10)
+                except OSError as e:
+                    LOGGER.error("exporting %d spans to %s failed: %s", len(spans), self.endpoint, e)
+        if os.environ.get("BOUNDARY_API_KEY"):
+            from baml_client.tracing import flush
+            flush()
+
+
+EXPORTER = Exporter(TRACE_FILE, TRACE_ENDPOINT) if TRACE_FILE or TRACE_ENDPOINT else None
+
+
+@contextmanager
+def _baml_span(span: Span):
+    """ The same span in BAML's own traces, when those are published. """
+    if not os.environ.get("BOUNDARY_API_KEY"):
+        yield
+        return
+    from baml_client.tracing import trace, set_tags
+    baml = trace.__self__  # the context manager behind the generated tracing helpers
+    handle = baml.start_trace_async(span.name, {})
+    set_tags(otel_trace_id=span.trace_id, otel_span_id=span.span_id,
+             **{key: str(value) for key, value in span.attributes.items() if value is not None})
+    try:
+        yield
+    except BaseException as e:
+        baml.end_trace(handle, e)
+        raise
+    baml.end_trace(handle, None)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """ A child of the current span (or a new trace); yields None when tracing is off. """
+    if EXPORTER is None:
+        yield None
+        return
+    current = Span(name, CURRENT.get(), attributes)
+    token = CURRENT.set(current)
+    try:
+        with _baml_span(current):
+            yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        CURRENT.reset(token)
+        current.end = time.time_ns()
+        EXPORTER.export(current)
+
+
+@contextmanager
+def run_span(inputs: dict, **attributes):
+    """ The root span of a workflow run, unless this is already inside one. """
+    if EXPORTER is None or CURRENT.get() is not None:
+        yield CURRENT.get()
+        return
+    with span("run", source_lang=inputs.get("source_lang"), target_lang=inputs.get("target_lang"),
+              text_chars=len(inputs.get("source_text", "")), **attributes) as root:
+        yield root
+
+
+def current_span():
+    """ The span code is running in, or None (always None when tracing is off). """
+    return CURRENT.get()
+
+
+def event(name: str, **attributes) -> None:
+    """ Mark something that happened during the current span. """
+    current = CURRENT.get()
+    if current is not None:
+        current.event(name, **attributes)
@@ -0,0 +1,158 @@
+from difflib import SequenceMatcher
+from hashlib import sha256
+from pathlib import Path
+import os, re, sqlite3, threading
+
+# Fuzzy matches below this similarity (difflib ratio) are ignored.
+FUZZY_THRESHOLD = 0.6
+MAX_FUZZY_MATCHES = 5
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def trigrams(text: str) -> set:
+    text = f"  {normalize(text).lower()} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def split_units(text: str) -> list:
+    """ Paragraphs if there are several, otherwise non-blank lines. """
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    if len(paragraphs) > 1:
+        return paragraphs
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def align_segments(source: str, target: str) -> list:
+    """ Pair source and translated segments when both split the same way.
+
+    The final translation usually keeps the source's paragraph and line
+    layout; when it doesn't, nothing is aligned rather than guessing.
+    """
+    for split in (lambda t: [p.strip() for p in re.split(r"\n\s*\n", t) if p.strip()],
+                  lambda t: [line.strip() for line in t.splitlines() if line.strip()]):
+        source_units, target_units = split(source), split(target)
+        if len(source_units) > 1 and len(source_units) == len(target_units):
+            return list(zip(source_units, target_units))
+    if "\n" not in source.strip() and "\n" not in target.strip() and source.strip():
+        return [(source.strip(), target.strip())]
+    return []
+
+
+class TranslationMemory:
+    """ Aligned (source, translation) segments from finished runs.
+
+    Exact lookups go through a hash of the whitespace-normalised segment;
+    fuzzy lookups pull candidates sharing the most character trigrams and
+    rank them by edit similarity.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS segments ("
+            " id INTEGER PRIMARY KEY,"
+            " hash TEXT UNIQUE NOT NULL,"
+            " source_lang TEXT NOT NULL,"
+            " target_lang TEXT NOT NULL,"
+            " source TEXT NOT NULL,"
+            " target TEXT NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS grams (gram TEXT NOT NULL, segment INTEGER NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS grams_gram ON grams (gram)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _hash(source_lang: str, target_lang: str, source: str) -> str:
+        return sha256(f"{source_lang}\0{target_lang}\0{normalize(source)}".encode("utf-8")).hexdigest()
+
+    def add(self, source_lang: str, target_lang: str, source: str, target: str) -> None:
+        key = self._hash(source_lang, target_lang, source)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT id FROM segments WHERE hash = ?", (key,)).fetchone()
+            if row is not None:
+                # newer translations replace older ones
+                conn.execute("UPDATE segments SET target = ? WHERE id = ?", (target, row[0]))
+            else:
+                segment = conn.execute(
+                    "INSERT INTO segments (hash, source_lang, target_lang, source, target) VALUES (?, ?, ?, ?, ?)",
+                    (key, source_lang, target_lang, source, target),
+                ).lastrowid
+                conn.executemany("INSERT INTO grams (gram, segment) VALUES (?, ?)",
+                                 [(gram, segment) for gram in trigrams(source)])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def add_translation(self, source_lang: str, target_lang: str, source_text: str, final_translation: str) -> int:
+        """ Store the aligned segments of a finished translation; returns how many. """
+        pairs = align_segments(source_text, final_translation)
+        for source, target in pairs:
+            self.add(source_lang, target_lang, source, target)
+        return len(pairs)
+
+    def exact(self, source_lang: str, target_lang: str, source: str):
+        row = self._connect().execute(
+            "SELECT target FROM segments WHERE hash = ?", (self._hash(source_lang, target_lang, source),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def fuzzy(self, source_lang: str, target_lang: str, source: str, limit: int = MAX_FUZZY_MATCHES,
+              threshold: float = FUZZY_THRESHOLD) -> list:
+        """ (similarity, source, target) of the closest stored segments, best first. """
+        grams = list(trigrams(source))
+        if not grams:
+            return []
+        placeholders = ",".join("?" * len(grams))
+        rows = self._connect().execute(
+            f"SELECT s.source, s.target FROM grams g JOIN segments s ON s.id = g.segment"
+            f" WHERE g.gram IN ({placeholders}) AND s.source_lang = ? AND s.target_lang = ?"
+            f" GROUP BY g.segment ORDER BY COUNT(*) DESC LIMIT ?",
+            (*grams, source_lang, target_lang, limit * 4),
+        ).fetchall()
+        wanted = normalize(source)
+        scored = [(SequenceMatcher(None, wanted, normalize(s)).ratio(), s, t) for s, t in rows]
+        return sorted((m for m in scored if m[0] >= threshold), reverse=True)[:limit]
+
+    def lookup(self, source_lang: str, target_lang: str, text: str):
+        """ Consult the memory for a whole text before translating it.
+
+        Returns (translation, matches): `translation` is set when every
+        segment has an exact match; otherwise `matches` lists fuzzy matches
+        worth showing the model.
+        """
+        units = split_units(text)
+        hits = [self.exact(source_lang, target_lang, unit) for unit in units]
+        if units and None not in hits:
+            joiner = "\n\n" if re.search(r"\n\s*\n", text) else "\n"
+            return joiner.join(hits), []
+
+        matches = []
+        for unit, hit in zip(units, hits):
+            if hit is not None:
+                matches.append((1.0, unit, hit))
+            else:
+                matches.extend(self.fuzzy(source_lang, target_lang, unit, limit=1))
+        matches.sort(reverse=True)
+        return None, matches[:MAX_FUZZY_MATCHES]
+
+
+def make_translation_memory():
+    """ TRANSLATION_MEMORY is the SQLite file to use (empty disables it). """
+    path = os.environ.get("TRANSLATION_MEMORY", ".cache/memory/tm.sqlite3")
+    return TranslationMemory(path) if path else None
@@ -1,7 +1,45 @@
-from baml_client import b
 import streamlit as st
-from llm_util import removeMarkdownTag, get_context_prompt, removeFinalTag
-import time
+from llm_util import get_context_prompt
+from phase_cache import make_phase_cache
+from routing import make_client
+from translation_memory import make_translation_memory
+from chunking import run_chunked_pipeline, CHUNK_CHARS
+from incremental import run_incremental
+from pipeline import render
+from metrics import RunMetrics, start_metrics_server
+from rate_limit import set_session
+import asyncio, os, uuid
+
+@st.cache_resource
+def get_phase_cache():
+    """ One cache per server process, shared by every session and rerun. """
+    return make_phase_cache()
+
+PHASE_CACHE = get_phase_cache()
+
+@st.cache_resource
+def get_translation_memory():
+    return make_translation_memory()
+
+MEMORY = get_translation_memory()
+
+@st.cache_resource
+def get_client():
+    """ The async BAML client, with PHASE_PRESET / ROUTER_CLIENTS applied (see routing.py).
+
+    Made on the first translation rather than on page load: importing
+    baml_client builds the BAML runtime, which the input form doesn't need.
+    """
+    from baml_client.async_client import b
+    return make_client(b)
+
+@st.cache_resource
+def get_metrics_server():
+    """ Prometheus-style /metrics endpoint, started once per process if METRICS_PORT is set. """
+    port = os.environ.get("METRICS_PORT")
+    return start_metrics_server(int(port)) if port else None
+
+get_metrics_server()
 
 with st.form("input_form"):
     source_lang = st.text_input("Source Language", "English")
@@ -20,6 +58,11 @@ if not source_text:
 
 CONTEXT = get_context_prompt(target_lang=target_lang, source_lang=source_lang, extra_context=extra_context)
 
+# The page is laid out first with an empty slot per phase; the slots are filled
+# as the pipeline finishes each phase, in whatever order they complete.
+REDO = {}
+STATUS = {}
+OUTPUT = {}
 
 ############################################################
 #                   ANALYSIS
@@ -27,21 +70,9 @@ CONTEXT = get_context_prompt(target_lang=target_lang, source_lang=source_lang, e
 
 st.header("Phase 1: Analysis", divider=True)
 
-ANALYSIS_REDO_BTN = st.button("Redo " + "Analysis")
-ANALYSIS_STATUS = st.status("Analyzing prompt..")
-
-with ANALYSIS_STATUS:
-    _analysis = b.GetAnalysis(context=CONTEXT, source_lang=source_lang, target_lang=target_lang, source_text=source_text)
-    _analysis = removeMarkdownTag(_analysis)
-    st.write("Analysis Complete")
-
-    if ANALYSIS_REDO_BTN:
-        _analysis = st.empty()
-        _analysis = b.GetAnalysis(context=CONTEXT, source_lang=source_lang, target_lang=target_lang, source_text=source_text)
-        time.sleep(2)
-        _analysis = removeMarkdownTag(_analysis)
-
-st.markdown(_analysis)
+REDO["analysis"] = st.button("Redo " + "Analysis")
+STATUS["analysis"] = st.status("Analyzing prompt..")
+OUTPUT["analysis"] = st.empty()
 
 ############################################################
 #                   LITERAL TRANSLATION
@@ -51,20 +82,9 @@ st.header("Phase 2: Literal Translation", divider=True)
 
 st.subheader(f"{target_lang} Translation")
 
-LITERAL_REDO_BTN = st.button("Redo " + "Literal Translation")
-LITERAL_STATUS = st.status("Literal Translation...")
-
-with LITERAL_STATUS:
-    _literal_translation = b.GetLiteralTranslate(context=CONTEXT, prompt=source_text, source_lang=source_lang, target_lang=target_lang, is_song=False)
-    _literal_translation = removeMarkdownTag(_literal_translation)
-
-    if LITERAL_REDO_BTN:
-        _literal_translation = st.empty()
-        _literal_translation = b.GetLiteralTranslate(context=CONTEXT, prompt=source_text, source_lang=source_lang, target_lang=target_lang, is_song=False)
-        time.sleep(2)
-        _literal_translation = removeMarkdownTag(_literal_translation)
-
-st.markdown(_literal_translation)
+REDO["literal"] = st.button("Redo " + "Literal Translation")
+STATUS["literal"] = st.status("Literal Translation...")
+OUTPUT["literal"] = st.empty()
 
 ############################################################
 #                   CLARITY
@@ -72,20 +92,9 @@ st.markdown(_literal_translation)
 
 st.header("Phase 3: Clarity", divider=True)
 
-CLARITY_REDO_BTN = st.button("Redo " + "Clarity")
-CLARITY_STATUS = st.status("Generating clarity analysis...")
-
-with CLARITY_STATUS:
-    _clarified_translation = b.GetClarity(context=CONTEXT, prompt=source_text, target_lang=target_lang, literal_translation=_literal_translation, analysis=_analysis)
-    _clarified_translation = removeMarkdownTag(_clarified_translation)
-
-    if CLARITY_REDO_BTN:
-        _clarified_translation = st.empty()
-        _clarified_translation = b.GetClarity(context=CONTEXT, prompt=source_text, target_lang=target_lang, literal_translation=_literal_translation, analysis=_analysis)
-        time.sleep(2)
-        _clarified_translation = removeMarkdownTag(_clarified_translation)
-
-st.markdown(_clarified_translation)
+REDO["clarity"] = st.button("Redo " + "Clarity")
+STATUS["clarity"] = st.status("Generating clarity analysis...")
+OUTPUT["clarity"] = st.empty()
 
 ############################################################
 #                   BACKTRANSLATION
@@ -93,8 +102,8 @@ st.markdown(_clarified_translation)
 
 st.header("Phase 4: Backtranslation", divider=True)
 
-BACKTRANSLATE_REDO_BTN = st.button("Redo " + "Backtranslation")
-BACKTRANSLATE_STATUS = st.status("Generating backtranslation...")
+REDO["backtranslation"] = st.button("Redo " + "Backtranslation")
+STATUS["backtranslation"] = st.status("Generating backtranslation...")
 
 # show the original text next to the backtranslation
 cols = st.columns(2)
@@ -102,17 +111,7 @@ with cols[0]:
     st.subheader("Original Text")
     st.text(source_text)
 with cols[1]:
-    with BACKTRANSLATE_STATUS:
-        _backtranslation = b.GetBackTranslation(context=CONTEXT, source_lang=source_lang, clarified_translation=_clarified_translation)
-        _backtranslation = removeMarkdownTag(_backtranslation)
-
-        if BACKTRANSLATE_REDO_BTN:
-            _backtranslation = st.empty()
-            _backtranslation = b.GetBackTranslation(context=CONTEXT, source_lang=source_lang, clarified_translation=_clarified_translation)
-            time.sleep(2)
-            _backtranslation = removeMarkdownTag(_backtranslation)
-
-    st.markdown(_backtranslation)
+    OUTPUT["backtranslation"] = st.empty()
 
 ############################################################
 #                   FINAL REVIEW
@@ -120,35 +119,9 @@ with cols[1]:
 
 st.header("Phase 5: Final Review", divider=True)
 
-REVIEW_REDO_BTN = st.button("Redo " + "Review")
-REVIEW_STATUS = st.status("Generating review...")
-
-with REVIEW_STATUS:
-    _final_review = b.GetReview(
-        context=CONTEXT,
-        target_lang=target_lang,
-        source_text=source_text,
-        clarified_translation=_clarified_translation,
-        backtranslation=_backtranslation,
-        syllabification="")
-
-    _final_review = removeMarkdownTag(_final_review)
-
-    if REVIEW_REDO_BTN:
-        _final_review = st.empty()
-
-        _final_review = b.GetReview(
-        context=CONTEXT,
-        target_lang=target_lang,
-        source_text=source_text,
-        clarified_translation=_clarified_translation,
-        backtranslation=_backtranslation,
-        syllabification="")
-
-        time.sleep(2)
-        _final_review = removeMarkdownTag(_final_review)
-
-st.markdown(_final_review)
+REDO["review"] = st.button("Redo " + "Review")
+STATUS["review"] = st.status("Generating review...")
+OUTPUT["review"] = st.empty()
 
 ############################################################
 #                   FINAL TRANSLATION
@@ -156,37 +129,8 @@ st.markdown(_final_review)
 
 st.header("Phase 6: Final Translation", divider=True)
 
-FINAL_REDO_BTN = st.button("Redo " + "Final Translation")
-FINAL_STATUS = st.status("Generating final translation...")
-
-with FINAL_STATUS:
-    _final_translation = b.GetFinalTranslation(
-        context=CONTEXT,
-        target_lang=target_lang,
-        source_text=source_text,
-        analysis=_analysis,
-        clarified_translation=_clarified_translation,
-        final_review=_final_review,
-        item_type="text")
-
-    _final_translation = removeMarkdownTag(_final_translation)
-    _final_translation = removeFinalTag(_final_translation)
-
-    if FINAL_REDO_BTN:
-        _final_translation = st.empty()
-
-        _final_translation = b.GetFinalTranslation(
-        context=CONTEXT,
-        target_lang=target_lang,
-        source_text=source_text,
-        analysis=_analysis,
-        clarified_translation=_clarified_translation,
-        final_review=_final_review,
-        item_type="text")
-
-        time.sleep(2)
-        _final_translation = removeMarkdownTag(_final_translation)
-        _final_translation = removeFinalTag(_final_translation)
+REDO["final"] = st.button("Redo " + "Final Translation")
+STATUS["final"] = st.status("Generating final translation...")
 
 # original text side-by-side with final translation
 
@@ -197,7 +141,68 @@ with cols[0]:
 
 with cols[1]:
     tabs = st.tabs(["Easy to read", "Easy to copy-paste"])
-    tabs[0].text(_final_translation)
+    FINAL_TEXT = tabs[0].empty()
     with tabs[1]:
         st.write("Click the Copy button in the top-right corner to copy the text.")
-        st.code(_final_translation)
\ No newline at end of file
+        FINAL_CODE = st.empty()
+
+
+def show_partial(name: str, value):
+    text = render(name, value)
+    if name == "final":
+        FINAL_TEXT.text(text)
+    else:
+        OUTPUT[name].markdown(text)
+
+
+def show_result(name: str, value):
+    STATUS[name].update(state="complete")
+    show_partial(name, value)
+    if name == "final":
+        FINAL_CODE.code(value)
+
+
+inputs = dict(context=CONTEXT, source_lang=source_lang, target_lang=target_lang, source_text=source_text)
+
+# State of this session's last run. A Redo only recomputes the pressed phase
+# and its dependents; an edit to the source text only re-translates the
+# segments that changed (see incremental.py). Texts too long for a single
+# Review/Final call are split into chunks translated side by side (chunking.py).
+LAST_RUN = st.session_state.get("last_run")
+REFRESH = {name for name, pressed in REDO.items() if pressed}
+# every browser session gets its own turn at the provider quota (rate_limit.py)
+set_session(st.session_state.setdefault("session_id", uuid.uuid4().hex))
+RUN_METRICS = RunMetrics(source_lang=source_lang, target_lang=target_lang, text_chars=len(source_text))
+
+if len(source_text) <= CHUNK_CHARS:
+    results, state = asyncio.run(run_incremental(
+        inputs,
+        LAST_RUN,
+        client=get_client(),
+        cache=PHASE_CACHE,
+        refresh=REFRESH,
+        metrics=RUN_METRICS,
+        memory=MEMORY,
+        on_result=show_result,
+        on_partial=show_partial,
+    ))
+else:
+    results = asyncio.run(run_chunked_pipeline(
+        inputs,
+        client=get_client(),
+        cache=PHASE_CACHE,
+        refresh=REFRESH,
+        metrics=RUN_METRICS,
+        memory=MEMORY,
+        on_result=show_result,
+        on_partial=show_partial,
+    ))
+    state = {"inputs": inputs, "results": results}
+st.session_state["last_run"] = state
+
+# remember new final translations so later texts can reuse their segments
+if MEMORY is not None and (not LAST_RUN or LAST_RUN["results"]["final"] != results["final"]):
+    MEMORY.add_translation(source_lang, target_lang, source_text, results["final"])
+
+with st.expander("Run metrics"):
+    st.json(RUN_METRICS.finish())